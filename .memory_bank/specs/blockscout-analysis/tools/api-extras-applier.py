@@ -12,12 +12,17 @@ of the unlock_blockchain_analysis MCP response and is now maintained directly
 in this repository. See api-extras-applier-spec.md for the schema and the
 pipeline role.
 
+Post-processing rules from a second sibling YAML file (the JSON-RPC inserts
+and MCP-duplicate removals) are applied in the same pass.
+
 Usage (from repo root):
     python .memory_bank/specs/blockscout-analysis/tools/api-extras-applier.py
+        [--check] [--profile [REPORT]] [--cprofile PSTATS]
 """
 
 from __future__ import annotations
 
+import argparse
 import re
 import sys
 from pathlib import Path
@@ -28,15 +33,22 @@ import yaml
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from common import (  # noqa: E402
-    REFERENCES_DIR,
-    API_DIR,
+    INDEX_DOCUMENT,
+    add_entry_locations,
     TOPIC_FILE_ORDER,
     TOPIC_HEADINGS,
     EXCLUDED_PARAM_NAMES,
-    classify_endpoint,
+    classify_many,
     heading_for,
     format_index_line,
     first_paragraph,
+    add_profile_arguments,
+    api_document,
+    profile_step,
+    read_reference_documents,
+    start_profile,
+    write_reference_documents,
+    write_search_index,
 )
 
 # ---------------------------------------------------------------------------
@@ -45,7 +57,9 @@ from common import (  # noqa: E402
 
 # Sibling data file holds the frozen catalog of endpoints.
 DATA_FILE = Path(__file__).resolve().parent.parent / "api-extras-applier-data.yaml"
-INDEX_FILE = REFERENCES_DIR / "blockscout-api-index.md"
+
+# Sibling rules file holds the post-processing inserts and removals.
+RULES_FILE = DATA_FILE.with_name("api-extras-applier-rules.yaml")
 
 # ---------------------------------------------------------------------------
 # Script-specific classification config
@@ -126,37 +140,74 @@ def load_catalog() -> dict:
     return endpoints
 
 # ---------------------------------------------------------------------------
-# Normalised path set
+# Documented path templates
 # ---------------------------------------------------------------------------
 
+# Trie key marking the end of a documented path; its value is that path.
+_TEMPLATE = None
+
+# Normalised placeholder segment; a wildcard in the template trie.
+_WILDCARD = "{}"
+
+_INDEX_PATH_RE = re.compile(r'^-\s+`(/[^`]+)`')
+
+
 def _normalise(path: str) -> str:
     """Replace all {param_name} placeholders with {} for parameter-agnostic comparison."""
     return re.sub(r'\{[^}]+\}', '{}', path)
 
 
-def build_normalised_paths() -> tuple[set[str], int]:
+def build_path_trie(text: str) -> tuple[dict, int]:
     """
-    Read the master index and return (normalised_path_set, total_count).
-    Exits with code 1 if the index file is not found.
-    """
-    try:
-        text = INDEX_FILE.read_text(encoding="utf-8")
-    except FileNotFoundError:
-        print(f"Error: index file not found: {INDEX_FILE}")
-        print("Run api-file-generator.py before running this script.")
-        sys.exit(1)
+    Return (template_trie, total_count) for the master index text.
 
-    normalised: set[str] = set()
+    The trie is keyed by normalised path segment; `{}` segments are
+    placeholders that match any single segment. The node reached by a full
+    path holds the first documented path with that normalised form under
+    the _TEMPLATE key. total_count is the number of distinct normalised paths.
+    """
+    trie: dict = {}
+    count = 0
     # Match lines with description:    - `/path`: description text
     # and lines without description:   - `/path`
     for line in text.splitlines():
-        line = line.strip()
-        m = re.match(r'^-\s+`(/[^`]+)`', line)
-        if m:
-            path = m.group(1)
-            normalised.add(_normalise(path))
-
-    return normalised, len(normalised)
+        m = _INDEX_PATH_RE.match(line.strip())
+        if not m:
+            continue
+        path = m.group(1)
+        node = trie
+        for segment in _normalise(path).split("/"):
+            node = node.setdefault(segment, {})
+        if _TEMPLATE not in node:
+            node[_TEMPLATE] = path
+            count += 1
+    return trie, count
+
+
+def match_template(trie: dict, path: str) -> str | None:
+    """
+    Return the documented path that covers `path`, or None. A literal segment
+    of `path` matches the same literal or a placeholder; a placeholder only
+    matches a placeholder, so `/v2/messages/{direction}` covers
+    `/v2/messages/to-rollup` but not the reverse. Exact matches win; the cost
+    is proportional to the path length unless several placeholder branches
+    share a prefix.
+    """
+    segments = _normalise(path).split("/")
+    # Depth-first, literal branch first: (node, segment index).
+    stack = [(trie, 0)]
+    while stack:
+        node, i = stack.pop()
+        if i == len(segments):
+            if _TEMPLATE in node:
+                return node[_TEMPLATE]
+            continue
+        segment = segments[i]
+        if segment != _WILDCARD and _WILDCARD in node:
+            stack.append((node[_WILDCARD], i + 1))
+        if segment in node:
+            stack.append((node[segment], i + 1))
+    return None
 
 # ---------------------------------------------------------------------------
 # Missing endpoint detection
@@ -164,28 +215,38 @@ def build_normalised_paths() -> tuple[set[str], int]:
 
 def find_missing(
     endpoints: dict,
-    normalised_existing: set[str],
-) -> list[tuple[dict, str, str]]:
+    trie: dict,
+) -> tuple[list[tuple[dict, str, str]], list[tuple[dict, str]]]:
     """
-    Return list of (endpoint_dict, group_or_chain_family, source_type) tuples
-    for endpoints not yet present in the index.
-    source_type is 'common' or 'specific'.
+    Return (missing, subsumed).
+
+    missing: (endpoint_dict, group_or_chain_family, source_type) tuples for
+    endpoints not yet covered by the index; source_type is 'common' or
+    'specific'.
+    subsumed: (endpoint_dict, template) for endpoints skipped because a
+    documented parameterised path covers them (exact matches are not listed).
     """
     missing: list[tuple[dict, str, str]] = []
+    subsumed: list[tuple[dict, str]] = []
+
+    def check(ep: dict, key: str, source_type: str) -> None:
+        template = match_template(trie, ep["path"])
+        if template is None:
+            missing.append((ep, key, source_type))
+        elif _normalise(template) != _normalise(ep["path"]):
+            subsumed.append((ep, template))
 
     for group_entry in endpoints.get("common", []):
         group = group_entry.get("group", "")
         for ep in group_entry.get("endpoints", []):
-            if _normalise(ep["path"]) not in normalised_existing:
-                missing.append((ep, group, "common"))
+            check(ep, group, "common")
 
     for chain_entry in endpoints.get("specific", []):
         chain_family = chain_entry.get("chain_family", "")
         for ep in chain_entry.get("endpoints", []):
-            if _normalise(ep["path"]) not in normalised_existing:
-                missing.append((ep, chain_family, "specific"))
+            check(ep, chain_family, "specific")
 
-    return missing
+    return missing, subsumed
 
 # ---------------------------------------------------------------------------
 # Classification
@@ -201,29 +262,36 @@ def _derive_chain_info(chain_family: str) -> tuple[str, str]:
     return filename, heading
 
 
-def _classify_by_path(path: str) -> tuple[str, str] | None:
+def _raw_swagger_path(path: str) -> str:
+    """Strip the /api prefix from an MCP path to obtain the raw swagger path."""
+    if path.startswith("/api"):
+        return path[4:]  # "/api/v2/..." → "/v2/..."
+    return path
+
+
+def _classify_by_paths(paths: list[str]) -> dict[str, tuple[str, str] | None]:
     """
-    Classify an MCP endpoint path using classify_endpoint() from common.py.
+    Classify MCP endpoint paths in one batch using classify_many() from common.py.
 
     MCP paths have /api prefix (e.g. /api/v2/blocks/) or /stats-service/ prefix.
     Strips the prefix and delegates to the shared 3-pass pipeline.
 
-    Returns (filename, h3_section) or None if no match.
+    Returns {path: (filename, h3_section) or None if no match}.
     """
-    # Handle /stats-service/ prefix directly — not in the shared pipeline.
-    if path.startswith("/stats-service/"):
-        return "stats.md", "Stats Service"
-
-    # Strip /api prefix to obtain the raw swagger path for classify_endpoint().
-    raw_path = path
-    if path.startswith("/api"):
-        raw_path = path[4:]  # "/api/v2/..." → "/v2/..."
+    result: dict[str, tuple[str, str] | None] = {}
+    pipeline_paths: list[str] = []
+    for path in paths:
+        # Handle /stats-service/ prefix directly — not in the shared pipeline.
+        if path.startswith("/stats-service/"):
+            result[path] = ("stats.md", "Stats Service")
+        else:
+            pipeline_paths.append(path)
 
-    fname = classify_endpoint(raw_path)
-    if fname is not None:
-        return fname, heading_for(fname)
+    fnames = classify_many(_raw_swagger_path(p) for p in pipeline_paths)
+    for path, fname in zip(pipeline_paths, fnames):
+        result[path] = (fname, heading_for(fname)) if fname is not None else None
 
-    return None
+    return result
 
 
 def classify_endpoints(
@@ -234,6 +302,7 @@ def classify_endpoints(
     Returns a dict: (filename, h3_section) → [endpoint_dict, ...]
     """
     result: dict[tuple[str, str], list[dict]] = {}
+    by_path = _classify_by_paths([ep["path"] for ep, _, _ in missing])
 
     for ep, key, source_type in missing:
         path = ep["path"]
@@ -250,7 +319,7 @@ def classify_endpoints(
                 elif path.startswith("/stats-service/"):
                     bucket = ("stats.md", "Stats Service")
                 else:
-                    result_pfx = _classify_by_path(path)
+                    result_pfx = by_path[path]
                     if result_pfx is None:
                         print(f"Warning: cannot classify Stats endpoint (unknown path prefix): {path}")
                         continue
@@ -259,8 +328,8 @@ def classify_endpoints(
                 fname, section = COMMON_GROUP_MAP[group]
                 bucket = (fname, section)
             else:
-                # Fallback: classify_endpoint() from common.py via _classify_by_path()
-                result_pfx = _classify_by_path(path)
+                # Fallback: classify_many() from common.py via _classify_by_paths()
+                result_pfx = by_path[path]
                 if result_pfx is None:
                     print(f"Warning: unknown group '{group}' and no path-prefix match for: {path}")
                     continue
@@ -321,141 +390,221 @@ def render_endpoint(ep: dict) -> str:
     return "\n".join(lines)
 
 # ---------------------------------------------------------------------------
-# API file patching
+# API file model
 # ---------------------------------------------------------------------------
 
-def _sort_key(path_method: tuple[str, str]) -> tuple[str, int]:
-    path, method = path_method
-    return path.lower(), METHOD_ORDER.get(method, 99)
-
-
-def _extract_entries_in_section(
-    lines: list[str], section_start: int, section_end: int
-) -> list[tuple[str, str, list[str]]]:
-    """
-    Within lines[section_start:section_end], collect existing #### entries.
-    Returns list of (path, method, entry_lines) where entry_lines includes
-    the #### heading line through the last content line before the next entry.
-    """
-    entries: list[tuple[str, str, list[str]]] = []
-    i = section_start
-    while i < section_end:
-        line = lines[i]
-        m = re.match(r'^#### (GET|POST|PUT|PATCH|DELETE) (/\S+)', line)
-        if m:
-            method = m.group(1)
-            path = m.group(2)
-            entry_lines = [line]
-            j = i + 1
-            while j < section_end:
-                if re.match(r'^####', lines[j]):
-                    break
-                entry_lines.append(lines[j])
-                j += 1
-            entries.append((path, method, entry_lines))
-            i = j
+# "## " and "### " headings start a block of an API file; "#### METHOD /path"
+# starts an endpoint entry within one.
+_BLOCK_HEADING_RE = re.compile(r'^###?[^#]')
+_ENTRY_HEADING_RE = re.compile(r'^#### (GET|POST|PUT|PATCH|DELETE) (/\S+)')
+
+
+def _entry(path: str, method: str, text: str) -> tuple[tuple[str, int], str]:
+    """An endpoint entry as (sort key, text without trailing blank lines)."""
+    return (path.lower(), METHOD_ORDER.get(method, 99)), text.rstrip()
+
+
+def parse_api_document(text: str) -> dict:
+    """
+    Split an API file into blocks, each starting at a `##` or `###` heading
+    (the first block holds any lines before the first heading and has none):
+    {"blocks": [{"heading", "lines", "lead", "entries"}], "sections": {"### H3": block},
+    "changed": False}. A block's `lead` and `entries` stay None until the
+    block is patched (see _parse_block).
+    """
+    head: dict = {"heading": None, "lines": [], "lead": None, "entries": None}
+    blocks = [head]
+    sections: dict[str, dict] = {}
+    for line in text.splitlines():
+        if _BLOCK_HEADING_RE.match(line):
+            block = {"heading": line, "lines": [], "lead": None, "entries": None}
+            blocks.append(block)
+            if line.startswith("### "):
+                sections.setdefault(line.strip(), block)
         else:
-            i += 1
-    return entries
+            blocks[-1]["lines"].append(line)
+    return {"blocks": blocks, "sections": sections, "changed": False}
 
 
-def _render_entries_block(entries: list[tuple[str, str, list[str]]]) -> str:
-    """Render a sorted list of (path, method, entry_lines) into a string."""
-    sorted_entries = sorted(entries, key=lambda e: _sort_key((e[0], e[1])))
-    parts: list[str] = []
-    for _, _, entry_lines in sorted_entries:
-        # Strip trailing blank lines from each entry, then add exactly one blank line separator
-        text = "\n".join(entry_lines).rstrip()
-        parts.append(text)
-    return "\n\n".join(parts) + "\n"
+def _parse_block(block: dict) -> None:
+    """
+    Split a block body into its lead (the lines before the first #### line,
+    e.g. a section preamble, without surrounding blank lines) and its #### entries.
+    An entry runs from its heading to the next #### line; other lines after
+    the first #### line are dropped.
+    """
+    if block["entries"] is not None:
+        return
+    lines = block["lines"]
+    first = next((i for i, line in enumerate(lines) if line.startswith("####")), len(lines))
+    lead = lines[:first]
+    while lead and not lead[0].strip():
+        lead = lead[1:]
+    while lead and not lead[-1].strip():
+        lead = lead[:-1]
+    entries: list[tuple[tuple[str, int], str]] = []
+    current: list[str] | None = None
+    method = path = ""
+    for line in lines[first:]:
+        if line.startswith("####"):
+            if current is not None:
+                entries.append(_entry(path, method, "\n".join(current)))
+            m = _ENTRY_HEADING_RE.match(line)
+            current = [line] if m else None
+            if m:
+                method, path = m.group(1), m.group(2)
+        elif current is not None:
+            current.append(line)
+    if current is not None:
+        entries.append(_entry(path, method, "\n".join(current)))
+    block["lead"] = lead
+    block["entries"] = entries
+
+
+def render_api_document(doc: dict) -> str:
+    """
+    Serialize a parsed API file. Untouched blocks are written back verbatim;
+    patched blocks are written as heading, blank line, lead and their entries
+    in sort order, separated by blank lines. Appended sections are preceded
+    by exactly one blank line.
+    """
+    out: list[str] = []
+    for block in doc["blocks"]:
+        if block.get("appended"):
+            while out and not out[-1].strip():
+                out.pop()
+            if out:
+                out[-1] = out[-1].rstrip()
+            out.append("")
+        if block["heading"] is not None:
+            out.append(block["heading"])
+        if block["entries"] is None:
+            out.extend(block["lines"])
+            continue
+        out.append("")
+        if block["lead"]:
+            out.extend(block["lead"])
+            out.append("")
+        for _, text in sorted(block["entries"], key=lambda e: e[0]):
+            out.append(text)
+            out.append("")
+    return "\n".join(out).rstrip() + "\n"
+
+# ---------------------------------------------------------------------------
+# API file patching
+# ---------------------------------------------------------------------------
+
+def _api_tree(trees: dict[str, dict], documents: dict[str, str], filename: str) -> dict:
+    """Return the parsed API file from `trees`, parsing it on first use."""
+    key = api_document(filename)
+    doc = trees.get(key)
+    if doc is None:
+        # New files start with the H2 heading only (spec Section 8.3).
+        doc = trees[key] = parse_api_document(documents.get(key, "## API Endpoints\n"))
+    return doc
+
+
+def _api_section(doc: dict, h3_section: str, preamble: str = "") -> dict:
+    """
+    Return the block of the H3 section with its entries parsed, appending
+    the section (with `preamble` as its lead) at the end of the file if absent.
+    """
+    heading = f"### {h3_section}"
+    block = doc["sections"].get(heading)
+    if block is None:
+        # Section not found — append it (spec Section 8.2)
+        block = {"heading": heading, "lines": [], "lead": preamble.strip().splitlines(),
+                 "entries": [], "appended": True}
+        doc["blocks"].append(block)
+        doc["sections"][heading] = block
+    _parse_block(block)
+    return block
 
 
 def patch_api_file(
+    trees: dict[str, dict],
+    documents: dict[str, str],
     filename: str,
     h3_section: str,
     new_endpoints: list[dict],
 ) -> str:
     """
-    Patch an API file by inserting new_endpoints into the h3_section.
+    Insert new_endpoints into the h3_section of an API file, creating the
+    section or the file if needed. The file is parsed into `trees` on first
+    use; render it back into `documents` with render_api_document() once all
+    of its sections are patched.
     Returns a status string for console output.
     """
-    filepath = API_DIR / filename
-    new_rendered = [(ep["path"], "GET", render_endpoint(ep).rstrip().splitlines()) for ep in new_endpoints]
-
-    if not filepath.exists():
-        # Create new file (spec Section 8.3)
-        entries_block = _render_entries_block(new_rendered)
-        content = f"## API Endpoints\n\n### {h3_section}\n\n{entries_block}"
-        try:
-            filepath.write_text(content, encoding="utf-8")
-        except OSError as exc:
-            print(f"Error: cannot write {filepath}: {exc}")
-            sys.exit(1)
-        count = len(new_endpoints)
-        return f"Created: blockscout-api/{filename} ({count} endpoint{'s' if count != 1 else ''})"
+    key = api_document(filename)
+    created = key not in documents and key not in trees
+    doc = _api_tree(trees, documents, filename)
+    block = _api_section(doc, h3_section)
+    block["entries"].extend(_entry(ep["path"], "GET", render_endpoint(ep)) for ep in new_endpoints)
+    doc["changed"] = True
 
-    # File exists — read it
-    text = filepath.read_text(encoding="utf-8")
-    lines = text.splitlines()
-
-    # Find the target H3 section
-    section_line_idx: int | None = None
-    for i, line in enumerate(lines):
-        if line.strip() == f"### {h3_section}":
-            section_line_idx = i
-            break
-
-    if section_line_idx is None:
-        # Section not found — append it (spec Section 8.2)
-        entries_block = _render_entries_block(new_rendered)
-        new_section = f"\n### {h3_section}\n\n{entries_block}"
-        content = text.rstrip() + "\n" + new_section
-        try:
-            filepath.write_text(content, encoding="utf-8")
-        except OSError as exc:
-            print(f"Error: cannot write {filepath}: {exc}")
-            sys.exit(1)
-        count = len(new_endpoints)
-        return (f"Patched: blockscout-api/{filename} "
-                f"(added {count} endpoint{'s' if count != 1 else ''} to ### {h3_section})")
-
-    # Section found — determine its extent (ends at next ## heading or EOF)
-    section_end = len(lines)
-    for i in range(section_line_idx + 1, len(lines)):
-        if re.match(r'^##[^#]', lines[i]):
-            section_end = i
-            break
-
-    # Extract existing entries within the section
-    existing = _extract_entries_in_section(lines, section_line_idx + 1, section_end)
-    all_entries = existing + new_rendered
+    count = len(new_endpoints)
+    if created:
+        return f"Created: blockscout-api/{filename} ({count} endpoint{'s' if count != 1 else ''})"
+    return (f"Patched: blockscout-api/{filename} "
+            f"(added {count} endpoint{'s' if count != 1 else ''} to ### {h3_section})")
 
-    # Reconstruct file: everything before section body + sorted entries + remainder
-    prefix_lines = lines[:section_line_idx + 1]  # up to and including the ### line
-    suffix_lines = lines[section_end:]
+# ---------------------------------------------------------------------------
+# Index file model
+# ---------------------------------------------------------------------------
 
-    entries_block = _render_entries_block(all_entries)
-    prefix_text = "\n".join(prefix_lines)
-    suffix_text = "\n".join(suffix_lines)
+_INDEX_REF_RE = re.compile(r'\(blockscout-api/([^)]+)\)')
+_INDEX_ITEM_RE = re.compile(r'^-\s+')
+_INDEX_ITEM_PATH_RE = re.compile(r'^-\s+`?(/[^`:\s]+)')
 
-    # Build final content
-    if suffix_text.strip():
-        content = prefix_text + "\n\n" + entries_block + suffix_text
-    else:
-        content = prefix_text + "\n\n" + entries_block
 
-    # Ensure single trailing newline
-    content = content.rstrip() + "\n"
+def _index_item(line: str) -> tuple[str, str]:
+    """An index line item as (sort key, line): normalised path, case-insensitive."""
+    m = _INDEX_ITEM_PATH_RE.match(line)
+    return (_normalise(m.group(1)).lower() if m else line.lower()), line
 
-    try:
-        filepath.write_text(content, encoding="utf-8")
-    except OSError as exc:
-        print(f"Error: cannot write {filepath}: {exc}")
-        sys.exit(1)
 
-    count = len(new_endpoints)
-    return (f"Patched: blockscout-api/{filename} "
-            f"(added {count} endpoint{'s' if count != 1 else ''} to ### {h3_section})")
+def parse_index(text: str) -> dict:
+    """
+    Split the master index into its preamble and H2 sections:
+    {"preamble": lines, "sections": [section], "files": {filename: section},
+    "changed": False}.
+    Each section holds its heading, the api file it links to, its raw body
+    lines, and — for re-sorting — its line items with their sort keys and
+    its other non-blank lines (`lead`, e.g. the ethereum.md description).
+    """
+    index: dict = {"preamble": [], "sections": [], "files": {}, "changed": False}
+    body = index["preamble"]
+    for line in text.splitlines():
+        if line.startswith("## "):
+            m = _INDEX_REF_RE.search(line)
+            section = {"heading": line, "file": m.group(1) if m else None, "body": [], "items": [], "lead": []}
+            index["sections"].append(section)
+            if section["file"]:
+                index["files"].setdefault(section["file"], section)
+            body = section["body"]
+        else:
+            body.append(line)
+    for section in index["sections"]:
+        for line in section["body"]:
+            if _INDEX_ITEM_RE.match(line):
+                section["items"].append(_index_item(line))
+            elif line.strip() and not line.startswith("-"):
+                section["lead"].append(line)
+    return index
+
+
+def render_index(index: dict) -> str:
+    """Serialize a parsed master index, with a blank line before every section."""
+    lines = list(index["preamble"])
+    for section in index["sections"]:
+        if lines and lines[-1].strip():
+            lines.append("")
+        lines.append(section["heading"])
+        lines.extend(section["body"])
+    content = "\n".join(lines)
+    if not content.endswith("\n"):
+        content += "\n"
+    return content
 
 # ---------------------------------------------------------------------------
 # Index file patching
@@ -475,127 +624,228 @@ def _get_display_name_for_file(filename: str, h3_section: str) -> str:
     return h3_section
 
 
-def patch_index_file(
-    file_sections: dict[str, list[tuple[str, dict]]],
-    existing_count: int,
-) -> int:
+def _insert_index_section(index: dict, filename: str, display_name: str, new_lines: list[str]) -> None:
     """
-    Update the master index file with new endpoint entries.
-    file_sections: {filename: [(h3_section, endpoint_dict), ...]}
-    Returns new total path count.
+    Add a new chain section in alphabetical position by filename among the
+    chain sections, which follow the last topic section.
     """
-    text = INDEX_FILE.read_text(encoding="utf-8")
-    lines = text.splitlines()
+    sections = index["sections"]
+    topic_files = set(TOPIC_FILE_ORDER)
+    last_topic = max((i for i, s in enumerate(sections) if s["file"] in topic_files), default=-1)
+    position = len(sections)
+    for i in range(last_topic + 1, len(sections)):
+        chain_file = sections[i]["file"]
+        if chain_file and filename.lower() < chain_file.lower():
+            position = i
+            break
+
+    section = {
+        "heading": f"## [{display_name}](blockscout-api/{filename})",
+        "file": filename,
+        "body": [""] + new_lines,
+        "items": [_index_item(line) for line in new_lines],
+        "lead": [],
+    }
+    sections.insert(position, section)
+    index["files"][filename] = section
+
+
+def _rebuild_index_section(section: dict) -> None:
+    """
+    Rewrite a section body from its line items, keeping the non-list lead
+    lines (e.g. the ethereum.md description) between heading and items.
+    """
+    body = [""]
+    if section["lead"]:
+        body.extend(section["lead"])
+        body.append("")
+    body.extend(line for _, line in section["items"])
+    section["body"] = body
 
-    # Process each file that has new endpoints
+
+def patch_index(index: dict, file_sections: dict[str, list[tuple[str, dict]]]) -> None:
+    """
+    Add the new endpoint line items to a parsed master index.
+    file_sections: {filename: [(h3_section, endpoint_dict), ...]}
+    """
     for filename, section_eps in file_sections.items():
-        # Collect new line items grouped by section
-        # (for the index, all endpoints from the same file go into the same section)
+        # For the index, all endpoints from the same file go into the same section.
         new_lines = [_make_index_line(ep) for _, ep in section_eps]
+        section = index["files"].get(filename)
 
-        # Find the H2 section for this file in the index
-        file_ref = f"blockscout-api/{filename}"
-        section_idx: int | None = None
-        for i, line in enumerate(lines):
-            # Match: ## [DisplayName](blockscout-api/filename.md) or similar
-            if re.search(re.escape(file_ref), line) and line.startswith("## "):
-                section_idx = i
-                break
-
-        if section_idx is not None:
-            # Find the extent of this section (until next ## or EOF)
-            section_end = len(lines)
-            for i in range(section_idx + 1, len(lines)):
-                if lines[i].startswith("## "):
-                    section_end = i
-                    break
-
-            # Collect existing list items
-            existing_items: list[str] = []
-            non_item_lines: list[str] = []  # preamble lines (non-list, non-blank after heading)
-            for i in range(section_idx + 1, section_end):
-                line = lines[i]
-                if re.match(r'^-\s+', line):
-                    existing_items.append(line)
-                else:
-                    non_item_lines.append((i, line))
-
-            # Merge and sort all items
-            all_items = existing_items + new_lines
-            all_items.sort(key=lambda l: _normalise(re.match(r'^-\s+`?(/[^`:\s]+)', l).group(1)).lower()
-                           if re.match(r'^-\s+`?(/[^`:\s]+)', l) else l.lower())
-
-            # Reconstruct the section
-            heading_line = lines[section_idx]
-            new_section_lines = [heading_line, ""]
-            # Re-add non-list preamble lines (e.g., ethereum.md description)
-            preamble = [l for _, l in non_item_lines if l.strip() and not l.startswith("-")]
-            if preamble:
-                new_section_lines.extend(preamble)
-                new_section_lines.append("")
-            new_section_lines.extend(all_items)
-
-            # Replace the section in lines
-            lines = lines[:section_idx] + new_section_lines + lines[section_end:]
-
-        else:
-            # New chain section — insert in alphabetical position among chain sections
-            # Find where chain sections start (after last topic section)
-            topic_refs = {f"blockscout-api/{f}" for f in TOPIC_FILE_ORDER}
-            last_topic_end = 0
-            for i, line in enumerate(lines):
-                if line.startswith("## "):
-                    ref_m = re.search(r'\(blockscout-api/([^)]+)\)', line)
-                    if ref_m and f"blockscout-api/{ref_m.group(1)}" in topic_refs:
-                        # Find end of this section
-                        end = len(lines)
-                        for j in range(i + 1, len(lines)):
-                            if lines[j].startswith("## "):
-                                end = j
-                                break
-                        last_topic_end = end
-
-            # Collect chain section headings and their positions
-            chain_sections: list[tuple[str, int]] = []  # (filename, start_line_idx)
-            i = last_topic_end
-            while i < len(lines):
-                line = lines[i]
-                if line.startswith("## "):
-                    ref_m = re.search(r'\(blockscout-api/([^)]+)\)', line)
-                    if ref_m:
-                        chain_sections.append((ref_m.group(1), i))
-                i += 1
-
-            # Determine insertion position alphabetically by filename
-            insert_before_idx = len(lines)  # default: append at end
-            for chain_fname, chain_line_idx in chain_sections:
-                if filename.lower() < chain_fname.lower():
-                    insert_before_idx = chain_line_idx
-                    break
-
-            # Determine display name (h3_section of first entry for this file)
+        if section is None:
+            # New chain section; display name from the h3_section of its first entry.
             display_name = _get_display_name_for_file(
                 filename,
                 section_eps[0][0] if section_eps else filename
             )
-            new_section_text = [
-                "",
-                f"## [{display_name}](blockscout-api/{filename})",
-                "",
-            ]
-            new_section_text.extend(new_lines)
+            _insert_index_section(index, filename, display_name, new_lines)
+            continue
 
-            lines = lines[:insert_before_idx] + new_section_text + lines[insert_before_idx:]
+        # Merge and re-sort the line items.
+        section["items"] = sorted(section["items"] + [_index_item(line) for line in new_lines],
+                                  key=lambda item: item[0])
+        _rebuild_index_section(section)
+    if file_sections:
+        index["changed"] = True
 
-    # Write updated index
-    content = "\n".join(lines)
-    if not content.endswith("\n"):
-        content += "\n"
-    INDEX_FILE.write_text(content, encoding="utf-8")
 
-    # Recount paths in updated index
-    _, new_count = build_normalised_paths()
-    return new_count
+def patch_index_file(
+    text: str,
+    file_sections: dict[str, list[tuple[str, dict]]],
+) -> str:
+    """
+    Return the master index text with the new endpoint entries added.
+    file_sections: {filename: [(h3_section, endpoint_dict), ...]}
+    """
+    index = parse_index(text)
+    patch_index(index, file_sections)
+    return render_index(index)
+
+# ---------------------------------------------------------------------------
+# Post-processing rules
+# ---------------------------------------------------------------------------
+
+# Required fields per rule kind (spec Section 9a).
+RULE_FIELDS: dict[str, tuple[str, ...]] = {
+    "sections": ("file", "section", "preamble"),
+    "inserts":  ("file", "section", "path", "description"),
+    "removals": ("file", "path"),
+}
+
+
+def load_rules() -> dict:
+    """
+    Load the post-processing rules from the sibling YAML rules file.
+    Returns {"sections": [...], "inserts": [...], "removals": [...]}.
+    Exits on any I/O, parse, or schema error.
+    """
+    print(f"Loading rules: {RULES_FILE}...")
+    try:
+        data = yaml.safe_load(RULES_FILE.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        print(f"Error: rules file not found: {RULES_FILE}")
+        sys.exit(1)
+    except OSError as exc:
+        print(f"Error: cannot read rules file {RULES_FILE}: {exc}")
+        sys.exit(1)
+    except yaml.YAMLError as exc:
+        print(f"Error: invalid YAML in rules file {RULES_FILE}: {exc}")
+        sys.exit(1)
+
+    if not isinstance(data, dict):
+        print(f"Error: rules file {RULES_FILE} must be a mapping")
+        sys.exit(1)
+    rules: dict[str, list[dict]] = {}
+    for kind, fields in RULE_FIELDS.items():
+        entries = data.get(kind) or []
+        if not isinstance(entries, list):
+            print(f"Error: rules file {RULES_FILE} '{kind}' must be a list")
+            sys.exit(1)
+        for i, rule in enumerate(entries):
+            missing = [f for f in fields if not isinstance(rule, dict) or not rule.get(f)]
+            if missing:
+                print(f"Error: rules file {RULES_FILE} {kind}[{i}] is missing: {', '.join(missing)}")
+                sys.exit(1)
+        rules[kind] = entries
+
+    print(f"  {len(rules['inserts'])} inserts, {len(rules['removals'])} removals, "
+          f"{len(rules['sections'])} section definitions")
+    print()
+    return rules
+
+
+def render_rule_entry(rule: dict) -> str:
+    """Render an insert rule as an endpoint entry in the api-format-spec.md format."""
+    lines = [f"#### {rule.get('method', 'GET')} {rule['path']}", "", rule["description"].strip(), ""]
+    lines.append("- **Parameters**")
+    lines.append("")
+    params = rule.get("parameters") or []
+    if params:
+        lines.append("  | Name | Type | Required | Description |")
+        lines.append("  | ---- | ---- | -------- | ----------- |")
+        for param in params:
+            required = "Yes" if param.get("required") else "No"
+            lines.append(f"  | `{param['name']}` | `{param.get('type', 'string')}` | {required} | "
+                         f"{param.get('description', '')} |")
+    else:
+        lines.append("  *None*")
+    return "\n".join(lines)
+
+
+def _find_api_entry(doc: dict, heading: str) -> dict | None:
+    """Return the block of a parsed API file holding the entry `heading`, or None."""
+    for block in doc["blocks"]:
+        if block["entries"] is None:
+            if heading in block["lines"]:
+                return block
+        elif any(text.split("\n", 1)[0] == heading for _, text in block["entries"]):
+            return block
+    return None
+
+
+def _index_item_path(line: str) -> str | None:
+    """The backtick-wrapped path of an index line item, or None."""
+    m = _INDEX_PATH_RE.match(line)
+    return m.group(1) if m else None
+
+
+def apply_rules(rules: dict, trees: dict[str, dict], documents: dict[str, str], index: dict) -> dict[str, int]:
+    """
+    Apply the insert and removal rules to the parsed API files (`trees`,
+    parsed from `documents` on first use) and the parsed master index.
+    Rules that are already satisfied are skipped, so applying them twice
+    changes nothing. Returns {"inserted", "removed", "satisfied"} counts.
+    """
+    counts = {"inserted": 0, "removed": 0, "satisfied": 0}
+    preambles = {(r["file"], r["section"]): r["preamble"] for r in rules["sections"]}
+    index_paths = {_index_item_path(line) for section in index["sections"] for _, line in section["items"]}
+
+    for rule in rules["inserts"]:
+        filename, path = rule["file"], rule["path"]
+        heading = f"#### {rule.get('method', 'GET')} {path}"
+        doc = _api_tree(trees, documents, filename)
+        changed = False
+        if _find_api_entry(doc, heading) is None:
+            block = _api_section(doc, rule["section"], preambles.get((filename, rule["section"]), ""))
+            block["entries"].append(_entry(path, rule.get("method", "GET"), render_rule_entry(rule)))
+            doc["changed"] = changed = True
+        if rule.get("index_description") and path not in index_paths:
+            patch_index(index, {filename: [(rule["section"], {"path": path, "description": rule["index_description"]})]})
+            index_paths.add(path)
+            changed = True
+        if changed:
+            counts["inserted"] += 1
+            print(f"  Inserted: {heading[5:]} into blockscout-api/{filename} (### {rule['section']})")
+        else:
+            counts["satisfied"] += 1
+
+    for rule in rules["removals"]:
+        filename, path = rule["file"], rule["path"]
+        heading = f"#### {rule.get('method', 'GET')} {path}"
+        changed = False
+        if api_document(filename) in documents or api_document(filename) in trees:
+            doc = _api_tree(trees, documents, filename)
+            block = _find_api_entry(doc, heading)
+            if block is not None:
+                _parse_block(block)
+                block["entries"] = [e for e in block["entries"] if e[1].split("\n", 1)[0] != heading]
+                doc["changed"] = changed = True
+        section = index["files"].get(filename)
+        if section is not None and path in index_paths:
+            items = [item for item in section["items"] if _index_item_path(item[1]) != path]
+            if len(items) != len(section["items"]):
+                section["items"] = items
+                _rebuild_index_section(section)
+                index["changed"] = changed = True
+        if changed:
+            counts["removed"] += 1
+            tool = f" (duplicates {rule['mcp_tool']})" if rule.get("mcp_tool") else ""
+            print(f"  Removed: {heading[5:]} from blockscout-api/{filename}{tool}")
+        else:
+            counts["satisfied"] += 1
+
+    return counts
 
 # ---------------------------------------------------------------------------
 # Console output helpers
@@ -634,59 +884,138 @@ def _format_classification_summary(
 # Main
 # ---------------------------------------------------------------------------
 
-def main() -> None:
-    # 1. Load catalog
+def apply_extras(documents: dict[str, str]) -> set[str]:
+    """
+    Patch the reference documents ({path relative to REFERENCES_DIR: markdown})
+    in place with the missing catalog endpoints and the post-processing rules.
+    Each document is parsed at most once and re-rendered once. Returns the
+    keys of the documents that changed. Exits with code 1 if there is no
+    index document.
+    """
+    # 1. Load catalog and rules
     endpoints = load_catalog()
+    rules = load_rules()
+    profile_step("1. Load catalog and rules")
 
-    # 2. Build normalised path set from existing index
-    normalised_existing, existing_count = build_normalised_paths()
+    # 2. Build the documented path template trie from the existing index
+    if INDEX_DOCUMENT not in documents:
+        print(f"Error: index file not found: {INDEX_DOCUMENT}")
+        print("Run api-file-generator.py before running this script.")
+        sys.exit(1)
+    trie, existing_count = build_path_trie(documents[INDEX_DOCUMENT])
+    index = parse_index(documents[INDEX_DOCUMENT])
     print(f"Reading existing index: {existing_count} documented paths")
     print()
+    profile_step("2. Read existing index", items=existing_count)
 
     # 3. Identify missing endpoints
-    missing = find_missing(endpoints, normalised_existing)
+    missing, subsumed = find_missing(endpoints, trie)
     print(f"Identifying missing endpoints: {len(missing)}")
+    for ep, template in subsumed:
+        print(f"  Covered: {ep['path']}  (by {template})")
     print()
+    profile_step("3. Identify missing endpoints", items=len(missing))
 
-    if not missing:
-        print("Nothing to patch.")
-        print()
-        print("Done.")
-        return
+    trees: dict[str, dict] = {}
+    if missing:
+        # 4. Classify missing endpoints
+        classified = classify_endpoints(missing)
 
-    # 4. Classify missing endpoints
-    classified = classify_endpoints(missing)
+        # Determine which files are new (don't exist yet)
+        new_files: set[str] = set()
+        for (fname, _) in classified:
+            if api_document(fname) not in documents:
+                new_files.add(fname)
 
-    # Determine which files are new (don't exist yet)
-    new_files: set[str] = set()
-    for (fname, _) in classified:
-        if not (API_DIR / fname).exists():
-            new_files.add(fname)
+        print("Classifying...")
+        _format_classification_summary(classified, new_files)
+        print()
+        profile_step("4. Classify", items=len(missing))
+
+        # 5. Patch API files
+        print("Patching API files...")
+        for (fname, section), eps in sorted(
+            classified.items(),
+            key=lambda item: (0 if item[0][0] in set(TOPIC_FILE_ORDER) else 1, item[0][0].lower())
+        ):
+            status = patch_api_file(trees, documents, fname, section, eps)
+            print(f"  {status}")
+        print()
+        profile_step("5. Patch API files", items=len(classified))
+
+        # 6. Patch index
+        # Build file_sections: {filename: [(h3_section, ep), ...]}
+        file_sections: dict[str, list[tuple[str, dict]]] = {}
+        for (fname, section), eps in classified.items():
+            for ep in eps:
+                file_sections.setdefault(fname, []).append((section, ep))
+        patch_index(index, file_sections)
+        profile_step("6. Patch index", items=len(missing))
+    else:
+        print("Nothing to patch from the catalog.")
+        print()
 
-    print("Classifying...")
-    _format_classification_summary(classified, new_files)
+    # 7. Apply post-processing rules
+    print("Applying rules...")
+    counts = apply_rules(rules, trees, documents, index)
+    print(f"  {counts['inserted']} inserted, {counts['removed']} removed, "
+          f"{counts['satisfied']} already applied")
     print()
+    profile_step("7. Apply rules", items=len(rules["inserts"]) + len(rules["removals"]))
+
+    # 8. Render the changed documents
+    changed: set[str] = set()
+    for key, doc in trees.items():
+        if doc["changed"]:
+            documents[key] = render_api_document(doc)
+            changed.add(key)
+    if index["changed"]:
+        documents[INDEX_DOCUMENT] = render_index(index)
+        changed.add(INDEX_DOCUMENT)
+        _, new_count = build_path_trie(documents[INDEX_DOCUMENT])
+        print(f"Updating {INDEX_DOCUMENT}: {existing_count} → {new_count} endpoints")
+        print()
+    profile_step("8. Render documents", items=len(changed))
 
-    # 5. Patch API files
-    print("Patching API files...")
-    for (fname, section), eps in sorted(
-        classified.items(),
-        key=lambda item: (0 if item[0][0] in set(TOPIC_FILE_ORDER) else 1, item[0][0].lower())
-    ):
-        status = patch_api_file(fname, section, eps)
-        print(f"  {status}")
-    print()
+    # 9. Re-locate the entries of the patched files (sidecar and index ranges)
+    changed |= add_entry_locations(documents)
+    profile_step("9. Locate entries")
 
-    # 6. Update index file
-    # Build file_sections: {filename: [(h3_section, ep), ...]}
-    file_sections: dict[str, list[tuple[str, dict]]] = {}
-    for (fname, section), eps in classified.items():
-        for ep in eps:
-            file_sections.setdefault(fname, []).append((section, ep))
+    return changed
 
-    new_count = patch_index_file(file_sections, existing_count)
-    print(f"Updating blockscout-api-index.md: {existing_count} → {new_count} endpoints")
-    print()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Patch the Blockscout API reference files from the frozen extras catalog."
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Write nothing; exit with code 1 if any reference file is not up to date",
+    )
+    add_profile_arguments(parser, "api-extras-applier")
+    args = parser.parse_args()
+    start_profile("api-extras-applier", args.profile, args.cprofile)
+
+    documents = read_reference_documents()
+    originals = dict(documents)
+    changed = apply_extras(documents)
+    changed = {key for key in changed if documents[key] != originals.get(key)}
+
+    if args.check:
+        for key in sorted(changed):
+            print(f"  Out of date: {key}")
+        print("Check failed." if changed else "Check passed: reference files are up to date.")
+        sys.exit(1 if changed else 0)
+
+    # 10. Write the patched files
+    if changed:
+        print("Writing patched files...")
+        counts = write_reference_documents({key: documents[key] for key in sorted(changed)})
+        profile_step("10. Write patched files", items=counts["written"])
+        write_search_index(documents)
+        print()
+        profile_step("11. Write search index")
 
     print("Done.")
 
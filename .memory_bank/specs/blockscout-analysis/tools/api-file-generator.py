@@ -5,14 +5,22 @@ API File Generator for Blockscout endpoint maps.
 Reads main-indexer and stats-service endpoint maps, classifies GET endpoints
 into thematic Markdown API reference files, and writes a master index.
 
+Swaggers are loaded once, before enrichment; with --jobs > 1, cold swaggers
+are parsed in a process pool and every API file is enriched and rendered in
+its own worker. Output is identical to a serial run.
+
 Usage (from repo root):
     python .memory_bank/specs/blockscout-analysis/tools/api-file-generator.py
+        [--jobs N] [--profile [REPORT]] [--cprofile PSTATS]
 """
 
+import argparse
+import io
 import json
+import os
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TextIO
 
 import yaml
 
@@ -20,26 +28,43 @@ import yaml
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from common import (  # noqa: E402
-    REFERENCES_DIR,
-    API_DIR,
+    BUILD_DIR,
+    INDEX_DOCUMENT,
+    add_entry_locations,
     TOPIC_FILE_ORDER,
     TOPIC_HEADINGS,
     CHAIN_FILE_CONFIG,
     EXCLUDED_PARAM_NAMES,
-    classify_endpoint,
+    classify_many,
     chain_file_info,
     format_index_line,
     first_paragraph,
+    endpoint_map_jsonl_path,
+    is_parse_cached,
+    iter_endpoint_map,
+    load_yaml_document,
+    parse_cache_stats,
+    process_pool,
+    print_parse_cache_stats,
+    add_profile_arguments,
+    api_document,
+    deref,
+    ref_resolver,
+    schema_type,
+    profile_step,
+    start_profile,
+    write_reference_documents,
+    write_search_index,
 )
 
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
 
-MAIN_INDEXER_MAP = Path("blockscout-analysis/.build/swaggers/main-indexer/endpoints_map.json")
-STATS_SERVICE_MAP = Path("blockscout-analysis/.build/swaggers/stats-service/endpoints_map.json")
-MAIN_INDEXER_SWAGGER_DIR = Path("blockscout-analysis/.build/swaggers/main-indexer")
-STATS_SERVICE_SWAGGER_DIR = Path("blockscout-analysis/.build/swaggers/stats-service")
+MAIN_INDEXER_SWAGGER_DIR = BUILD_DIR / "swaggers" / "main-indexer"
+STATS_SERVICE_SWAGGER_DIR = BUILD_DIR / "swaggers" / "stats-service"
+MAIN_INDEXER_MAP = MAIN_INDEXER_SWAGGER_DIR / "endpoints_map.json"
+STATS_SERVICE_MAP = STATS_SERVICE_SWAGGER_DIR / "endpoints_map.json"
 
 # ---------------------------------------------------------------------------
 # Script-specific config
@@ -49,48 +74,116 @@ STATS_SERVICE_SWAGGER_DIR = Path("blockscout-analysis/.build/swaggers/stats-serv
 STATS_CHAIN_SECTION = "Chain Statistics"
 STATS_SERVICE_SECTION = "Stats Service"
 
+# Default for --jobs: enrichment and rendering are CPU-bound.
+DEFAULT_JOBS = min(8, os.cpu_count() or 1)
+
+# Below this many records a process pool costs more than it saves.
+PARALLEL_MIN_RECORDS = 2000
+
+# Swaggers loaded by load_swaggers(), keyed by path. File pool workers do
+# not share it (see common.process_pool); they fill their own from the
+# on-disk parse cache the parent has just written.
+_swagger_cache: dict = {}
+
+# `$ref` resolvers of the loaded swaggers, keyed by swagger path; cleared
+# with the swagger cache so a reload never sees stale targets.
+_ref_cache: dict[str, dict] = {}
+
 # ---------------------------------------------------------------------------
 # Loading helpers
 # ---------------------------------------------------------------------------
 
 def load_endpoint_map(path: Path) -> list[dict]:
-    """Load a JSON endpoint map. Exits with code 1 on error."""
+    """
+    Load an endpoint map. Exits with code 1 on error.
+
+    Accepts the JSONL map (streamed line by line) or the legacy JSON array.
+    Given the legacy `endpoints_map.json` path, the JSONL sibling written by
+    the indexers is preferred when it exists.
+    """
+    jsonl_path = endpoint_map_jsonl_path(path)
+    if path.suffix == ".json" and jsonl_path.exists():
+        path = jsonl_path
     try:
-        text = path.read_text(encoding="utf-8")
+        return list(iter_endpoint_map(path))
     except FileNotFoundError:
         print(f"Error: endpoint map not found: {path}")
         sys.exit(1)
-    try:
-        return json.loads(text)
     except json.JSONDecodeError as exc:
         print(f"Error: malformed JSON in {path}: {exc}")
         sys.exit(1)
 
 
-def load_swagger(path: Path, cache: dict) -> Optional[dict]:
-    """Load and cache a swagger YAML. Returns None on any error (prints warning)."""
+def load_swagger(path: Path, cache: dict, out: Optional[TextIO] = None) -> Optional[dict]:
+    """
+    Load and cache a swagger YAML. Returns None on any error (prints a warning
+    to `out`, default stdout).
+
+    Parsing goes through common.load_yaml_document, so swaggers already parsed
+    by the indexers are read back from the on-disk parse cache.
+    """
     key = str(path)
     if key in cache:
         return cache[key]
     try:
-        text = path.read_text(encoding="utf-8")
+        data, _ = load_yaml_document(path)
     except FileNotFoundError:
-        print(f"Warning: swagger YAML not found: {path}")
+        print(f"Warning: swagger YAML not found: {path}", file=out)
         cache[key] = None
         return None
-    try:
-        data = yaml.safe_load(text)
     except yaml.YAMLError as exc:
-        print(f"Warning: invalid YAML in {path}: {exc}")
+        print(f"Warning: invalid YAML in {path}: {exc}", file=out)
         cache[key] = None
         return None
     if not isinstance(data, dict) or "paths" not in data:
-        print(f"Warning: {path} has no 'paths' key or is not a dict, skipping.")
+        print(f"Warning: {path} has no 'paths' key or is not a dict, skipping.", file=out)
         cache[key] = None
         return None
     cache[key] = data
     return data
 
+
+def _parse_swagger(path: Path) -> tuple[dict[str, int], Optional[str]]:
+    """
+    Process-pool worker: parse one swagger into the on-disk parse cache.
+    Returns (parse cache counts from this call, YAML error message or None).
+    """
+    before = dict(parse_cache_stats)
+    error = None
+    try:
+        load_yaml_document(path)
+    except yaml.YAMLError as exc:
+        error = str(exc)
+    return {counter: parse_cache_stats[counter] - before[counter] for counter in before}, error
+
+
+def load_swaggers(paths: list[Path], jobs: int) -> dict:
+    """
+    Load every swagger in `paths` once into the shared swagger cache.
+
+    With jobs > 1, swaggers missing from the parse cache are parsed
+    concurrently first (each exactly once); the rest are read back from the
+    parse cache. Warnings are printed in `paths` order.
+    """
+    _swagger_cache.clear()
+    _ref_cache.clear()
+    cold = [p for p in paths if p.exists() and not is_parse_cached(p)] if jobs > 1 else []
+    errors: dict[str, str] = {}
+    if len(cold) > 1:
+        with process_pool(min(jobs, len(cold)), __file__) as pool:
+            for path, (counts, error) in zip(cold, pool.map(_parse_swagger, cold)):
+                for counter, count in counts.items():
+                    parse_cache_stats[counter] += count
+                if error is not None:
+                    errors[str(path)] = error
+    for path in paths:
+        if str(path) in errors:
+            print(f"Warning: invalid YAML in {path}: {errors[str(path)]}")
+            _swagger_cache[str(path)] = None
+        else:
+            load_swagger(path, _swagger_cache)
+    return _swagger_cache
+
 # ---------------------------------------------------------------------------
 # Classification
 # ---------------------------------------------------------------------------
@@ -135,6 +228,10 @@ def classify_records(
             file_meta[fname] = {"display_name": info["heading"], "preamble": info["preamble"]}
         return file_meta[fname]["display_name"]
 
+    # Classify every distinct main-indexer path in one batch.
+    main_paths = [rec["endpoint"] for rec in main_records]
+    path_files = dict(zip(main_paths, classify_many(main_paths)))
+
     # Process main-indexer records.
     for rec in main_records:
         if rec.get("method") != "GET":
@@ -159,7 +256,7 @@ def classify_records(
         sf = rec["swagger_file"]
         transformed = "/api" + endpoint
 
-        fname = classify_endpoint(endpoint)
+        fname = path_files[endpoint]
 
         if fname is not None:
             # Determine section heading.
@@ -202,12 +299,12 @@ def classify_records(
 # Description resolution
 # ---------------------------------------------------------------------------
 
-def resolve_description(record: dict, swagger_path: Path, cache: dict) -> str:
+def resolve_description(record: dict, swagger_path: Path, cache: dict, out: Optional[TextIO] = None) -> str:
     """Return description from record, falling back to swagger summary if empty."""
     desc = record.get("description", "")
     if desc:
         return desc
-    swagger = load_swagger(swagger_path, cache)
+    swagger = load_swagger(swagger_path, cache, out)
     if swagger is None:
         return ""
     method_lower = record["method"].lower()
@@ -218,27 +315,55 @@ def resolve_description(record: dict, swagger_path: Path, cache: dict) -> str:
 # Parameter extraction
 # ---------------------------------------------------------------------------
 
-def _get_param_type(param: dict) -> str:
+def _resolver(swagger: dict, swagger_path: Path) -> dict:
+    """The `$ref` resolver of a loaded swagger (see common.ref_resolver)."""
+    resolver = _ref_cache.get(str(swagger_path))
+    if resolver is None:
+        resolver = _ref_cache[str(swagger_path)] = ref_resolver(swagger, f"swagger ({swagger_path})")
+    return resolver
+
+
+def _get_param_type(param: dict, swagger: dict, swagger_path: Path, out: Optional[TextIO] = None) -> str:
     """Resolve parameter type, supporting both OpenAPI 3.0 and Swagger 2.0."""
     schema = param.get("schema")
-    if isinstance(schema, dict):
-        t = schema.get("type")
+    if schema is not None:
+        t = schema_type(schema, _resolver(swagger, swagger_path), out=out)
         if t:
             return t
     return param.get("type") or "string"
 
 
+def _resolve_parameters(
+    path_obj: dict, method_obj: dict, swagger: dict, swagger_path: Path, out: Optional[TextIO] = None
+) -> list[dict]:
+    """
+    Parameters of an operation with `$ref`s resolved. Path-item-level
+    parameters are inherited; an operation parameter with the same
+    (name, in) overrides the inherited one in place.
+    """
+    resolver = _resolver(swagger, swagger_path)
+    merged: dict[tuple[str, str], dict] = {}
+    for source in (path_obj, method_obj):
+        for p in source.get("parameters") or []:
+            p = deref(p, resolver, out)
+            if p is not None:
+                merged[(p.get("name", ""), p.get("in", ""))] = p
+    return list(merged.values())
+
+
 def extract_parameters(
     record: dict,
     swagger_path: Path,
     cache: dict,
+    out: Optional[TextIO] = None,
 ) -> Optional[list[dict]]:
     """
     Extract path and query parameters from swagger for this endpoint.
-    Returns None on load failure or missing path/method (prints warning).
+    Returns None on load failure or missing path/method (prints a warning to
+    `out`, default stdout).
     Returns [] for endpoints with no path/query params.
     """
-    swagger = load_swagger(swagger_path, cache)
+    swagger = load_swagger(swagger_path, cache, out)
     if swagger is None:
         return None
 
@@ -248,16 +373,16 @@ def extract_parameters(
 
     path_obj = paths.get(endpoint)
     if path_obj is None:
-        print(f"Warning: endpoint path not in swagger ({swagger_path}): {endpoint}")
+        print(f"Warning: endpoint path not in swagger ({swagger_path}): {endpoint}", file=out)
         return None
 
     method_obj = path_obj.get(method_lower)
     if method_obj is None:
-        print(f"Warning: method {record['method']} not in swagger for: {endpoint}")
+        print(f"Warning: method {record['method']} not in swagger for: {endpoint}", file=out)
         return None
 
     result = []
-    for p in method_obj.get("parameters", []):
+    for p in _resolve_parameters(path_obj, method_obj, swagger, swagger_path, out):
         param_in = p.get("in", "")
         if param_in not in ("path", "query"):
             continue
@@ -265,7 +390,7 @@ def extract_parameters(
         if name in EXCLUDED_PARAM_NAMES:
             # Auth/access params (e.g. apikey, key) — see common.EXCLUDED_PARAM_NAMES.
             continue
-        type_str = _get_param_type(p)
+        type_str = _get_param_type(p, swagger, swagger_path, out)
         required = True if param_in == "path" else bool(p.get("required", False))
         description = p.get("description", "") or ""
         result.append({
@@ -350,7 +475,7 @@ def _render_index_file(
         "Use this index to find available endpoints for the `direct_api_call` Blockscout MCP tool. Follow a two-step discovery process:",
         "",
         "1. **Find the endpoint below** — locate it by name or category in this index.",
-        "2. **Read the linked detail file** — follow the section link (e.g., [Addresses](blockscout-api/addresses.md)) to get full parameter types and descriptions for use with `direct_api_call`.",
+        "2. **Read the linked detail file** — follow the section link (e.g., [Addresses](blockscout-api/addresses.md)) to get full parameter types and descriptions for use with `direct_api_call`. The `(lines N-M)` after each path is the line range of its entry in that file, so you can read just that slice.",
     ]
 
     def _add_section(fname: str) -> None:
@@ -402,17 +527,16 @@ def _resolve_swagger_path(record: dict) -> Path:
     return MAIN_INDEXER_SWAGGER_DIR / record["swagger_file"]
 
 # ---------------------------------------------------------------------------
-# File writing
+# Document building
 # ---------------------------------------------------------------------------
 
-def _write_api_file(
+def _build_api_file(
     filename: str,
-    classified: dict,
-    file_meta: dict,
-) -> None:
-    """Build sections, render, and write one API file."""
-    records = classified.get(filename, [])
-    preamble = file_meta.get(filename, {}).get("preamble")
+    records: list[dict],
+    meta: dict,
+) -> str:
+    """Build sections and render one API file."""
+    preamble = meta.get("preamble")
 
     if filename == "stats.md":
         sections = {
@@ -420,12 +544,69 @@ def _write_api_file(
             STATS_SERVICE_SECTION: [r for r in records if r["section_heading"] == STATS_SERVICE_SECTION],
         }
     else:
-        heading = file_meta.get(filename, {}).get("display_name") or TOPIC_HEADINGS.get(filename, filename)
+        heading = meta.get("display_name") or TOPIC_HEADINGS.get(filename, filename)
         sections = {heading: records}
 
-    content = _render_api_file(sections, preamble)
-    (API_DIR / filename).write_text(content, encoding="utf-8")
-    print(f"  Written: {filename}")
+    return _render_api_file(sections, preamble)
+
+
+def _enrich_and_build(
+    filename: str, records: list[dict], meta: dict, unloadable: tuple[str, ...] = ()
+) -> tuple[str, list[dict], str]:
+    """
+    Process-pool worker (also called directly for serial runs): resolve
+    descriptions and parameters, sort, and render one API file. `unloadable`
+    lists the swaggers the parent already failed to load and warned about,
+    so a pool worker skips them without repeating the warning.
+
+    Returns (content, enriched records in file order, console output). The
+    warnings go to a buffer passed down to the resolvers, not to sys.stdout,
+    so they appear in file order and never pick up other threads' output.
+    """
+    output = io.StringIO()
+    for key in unloadable:
+        _swagger_cache.setdefault(key, None)
+    for rec in records:
+        swagger_path = _resolve_swagger_path(rec)
+        rec["_description"] = resolve_description(rec, swagger_path, _swagger_cache, output)
+        rec["_params"] = extract_parameters(rec, swagger_path, _swagger_cache, output)
+    records.sort(key=lambda r: (r["transformed_path"].lower(), r["method"]))
+    content = _build_api_file(filename, records, meta)
+    return content, records, output.getvalue()
+
+
+def build_api_files(classified: dict, file_meta: dict, filenames: list[str], jobs: int) -> dict[str, str]:
+    """
+    Enrich, sort and render the API files, across a process pool when
+    jobs > 1 and the workload is large enough. Replaces the records in
+    `classified` with their enriched, sorted copies and returns the
+    documents; both are identical to a serial run.
+    """
+    total = sum(len(classified.get(fname, [])) for fname in filenames)
+    results: dict[str, tuple[str, list[dict], str]] = {}
+    if jobs > 1 and total >= PARALLEL_MIN_RECORDS:
+        # Largest files first, so one big file does not finish last.
+        order = sorted(filenames, key=lambda fname: -len(classified.get(fname, [])))
+        unloadable = tuple(key for key, swagger in _swagger_cache.items() if swagger is None)
+        with process_pool(min(jobs, len(filenames)), __file__) as pool:
+            futures = {
+                fname: pool.submit(
+                    _enrich_and_build, fname, classified.get(fname, []), file_meta.get(fname, {}), unloadable
+                )
+                for fname in order
+            }
+            results = {fname: futures[fname].result() for fname in filenames}
+    else:
+        for fname in filenames:
+            results[fname] = _enrich_and_build(fname, classified.get(fname, []), file_meta.get(fname, {}))
+
+    documents = {}
+    for fname in filenames:
+        content, records, output = results[fname]
+        print(output, end="")
+        classified[fname] = records
+        documents[api_document(fname)] = content
+    return documents
 
 # ---------------------------------------------------------------------------
 # Console output helpers
@@ -463,14 +644,14 @@ def _print_classification_summary(
 # Main
 # ---------------------------------------------------------------------------
 
-def main() -> None:
-    # 1. Load endpoint maps.
-    main_records = load_endpoint_map(MAIN_INDEXER_MAP)
-    print(f"Reading main-indexer endpoint map: {len(main_records)} endpoints loaded")
-    stats_records = load_endpoint_map(STATS_SERVICE_MAP)
-    print(f"Reading stats-service endpoint map: {len(stats_records)} endpoints loaded")
-    print()
+def build_documents(main_records: list[dict], stats_records: list[dict], jobs: int = 1) -> dict[str, str]:
+    """
+    Classify, enrich and render the endpoint records, with up to `jobs`
+    worker processes.
 
+    Returns the reference documents ({path relative to REFERENCES_DIR:
+    markdown}, see common.read_reference_documents) without writing them.
+    """
     # 2. Classify (filter GET, transform paths, assign files).
     classified, file_meta = classify_records(main_records, stats_records)
 
@@ -482,38 +663,69 @@ def main() -> None:
 
     print("Classifying endpoints...")
     _print_classification_summary(classified, chain_files_sorted)
+    profile_step("2. Classify", items=sum(len(recs) for recs in classified.values()))
 
-    # 3. Create output directories and clean stale files.
-    API_DIR.mkdir(parents=True, exist_ok=True)
-    for stale in API_DIR.glob("*.md"):
-        stale.unlink()
-
-    # 4. Enrich records: resolve descriptions and extract parameters.
-    swagger_cache: dict = {}
+    # 3. Load every referenced swagger once (first-use order).
     all_filenames = list(TOPIC_FILE_ORDER) + chain_files_sorted
-    for fname in all_filenames:
-        for rec in classified.get(fname, []):
-            swagger_path = _resolve_swagger_path(rec)
-            rec["_description"] = resolve_description(rec, swagger_path, swagger_cache)
-            rec["_params"] = extract_parameters(rec, swagger_path, swagger_cache)
-
-    # 5. Sort records within each file.
-    for fname in all_filenames:
-        classified[fname].sort(key=lambda r: (r["transformed_path"].lower(), r["method"]))
-
-    # 6. Write API files.
-    print("\nWriting API files...")
-    for fname in TOPIC_FILE_ORDER:
-        _write_api_file(fname, classified, file_meta)
-    for fname in chain_files_sorted:
-        _write_api_file(fname, classified, file_meta)
+    swagger_paths = list(dict.fromkeys(
+        _resolve_swagger_path(rec) for fname in all_filenames for rec in classified.get(fname, [])
+    ))
+    load_swaggers(swagger_paths, jobs)
+    profile_step("3. Load swaggers", items=len(swagger_paths))
 
-    # 7. Write index file.
+    # 4. Enrich records (descriptions, parameters), sort and render API files.
+    documents = build_api_files(classified, file_meta, all_filenames, jobs)
+    profile_step("4. Enrich and render API files", items=len(all_filenames))
+
+    # 5. Render index file.
     total = sum(len(classified.get(fn, [])) for fn in all_filenames)
-    print(f"\nWriting blockscout-api-index.md: {total} total endpoints")
-    index_content = _render_index_file(classified, file_meta, chain_files_sorted)
-    (REFERENCES_DIR / "blockscout-api-index.md").write_text(index_content, encoding="utf-8")
+    print(f"\nRendering {INDEX_DOCUMENT}: {total} total endpoints")
+    documents[INDEX_DOCUMENT] = _render_index_file(classified, file_meta, chain_files_sorted)
+    profile_step("5. Render index file", items=total)
+
+    # 6. Record entry locations: the offsets sidecar and the index line ranges.
+    add_entry_locations(documents)
+    profile_step("6. Locate entries", items=total)
+    return documents
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate the Blockscout API reference files from the indexed endpoint maps."
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Worker processes for swagger parsing and file rendering (default: {DEFAULT_JOBS})",
+    )
+    add_profile_arguments(parser, "api-file-generator")
+    args = parser.parse_args()
+    start_profile("api-file-generator", args.profile, args.cprofile)
+
+    # 1. Load endpoint maps.
+    main_records = load_endpoint_map(MAIN_INDEXER_MAP)
+    print(f"Reading main-indexer endpoint map: {len(main_records)} endpoints loaded")
+    stats_records = load_endpoint_map(STATS_SERVICE_MAP)
+    print(f"Reading stats-service endpoint map: {len(stats_records)} endpoints loaded")
+    print()
+    profile_step("1. Load endpoint maps", items=len(main_records) + len(stats_records))
 
+    # 2-5. Classify, load swaggers, enrich and render.
+    documents = build_documents(main_records, stats_records, max(1, args.jobs))
+
+    # 7. Write the API files, the index and the sidecar that changed, removing
+    # API files that no longer have endpoints.
+    print("\nWriting reference files...")
+    counts = write_reference_documents(documents, remove_stale=True)
+    profile_step("7. Write reference files", items=counts["written"] + counts["removed"])
+
+    # 8. Rebuild the endpoint search database from the written files.
+    write_search_index(documents)
+    profile_step("8. Write search index")
+
+    print()
+    print_parse_cache_stats()
     print("\nDone.")
 
 
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+In-process pipeline for the Blockscout API reference files.
+
+Runs the swagger indexers, api-file-generator and api-extras-applier in one
+interpreter as a dependency graph instead of four processes. Endpoint records
+go straight from the indexers to the generator, parsed swaggers are shared
+through common.load_yaml_document's in-memory layer, and the applier patches
+the generator's rendered documents, so the markdown is written once, at the
+end. The two indexers run concurrently.
+
+The PRO API spec of the web3-dev skill is parsed in the same run by
+pro-api-indexer's build_outputs(). Both skills' rendered documents then go
+into one endpoint catalog (common.build_catalog), which maps PRO paths onto
+their Blockscout equivalents and stores each description and parameter table
+once, before the reference files of both skills are written.
+
+Each tool still writes its own build artifacts (endpoint maps, manifests), so
+the separate scripts remain usable on the pipeline's output.
+
+Usage (from repo root):
+    python .memory_bank/specs/blockscout-analysis/tools/api-pipeline.py
+        [--jobs N] [--force] [--tarball | --mirror PATH | --offline] [--pro-api SPEC]
+        [--profile [REPORT]] [--cprofile PSTATS]
+"""
+
+import argparse
+import io
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable
+
+# Add the directory containing this script to sys.path for local imports.
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import (  # noqa: E402
+    PRO_API_DOCUMENT_PREFIX,
+    PROJECT_ROOT,
+    add_profile_arguments,
+    build_catalog,
+    load_tool,
+    print_parse_cache_stats,
+    profile_restart,
+    profile_step,
+    start_profile,
+    write_catalog,
+    write_reference_documents,
+    write_search_index,
+)
+
+main_indexer = load_tool("swagger-main-indexer.py")
+stats_indexer = load_tool("swagger-stats-indexer.py")
+generator = load_tool("api-file-generator.py")
+applier = load_tool("api-extras-applier.py")
+pro_indexer = load_tool("pro-api-indexer.py", Path(__file__).resolve().parents[2] / "web3-dev" / "tools")
+
+PRO_API_SPEC_PATH = PROJECT_ROOT / "web3-dev" / "references" / "pro-api.json"
+
+# ---------------------------------------------------------------------------
+# Console output
+# ---------------------------------------------------------------------------
+
+class _StageOutput(io.TextIOBase):
+    """
+    sys.stdout replacement that buffers what each stage prints, so the output
+    of concurrent stages is shown one stage at a time instead of interleaved.
+    Buffers are keyed by thread name: a stage runs in a thread named after it,
+    and helper pools it starts with thread_name_prefix set to that name
+    ("main-indexer_0", ...) share its buffer. Other threads write straight
+    through. Each buffer is only appended to by its own stage's threads, so
+    no lock is needed. Process-pool workers (common.process_pool) are not
+    forked from this process, so they never inherit it.
+    """
+
+    def __init__(self, stream: Any) -> None:
+        self.stream = stream
+        self.buffers: dict[str, list[str]] = {}
+
+    def write(self, text: str) -> int:
+        name = threading.current_thread().name
+        buffer = self.buffers.get(name) or self.buffers.get(name.rsplit("_", 1)[0])
+        if buffer is None:
+            return self.stream.write(text)
+        buffer.append(text)
+        return len(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    def capture(self, stage: str) -> None:
+        self.buffers[stage] = []
+
+    def release(self, stage: str) -> str:
+        return "".join(self.buffers.pop(stage, []))
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+
+def _indexer_argv(args: argparse.Namespace, stats: bool) -> list[str]:
+    """Command-line arguments for one indexer, derived from the pipeline's."""
+    argv = ["--force"] if args.force else []
+    if args.mirror:
+        argv += ["--mirror", str(args.mirror)]
+    elif args.offline:
+        argv.append("--offline")
+    elif args.tarball and not stats:
+        # The Stats swagger is a single file; it is always fetched directly.
+        argv.append("--tarball")
+    if not stats:
+        argv += ["--jobs", str(args.jobs)]
+    return argv
+
+
+def build_stages(args: argparse.Namespace) -> dict[str, tuple[list[str], Callable[[dict], Any]]]:
+    """
+    Return the stage graph: {name: (dependencies, function)}. Each function
+    receives the results of all finished stages, keyed by stage name.
+    """
+    def index_main(_: dict) -> list[dict]:
+        return main_indexer.run(main_indexer.build_parser().parse_args(_indexer_argv(args, stats=False)))
+
+    def index_stats(_: dict) -> list[dict]:
+        return stats_indexer.run(stats_indexer.build_parser().parse_args(_indexer_argv(args, stats=True)))
+
+    def generate(results: dict) -> dict[str, str]:
+        return generator.build_documents(results["main-indexer"], results["stats-indexer"], max(1, args.jobs))
+
+    def apply_extras(results: dict) -> dict[str, str]:
+        documents = results["generate"]
+        applier.apply_extras(documents)
+        return documents
+
+    def index_pro_api(_: dict) -> dict:
+        outputs = pro_indexer.build_outputs(args.pro_api)
+        print(f"Parsed {args.pro_api}: {len(outputs['shards'])} PRO API shards")
+        return outputs
+
+    def catalog(results: dict) -> dict:
+        shards = results["pro-api"]["shards"]
+        return build_catalog(results["apply-extras"],
+                             {PRO_API_DOCUMENT_PREFIX + name: text for name, text in shards.items()})
+
+    def write(results: dict) -> dict[str, int]:
+        print("Writing reference files...")
+        counts = write_reference_documents(results["apply-extras"], remove_stale=True)
+        counts["written" if write_search_index(results["apply-extras"]) else "unchanged"] += 1
+        for key, count in pro_indexer.write_outputs(results["pro-api"]).items():
+            counts[key] += count
+        counts["written" if write_catalog(results["catalog"]) else "unchanged"] += 1
+        return counts
+
+    return {
+        "main-indexer": ([], index_main),
+        "stats-indexer": ([], index_stats),
+        "generate": (["main-indexer", "stats-indexer"], generate),
+        "apply-extras": (["generate"], apply_extras),
+        "pro-api": ([], index_pro_api),
+        "catalog": (["apply-extras", "pro-api"], catalog),
+        "write": (["catalog"], write),
+    }
+
+
+def run_stages(stages: dict, jobs: int) -> dict[str, Any]:
+    """
+    Run the stage graph, starting every stage as soon as its dependencies have
+    finished. Each stage's console output is printed when it completes. An
+    error (including sys.exit) in any stage stops the pipeline after the
+    running stages finish, and is re-raised.
+    """
+    output = _StageOutput(sys.stdout)
+
+    def run_stage(name: str) -> Any:
+        threading.current_thread().name = name
+        output.capture(name)
+        profile_restart()
+        try:
+            return stages[name][1](results)
+        finally:
+            text = output.release(name)
+            output.stream.write(f"=== {name} ===\n{text}")
+            if not text.endswith("\n\n"):
+                output.stream.write("\n")
+
+    results: dict[str, Any] = {}
+    pending = dict(stages)
+    running: dict = {}
+    saved_stdout, sys.stdout = sys.stdout, output
+    try:
+        with ThreadPoolExecutor(max_workers=max(2, jobs)) as pool:
+            while pending or running:
+                for name, (deps, _) in list(pending.items()):
+                    if all(dep in results for dep in deps):
+                        running[pool.submit(run_stage, name)] = name
+                        del pending[name]
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+    finally:
+        sys.stdout = saved_stdout
+    return results
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Index the Blockscout swaggers and regenerate the API reference files in one process."
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=main_indexer.DEFAULT_JOBS,
+        help=f"Concurrent downloads / indexing processes of the main indexer (default: {main_indexer.DEFAULT_JOBS})",
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--tarball", action="store_true", help="Fetch the main-indexer swaggers as one archive")
+    source.add_argument("--mirror", type=Path, metavar="PATH", help="Read swaggers from a local blockscout/swaggers checkout")
+    source.add_argument("--offline", action="store_true", help="Rebuild the releases pinned in the indexer manifests")
+    parser.add_argument("--force", action="store_true", help="Re-index even if the swagger hashes are unchanged")
+    parser.add_argument(
+        "--pro-api",
+        type=Path,
+        default=PRO_API_SPEC_PATH,
+        metavar="SPEC",
+        help=f"PRO API OpenAPI spec for the web3-dev outputs and the catalog (default: {PRO_API_SPEC_PATH})",
+    )
+    add_profile_arguments(parser, "api-pipeline")
+    args = parser.parse_args()
+    start_profile("api-pipeline", args.profile, args.cprofile)
+
+    results = run_stages(build_stages(args), max(1, args.jobs))
+    counts = results["write"]
+    profile_step("Pipeline", items=counts["written"] + counts["removed"])
+
+    print_parse_cache_stats()
+    print(
+        f"Done. {counts['written']} files written, {counts['unchanged']} unchanged, "
+        f"{counts['removed']} removed."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Equivalence check for the compiled classification tries.
+
+Checks common.classify_endpoint against the linear three-pass reference
+implementation it replaced (longest prefix first over the sorted tables),
+and common.classify_many against classify_endpoint, on every path of the
+endpoint maps and of the committed reference files. A rule edit that changes
+precedence or longest-match behaviour in only one of them fails the check.
+
+Usage (from repo root, after api-pipeline.py or the indexers have written
+the endpoint maps; missing maps are skipped):
+    python .memory_bank/specs/blockscout-analysis/tools/bench/check_classify.py
+
+Exit code 1 on any mismatch or if no paths were found.
+"""
+
+import sys
+from pathlib import Path
+from typing import Optional
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent
+
+# Add the tools directory to sys.path for local imports.
+sys.path.insert(0, str(TOOLS_DIR))
+
+from common import (  # noqa: E402
+    BUILD_DIR,
+    CHAIN_KEYWORD_RULES,
+    CHAIN_PREFIXES,
+    TOPIC_PREFIXES,
+    classify_endpoint,
+    classify_many,
+    endpoint_map_jsonl_path,
+    iter_api_entries,
+    iter_endpoint_map,
+    read_reference_documents,
+    sort_prefixes,
+)
+
+ENDPOINT_MAPS = [
+    BUILD_DIR / "swaggers" / "main-indexer" / "endpoints_map.json",
+    BUILD_DIR / "swaggers" / "stats-service" / "endpoints_map.json",
+]
+
+# ---------------------------------------------------------------------------
+# Reference implementation (linear scan, before the prefix tries)
+# ---------------------------------------------------------------------------
+
+_SORTED_CHAIN_PREFIXES = sort_prefixes(CHAIN_PREFIXES)
+_SORTED_TOPIC_PREFIXES = sort_prefixes(TOPIC_PREFIXES)
+
+
+def reference_classify(endpoint: str) -> Optional[str]:
+    """
+    Pass 1 — chain prefix, Pass 2 — chain keyword and /blobs suffix,
+    Pass 3 — topic prefix; prefixes are tried longest first.
+    """
+    for pfx, fname in _SORTED_CHAIN_PREFIXES:
+        pfx_base = pfx.rstrip("/")
+        if endpoint == pfx_base or endpoint.startswith(pfx_base + "/"):
+            return fname
+
+    segments = endpoint.split("/")
+    for keyword, fname in CHAIN_KEYWORD_RULES:
+        if keyword in segments:
+            return fname
+    if endpoint.endswith("/blobs"):
+        return "ethereum.md"
+
+    for pfx, fname in _SORTED_TOPIC_PREFIXES:
+        pfx_base = pfx.rstrip("/")
+        if endpoint == pfx_base or endpoint.startswith(pfx_base + "/"):
+            return fname
+
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Path collection
+# ---------------------------------------------------------------------------
+
+def collect_paths() -> list[str]:
+    """Raw swagger paths of the endpoint maps and reference files, in first-seen order."""
+    paths: list[str] = []
+    for map_path in ENDPOINT_MAPS:
+        jsonl_path = endpoint_map_jsonl_path(map_path)
+        source = jsonl_path if jsonl_path.exists() else map_path
+        if not source.exists():
+            print(f"Skipped (not built): {map_path}")
+            continue
+        records = list(iter_endpoint_map(source))
+        paths.extend(record["endpoint"] for record in records)
+        print(f"Read {len(records)} records from {source}")
+    entries = list(iter_api_entries(read_reference_documents()))
+    for entry in entries:
+        path = entry["path"]
+        # Reference files document MCP paths: "/api/v2/..." → "/v2/..."
+        paths.append(path[4:] if path.startswith("/api") else path)
+    print(f"Read {len(entries)} reference file entries")
+    return list(dict.fromkeys(paths))
+
+
+def main() -> None:
+    paths = collect_paths()
+    if not paths:
+        print("Error: no paths to check")
+        sys.exit(1)
+
+    failures = 0
+    for path in paths:
+        expected = reference_classify(path)
+        actual = classify_endpoint(path)
+        if actual != expected:
+            failures += 1
+            print(f"  classify_endpoint({path!r}) = {actual!r}, reference = {expected!r}")
+
+    # Repeated paths exercise classify_many's memo.
+    batch = paths + paths[::-1]
+    if classify_many(batch) != [classify_endpoint(p) for p in batch]:
+        failures += 1
+        print("  classify_many() differs from classify_endpoint()")
+
+    if failures:
+        print(f"FAILED: {failures} mismatches over {len(paths)} paths")
+        sys.exit(1)
+    print(f"OK: {len(paths)} paths classified identically")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the Blockscout API tools.
+
+For each scale (multiples of one Blockscout release, see synth_swagger.py)
+writes a synthetic swaggers checkout to a temporary directory and times the
+pipeline stages against it, fully offline:
+
+    find_line_ranges       line ranges of the default variant (pre-composed)
+    index_swagger_file     every variant, cold parse cache
+    classify_endpoint      every distinct path, uncached
+    swagger-main-indexer   main() in --mirror mode (warm parse cache)
+    api-file-generator     main(), rendering all reference files
+    patch_index_file       applier index patch with synthetic extras
+
+Results are written as JSON and compared against the committed baseline:
+a stage regresses when it is slower than baseline × (1 + tolerance) and by
+more than MIN_REGRESSION_SECONDS. Exit code 1 on any regression.
+
+Usage (from repo root):
+    python .memory_bank/specs/blockscout-analysis/tools/bench/run_bench.py
+        [--scales 1,10,100] [--tolerance 0.5] [--output PATH]
+        [--update-baseline] [--no-compare]
+
+Output:
+    blockscout-analysis/.build/bench/results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+BENCH_DIR = Path(__file__).resolve().parent
+TOOLS_DIR = BENCH_DIR.parent
+
+# The tools anchor their paths at BLOCKSCOUT_TOOLS_ROOT when it is set. Point
+# it at a scratch workspace before importing them, so the benchmark never
+# writes into the repository. Process-pool workers re-import this script as
+# __mp_main__ and inherit the variable instead.
+if __name__ == "__main__":
+    WORKSPACE = Path(tempfile.mkdtemp(prefix="bench-"))
+    os.environ["BLOCKSCOUT_TOOLS_ROOT"] = str(WORKSPACE)
+
+# Add the tools directory to sys.path for local imports.
+sys.path.insert(0, str(TOOLS_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+import yaml  # noqa: E402
+
+import common  # noqa: E402
+from common import (  # noqa: E402
+    INDEX_DOCUMENT,
+    YAML_LOADER,
+    classify_endpoint,
+    clear_parse_cache,
+    find_line_ranges,
+    index_swagger_file,
+    load_tool,
+)
+from synth_swagger import MAIN_VERSION, write_mirror  # noqa: E402
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+BASELINE_PATH = BENCH_DIR / "baseline.json"
+RESULTS_PATH = TOOLS_DIR.parents[3] / "blockscout-analysis" / ".build" / "bench" / "results.json"
+
+DEFAULT_SCALES = [1, 10, 100]
+DEFAULT_TOLERANCE = 0.5
+# Differences below this are timer and scheduler noise, never a regression.
+MIN_REGRESSION_SECONDS = 0.005
+# Timed repetitions per scale; the fastest run is reported.
+REPEATS = {1: 5, 10: 3}
+DEFAULT_REPEATS = 1
+
+# Share of generated GET paths re-offered as missing extras to the applier.
+EXTRAS_EVERY = 20
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _time(func: Callable[[], object], repeats: int, setup: Callable[[], None] = None) -> float:
+    """Return the fastest of `repeats` timed calls of `func`, running `setup` untimed before each."""
+    best = float("inf")
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    return round(best, 6)
+
+
+def _run_main(module, argv: list[str]) -> None:
+    """Call a tool's main() with the given command-line arguments."""
+    saved = sys.argv
+    sys.argv = [module.__name__] + argv
+    try:
+        module.main()
+    finally:
+        sys.argv = saved
+
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+
+def bench_scale(scale: int, workdir: Path) -> dict[str, dict]:
+    """Time every stage at one scale; returns {stage: {"seconds", "items"}}."""
+    mirror = workdir / "mirror"
+    summary = write_mirror(mirror, scale=scale)
+    variant_files = [
+        mirror / "blockscout" / MAIN_VERSION / variant / "swagger.yaml"
+        for variant in summary["variants"]
+    ]
+    repeats = REPEATS.get(scale, DEFAULT_REPEATS)
+    results: dict[str, dict] = {}
+
+    # find_line_ranges: compose once (untimed), then time the range walk.
+    text = variant_files[0].read_text(encoding="utf-8")
+    loader = YAML_LOADER(text)
+    try:
+        root = loader.get_single_node()
+    finally:
+        loader.dispose()
+    line_count = text.count("\n")
+    ranges: dict = {}
+    seconds = _time(lambda: ranges.update(find_line_ranges(root, line_count)), repeats)
+    results["find_line_ranges"] = {"seconds": seconds, "items": len(ranges)}
+
+    # index_swagger_file: parse + index every variant with a cold parse cache.
+    records: list[dict] = []
+
+    def index_all() -> None:
+        records[:] = [rec for swagger in variant_files for rec in index_swagger_file(swagger, swagger.name)]
+
+    seconds = _time(index_all, repeats, setup=clear_parse_cache)
+    results["index_swagger_file"] = {"seconds": seconds, "items": len(records)}
+
+    # classify_endpoint: every distinct path across variants.
+    paths = sorted({rec["endpoint"] for rec in records})
+    seconds = _time(lambda: [classify_endpoint(path) for path in paths], repeats)
+    results["classify_endpoint"] = {"seconds": seconds, "items": len(paths)}
+
+    # swagger-main-indexer: the whole indexer over the mirror (parse cache warm
+    # from the previous stage, as after a first run). Also builds the maps the
+    # generator needs.
+    main_indexer = load_tool("swagger-main-indexer.py")
+    seconds = _time(
+        lambda: _run_main(main_indexer, ["--mirror", str(mirror), "--force", "--jobs", "1"]),
+        repeats,
+    )
+    results["swagger-main-indexer"] = {"seconds": seconds, "items": summary["operations"]}
+    with contextlib.redirect_stdout(io.StringIO()):
+        _run_main(load_tool("swagger-stats-indexer.py"), ["--mirror", str(mirror), "--force"])
+
+    # api-file-generator: load maps, classify, enrich and render everything.
+    generator = load_tool("api-file-generator.py")
+    seconds = _time(lambda: _run_main(generator, []), repeats)
+    index_text = (common.REFERENCES_DIR / INDEX_DOCUMENT).read_text(encoding="utf-8")
+    results["api-file-generator"] = {
+        "seconds": seconds,
+        "items": sum(1 for line in index_text.splitlines() if line.startswith("- ")),
+    }
+
+    # patch_index_file: re-offer every EXTRAS_EVERY-th path under a new
+    # sub-path, plus one new chain family, and patch the index text.
+    applier = load_tool("api-extras-applier.py")
+    missing = [
+        ({"path": f"/api{path}/extra", "description": "Synthetic extra endpoint."}, "Synthetic", "common")
+        for path in paths[::EXTRAS_EVERY]
+        if classify_endpoint(path) is not None
+    ]
+    missing.append(({"path": "/api/v2/benchchain/items", "description": "Synthetic chain endpoint."},
+                    "Benchchain", "specific"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        classified = applier.classify_endpoints(missing)
+    file_sections: dict[str, list] = {}
+    for (fname, section), eps in classified.items():
+        for ep in eps:
+            file_sections.setdefault(fname, []).append((section, ep))
+    seconds = _time(lambda: applier.patch_index_file(index_text, file_sections), repeats)
+    results["patch_index_file"] = {"seconds": seconds, "items": len(missing)}
+
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------------------------
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Print a comparison table; return the regressed "scale/stage" names."""
+    regressions = []
+    print(f"{'stage':<28}{'baseline':>12}{'current':>12}{'ratio':>9}")
+    for scale_key, stages in results["scales"].items():
+        base_stages = baseline.get("scales", {}).get(scale_key, {})
+        for stage, current in stages.items():
+            name = f"{scale_key}/{stage}"
+            base = base_stages.get(stage)
+            if base is None:
+                print(f"{name:<28}{'-':>12}{current['seconds']:>11.4f}s{'new':>9}")
+                continue
+            ratio = current["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+            regressed = (
+                current["seconds"] > base["seconds"] * (1 + tolerance)
+                and current["seconds"] - base["seconds"] > MIN_REGRESSION_SECONDS
+            )
+            flag = "  REGRESSION" if regressed else ""
+            if base.get("items") != current["items"]:
+                flag += "  (workload changed: baseline items differ)"
+            print(f"{name:<28}{base['seconds']:>11.4f}s{current['seconds']:>11.4f}s{ratio:>8.2f}x{flag}")
+            if regressed:
+                regressions.append(name)
+    return regressions
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Blockscout API tools on synthetic swaggers.")
+    parser.add_argument(
+        "--scales",
+        default=",".join(map(str, DEFAULT_SCALES)),
+        help="Comma-separated size multipliers (default: 1,10,100)",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"Allowed slowdown vs baseline as a fraction (default: {DEFAULT_TOLERANCE})",
+    )
+    parser.add_argument("--output", type=Path, default=RESULTS_PATH, help=f"Results file (default: {RESULTS_PATH})")
+    parser.add_argument("--update-baseline", action="store_true", help=f"Write results to {BASELINE_PATH.name}")
+    parser.add_argument("--no-compare", action="store_true", help="Skip the baseline comparison")
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    output = args.output.resolve()
+    results = {
+        "python": platform.python_version(),
+        "yaml_loader": "libyaml" if YAML_LOADER is not yaml.SafeLoader else "pure-Python",
+        "scales": {},
+    }
+
+    try:
+        for scale in scales:
+            print(f"Benchmarking {scale}x ...", flush=True)
+            # Every scale starts from an empty workspace.
+            for child in WORKSPACE.iterdir():
+                shutil.rmtree(child)
+            stages = bench_scale(scale, WORKSPACE)
+            results["scales"][f"{scale}x"] = stages
+            for stage, result in stages.items():
+                print(f"  {stage:<24}{result['seconds']:>10.4f}s  ({result['items']} items)")
+    finally:
+        shutil.rmtree(WORKSPACE, ignore_errors=True)
+    print()
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    print(f"Saved {output}")
+
+    if args.update_baseline:
+        BASELINE_PATH.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Updated baseline {BASELINE_PATH}")
+        return
+    if args.no_compare:
+        return
+    if not BASELINE_PATH.exists():
+        print(f"No baseline at {BASELINE_PATH}; run with --update-baseline to create one.")
+        return
+
+    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    print(f"Comparing with baseline (tolerance {args.tolerance:.0%}):")
+    regressions = compare(results, baseline, args.tolerance)
+    print()
+    if regressions:
+        print(f"FAILED: {len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+    print("OK: no regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Synthetic swagger generator for the tools benchmark suite.
+
+Writes a fake blockscout/swaggers checkout (the layout read by the indexers'
+--mirror mode) whose paths are built from the real classification prefix
+tables, so every tool downstream of the indexers sees realistic input.
+Output is deterministic for a given set of sizes and seed.
+
+Usage:
+    python synth_swagger.py OUT_DIR [--scale N] [--variants N] [--params N]
+                            [--description-words N] [--seed N]
+
+Output:
+    OUT_DIR/blockscout/{version}/{variant}/swagger.yaml
+    OUT_DIR/services/stats/{version}/swagger.yaml
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+# Add the tools directory to sys.path for the shared prefix tables.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common import CHAIN_PREFIXES, TOPIC_PREFIXES  # noqa: E402
+
+# ---------------------------------------------------------------------------
+# Size profile
+# ---------------------------------------------------------------------------
+
+# 1× approximates one Blockscout release: operations in the `default`
+# variant, variant-specific operations per additional variant, parameters
+# per operation and words per description. --scale multiplies the operation
+# counts only; the other sizes have their own flags.
+BASE_PATHS = 160
+VARIANT_EXTRA_PATHS = 12
+DEFAULT_VARIANTS = 4
+DEFAULT_PARAMS = 4
+DEFAULT_DESCRIPTION_WORDS = 25
+STATS_PATHS = 12
+
+MAIN_VERSION = "9.3.5"
+STATS_VERSION = "2.14.0"
+
+# Every fifth operation also has a POST method (dropped by the generator's GET filter).
+POST_EVERY = 5
+
+WORDS = (
+    "returns list paginated address block transaction token balance contract "
+    "hash number filter sorted by value timestamp internal transfer holder "
+    "counter chart details item batch validator deposit withdrawal message "
+    "status fee gas log event source verified proxy implementation metadata"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    """Deterministic pseudo-English text of `words` words (no quote characters)."""
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _synth_paths(prefixes: list[str], count: int, tag: str) -> list[str]:
+    """Return `count` distinct paths spread round-robin over `prefixes`."""
+    paths = []
+    for i in range(count):
+        prefix = prefixes[i % len(prefixes)].rstrip("/")
+        paths.append(f"{prefix}/{tag}{i}/{{param_{i % 3}}}")
+    return paths
+
+
+def _render_operation(rng: random.Random, path: str, method: str, params: int, description_words: int) -> list[str]:
+    """Render one block-style operation (method key, description, parameters, responses)."""
+    lines = [
+        f"    {method}:",
+        f"      description: '{_sentence(rng, description_words)}'",
+        "      parameters:",
+    ]
+    path_param = path.rsplit("{", 1)[1].rstrip("}")
+    names = [path_param] + [f"q{n}" for n in range(1, params)]
+    for n, name in enumerate(names[:params]):
+        lines += [
+            f"      - name: {name}",
+            f"        in: {'path' if n == 0 else 'query'}",
+            f"        required: {'true' if n == 0 else 'false'}",
+            "        schema:",
+            f"          type: {'string' if n % 2 == 0 else 'integer'}",
+            f"        description: {_sentence(rng, max(3, description_words // 5))}",
+        ]
+    lines += [
+        "      responses:",
+        "        '200':",
+        "          description: ok",
+        "          content:",
+        "            application/json:",
+        "              schema:",
+        "                type: object",
+    ]
+    return lines
+
+
+def render_swagger(paths: list[str], params: int, description_words: int, seed: int, title: str) -> str:
+    """Render an OpenAPI 3.0 document for `paths` in the style of the Blockscout swaggers."""
+    rng = random.Random(seed)
+    lines = [
+        "openapi: 3.0.0",
+        "info:",
+        f"  title: {title}",
+        "  version: synthetic",
+        "paths:",
+    ]
+    for i, path in enumerate(paths):
+        lines.append(f"  {path}:")
+        lines += _render_operation(rng, path, "get", params, description_words)
+        if i % POST_EVERY == 0:
+            lines += _render_operation(rng, path, "post", params, description_words)
+    lines += [
+        "components:",
+        "  schemas:",
+        "    Empty:",
+        "      type: object",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def write_mirror(
+    out_dir: Path,
+    scale: int = 1,
+    variants: int = DEFAULT_VARIANTS,
+    params: int = DEFAULT_PARAMS,
+    description_words: int = DEFAULT_DESCRIPTION_WORDS,
+    seed: int = 0,
+) -> dict:
+    """
+    Write a synthetic swaggers checkout under `out_dir`.
+
+    Returns a summary: {"variants": [...], "operations": total operations
+    across variant files, "paths": distinct paths, "bytes": total YAML size}.
+    """
+    topic_prefixes = [prefix for prefix, _ in TOPIC_PREFIXES]
+    chain_prefixes = [prefix for prefix, _ in CHAIN_PREFIXES]
+    base_paths = _synth_paths(topic_prefixes, BASE_PATHS * scale, "r")
+
+    variant_names = ["default"] + [f"variant-{n}" for n in range(1, variants)]
+    all_paths = set(base_paths)
+    operations = 0
+    size = 0
+    for n, variant in enumerate(variant_names):
+        # Every variant carries the default paths plus its own chain paths.
+        paths = list(base_paths)
+        if n:
+            paths += _synth_paths(chain_prefixes, VARIANT_EXTRA_PATHS * scale, f"v{n}x")
+        all_paths.update(paths)
+        text = render_swagger(paths, params, description_words, seed + n, f"Blockscout {variant}")
+        dest = out_dir / "blockscout" / MAIN_VERSION / variant / "swagger.yaml"
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_text(text, encoding="utf-8")
+        operations += len(paths) + len(range(0, len(paths), POST_EVERY))
+        size += len(text)
+
+    stats_paths = [f"/api/v1/lines/s{i}/{{param_0}}" for i in range(STATS_PATHS)]
+    stats_text = render_swagger(stats_paths, params, description_words, seed, "Stats")
+    stats_dest = out_dir / "services" / "stats" / STATS_VERSION / "swagger.yaml"
+    stats_dest.parent.mkdir(parents=True, exist_ok=True)
+    stats_dest.write_text(stats_text, encoding="utf-8")
+
+    return {
+        "variants": variant_names,
+        "operations": operations,
+        "paths": len(all_paths),
+        "bytes": size,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a synthetic blockscout/swaggers checkout.")
+    parser.add_argument("out_dir", type=Path, help="Directory to write the checkout into")
+    parser.add_argument("--scale", type=int, default=1, help="Operation count multiplier (default: 1)")
+    parser.add_argument("--variants", type=int, default=DEFAULT_VARIANTS,
+                        help=f"Number of variants including default (default: {DEFAULT_VARIANTS})")
+    parser.add_argument("--params", type=int, default=DEFAULT_PARAMS,
+                        help=f"Parameters per operation (default: {DEFAULT_PARAMS})")
+    parser.add_argument("--description-words", type=int, default=DEFAULT_DESCRIPTION_WORDS,
+                        help=f"Words per operation description (default: {DEFAULT_DESCRIPTION_WORDS})")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    summary = write_mirror(
+        args.out_dir, args.scale, max(1, args.variants), max(1, args.params),
+        max(1, args.description_words), args.seed,
+    )
+    print(
+        f"Wrote {len(summary['variants'])} variants, {summary['operations']} operations, "
+        f"{summary['bytes'] / 1e6:.1f} MB to {args.out_dir}"
+    )
+
+
+if __name__ == "__main__":
+    main()
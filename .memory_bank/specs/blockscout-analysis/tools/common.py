@@ -1,15 +1,45 @@
 #!/usr/bin/env python3
 """
 Common utilities shared between swagger indexer and API file generation scripts.
+
+The standard-library-only helpers (file writes, offsets, $ref resolution,
+stage profiling) live in common_base.py and are re-exported here.
 """
 
+import hashlib
+import importlib.util
+import json
+import multiprocessing
+import os
+import pickle
+import random
 import re
+import shutil
+import sqlite3
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Iterable, Iterator, Optional, TextIO
 
 import requests
 import yaml
+from requests.adapters import HTTPAdapter
+
+from common_base import (  # noqa: F401  (re-exported)
+    deref,
+    file_sha256,
+    profile_restart,
+    profile_step,
+    ref_resolver,
+    render_offsets,
+    replace_file_if_changed,
+    resolve_ref,
+    schema_type,
+    write_file_if_changed,
+)
+from common_base import start_profile as _start_profile
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -30,9 +60,30 @@ EXCLUDED_PARAM_NAMES: frozenset[str] = frozenset({"apikey", "key"})
 # Output paths
 # ---------------------------------------------------------------------------
 
-REFERENCES_DIR = Path("blockscout-analysis/references")
+# Repository root. Every path below is anchored to it, so a tool started from
+# another directory still reads and writes the repository's files instead of
+# creating stray trees. BLOCKSCOUT_TOOLS_ROOT overrides it, e.g. for the
+# benchmark suite's scratch workspace.
+PROJECT_ROOT = Path(os.environ.get("BLOCKSCOUT_TOOLS_ROOT") or Path(__file__).resolve().parents[4])
+
+REFERENCES_DIR = PROJECT_ROOT / "blockscout-analysis" / "references"
 API_DIR = REFERENCES_DIR / "blockscout-api"
 
+# SQLite FTS5 endpoint search database, queried by blockscout-analysis/scripts/search-api.py.
+SEARCH_DB_PATH = REFERENCES_DIR / "blockscout-api-search.db"
+
+# Build artifacts (swagger copies, endpoint maps, caches, reports); not committed.
+BUILD_DIR = PROJECT_ROOT / "blockscout-analysis" / ".build"
+
+# ETag/Last-Modified validators of downloaded files, for conditional GETs.
+HTTP_VALIDATORS_PATH = BUILD_DIR / "http-validators.json"
+
+# Parsed swagger documents, keyed by the SHA-256 of the YAML file content.
+PARSE_CACHE_DIR = BUILD_DIR / "parse-cache"
+
+# Stage reports written by --profile ({tool}.json, optional {tool}.pstats).
+PROFILE_DIR = BUILD_DIR / "profile"
+
 # ---------------------------------------------------------------------------
 # Classification config
 # ---------------------------------------------------------------------------
@@ -138,9 +189,34 @@ def sort_prefixes(table: list[tuple[str, str]]) -> list[tuple[str, str]]:
     return sorted(table, key=lambda x: len(x[0].rstrip("/")), reverse=True)
 
 
-# Pre-sorted tables (used internally by classify_endpoint).
-_SORTED_CHAIN_PREFIXES = sort_prefixes(CHAIN_PREFIXES)
-_SORTED_TOPIC_PREFIXES = sort_prefixes(TOPIC_PREFIXES)
+def _compile_prefix_trie(table: list[tuple[str, str]]) -> dict:
+    """
+    Compile a prefix table into a segment-level trie.
+
+    Each node is a dict keyed by path segment; the None key holds the output
+    filename for a prefix ending at that node. Every prefix is segment-aligned
+    (a match requires `endpoint == base` or `endpoint.startswith(base + "/")`),
+    so the deepest terminal node reached is the longest match. Entries are
+    inserted in sort_prefixes() order and the first one wins on duplicates,
+    mirroring the linear longest-match scan.
+    """
+    root: dict = {}
+    for pfx, fname in sort_prefixes(table):
+        node = root
+        for segment in pfx.rstrip("/").split("/"):
+            node = node.setdefault(segment, {})
+        node.setdefault(None, fname)
+    return root
+
+
+# Compiled classification tables (used internally by classify_endpoint).
+_CHAIN_PREFIX_TRIE = _compile_prefix_trie(CHAIN_PREFIXES)
+_TOPIC_PREFIX_TRIE = _compile_prefix_trie(TOPIC_PREFIXES)
+# keyword → (rule position, filename); the earliest rule wins, not the earliest segment.
+_CHAIN_KEYWORDS: dict[str, tuple[int, str]] = {
+    keyword: (pos, fname)
+    for pos, (keyword, fname) in reversed(list(enumerate(CHAIN_KEYWORD_RULES)))
+}
 
 
 def classify_endpoint(endpoint: str) -> Optional[str]:
@@ -151,29 +227,60 @@ def classify_endpoint(endpoint: str) -> Optional[str]:
     Pass 2 — Chain keyword in path segments, plus /blobs suffix rule.
     Pass 3 — Topic prefix (longest match first).
 
+    All three passes are answered by a single walk over the path segments
+    using the tries compiled from CHAIN_PREFIXES, CHAIN_KEYWORD_RULES and
+    TOPIC_PREFIXES; the pass precedence above is then applied to the results.
+
     Returns output filename, or None if no rule matched.
     """
+    segments = endpoint.split("/")
+    chain_node: Optional[dict] = _CHAIN_PREFIX_TRIE
+    topic_node: Optional[dict] = _TOPIC_PREFIX_TRIE
+    chain_match: Optional[str] = None
+    topic_match: Optional[str] = None
+    keyword_match: Optional[tuple[int, str]] = None
+
+    for segment in segments:
+        if chain_node is not None:
+            chain_node = chain_node.get(segment)
+            if chain_node is not None and None in chain_node:
+                chain_match = chain_node[None]
+        if topic_node is not None:
+            topic_node = topic_node.get(segment)
+            if topic_node is not None and None in topic_node:
+                topic_match = topic_node[None]
+        rule = _CHAIN_KEYWORDS.get(segment)
+        if rule is not None and (keyword_match is None or rule[0] < keyword_match[0]):
+            keyword_match = rule
+
     # Pass 1: Chain-specific prefix
-    for pfx, fname in _SORTED_CHAIN_PREFIXES:
-        pfx_base = pfx.rstrip("/")
-        if endpoint == pfx_base or endpoint.startswith(pfx_base + "/"):
-            return fname
+    if chain_match is not None:
+        return chain_match
 
     # Pass 2: Chain keyword in path segments
-    segments = endpoint.split("/")
-    for keyword, fname in CHAIN_KEYWORD_RULES:
-        if keyword in segments:
-            return fname
-    if endpoint.endswith("/blobs"):
+    if keyword_match is not None:
+        return keyword_match[1]
+    if len(segments) > 1 and segments[-1] == "blobs":
         return "ethereum.md"
 
     # Pass 3: Topic prefix
-    for pfx, fname in _SORTED_TOPIC_PREFIXES:
-        pfx_base = pfx.rstrip("/")
-        if endpoint == pfx_base or endpoint.startswith(pfx_base + "/"):
-            return fname
+    return topic_match
 
-    return None
+
+def classify_many(paths: Iterable[str]) -> list[Optional[str]]:
+    """
+    Classify a batch of raw swagger paths with classify_endpoint().
+
+    Returns one result per input path, in input order. Repeated paths (the
+    same endpoint under several methods or variants) are classified once.
+    """
+    memo: dict[str, Optional[str]] = {}
+    result: list[Optional[str]] = []
+    for path in paths:
+        if path not in memo:
+            memo[path] = classify_endpoint(path)
+        result.append(memo[path])
+    return result
 
 
 def chain_file_info(filename: str) -> dict:
@@ -239,13 +346,149 @@ def format_index_line(path: str, desc: str) -> str:
 # HTTP helpers
 # ---------------------------------------------------------------------------
 
-def _get(url: str, params: dict = None) -> requests.Response:
-    """GET a URL, raising on network errors."""
-    try:
-        response = requests.get(url, params=params, timeout=30)
-    except requests.RequestException as exc:
-        print(f"Error: network error fetching {url}: {exc}")
-        sys.exit(1)
+# Transient failures (connection errors, 5xx) are retried with exponential
+# backoff and full jitter: attempt n sleeps uniform(0, min(MAX, BASE * 2**n)).
+HTTP_MAX_RETRIES = 5
+HTTP_BACKOFF_BASE = 1.0
+HTTP_BACKOFF_MAX = 30.0
+HTTP_RETRY_STATUSES = frozenset({500, 502, 503, 504})
+# Longest wait for a GitHub rate limit reset before giving up on the request.
+HTTP_RATE_LIMIT_MAX_WAIT = 3600
+
+_session: Optional[requests.Session] = None
+_validators: Optional[dict[str, dict[str, str]]] = None
+# Guard the shared session and validator store when downloads run on threads.
+_session_lock = threading.Lock()
+_validators_lock = threading.Lock()
+
+
+def _http_session() -> requests.Session:
+    """Return the process-wide keep-alive session (created on first use)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+    return _session
+
+
+def _load_validators() -> dict[str, dict[str, str]]:
+    """Return the persisted ETag/Last-Modified store, loading it on first use."""
+    global _validators
+    if _validators is None:
+        try:
+            _validators = json.loads(HTTP_VALIDATORS_PATH.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            _validators = {}
+    return _validators
+
+
+def _save_validators() -> None:
+    HTTP_VALIDATORS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = HTTP_VALIDATORS_PATH.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(_load_validators(), indent=2, sort_keys=True), encoding="utf-8")
+    tmp_path.replace(HTTP_VALIDATORS_PATH)
+
+
+def _remember_validators(key: str, response: requests.Response) -> None:
+    """Persist a response's ETag/Last-Modified for the next conditional GET."""
+    validators = {}
+    if response.headers.get("ETag"):
+        validators["etag"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        validators["last_modified"] = response.headers["Last-Modified"]
+    with _validators_lock:
+        store = _load_validators()
+        if store.get(key) == (validators or None):
+            return
+        if validators:
+            store[key] = validators
+        else:
+            store.pop(key, None)
+        _save_validators()
+
+
+def _rate_limit_wait(response: requests.Response) -> Optional[float]:
+    """
+    Return seconds to wait before retrying a rate-limited GitHub response,
+    or None if the response is not a rate limit. Honours Retry-After
+    (secondary limits) and X-RateLimit-Reset (primary limit exhausted).
+    """
+    if response.status_code not in (403, 429):
+        return None
+    retry_after = response.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        reset = response.headers.get("X-RateLimit-Reset", "")
+        if reset.isdigit():
+            return max(0.0, int(reset) - time.time()) + 1
+    return None
+
+
+def _get(
+    url: str,
+    params: dict = None,
+    cached: Optional[Path] = None,
+    stream: bool = False,
+) -> requests.Response:
+    """
+    GET a URL through the shared session, retrying transient failures.
+
+    Connection errors and 5xx responses are retried up to HTTP_MAX_RETRIES
+    times with jittered exponential backoff; GitHub rate limits are waited
+    out until the reset time. Exits only when retries are exhausted on a
+    network error.
+
+    When `cached` names an existing local copy of the body, the stored
+    ETag/Last-Modified validators are sent and a 304 response is returned
+    as-is: the caller keeps its copy. Validators from 200 responses are
+    persisted to HTTP_VALIDATORS_PATH for the next run.
+
+    With `stream=True` the body is not read up front; the caller consumes
+    `response.raw` (e.g. a tarball) and closes the response.
+    """
+    headers = {}
+    key = requests.Request("GET", url, params=params).prepare().url
+    if cached is not None and cached.exists():
+        with _validators_lock:
+            stored = dict(_load_validators().get(key, {}))
+        if "etag" in stored:
+            headers["If-None-Match"] = stored["etag"]
+        if "last_modified" in stored:
+            headers["If-Modified-Since"] = stored["last_modified"]
+
+    attempt = 0
+    while True:
+        try:
+            response = _http_session().get(url, params=params, headers=headers, timeout=30, stream=stream)
+        except requests.RequestException as exc:
+            if attempt >= HTTP_MAX_RETRIES:
+                print(f"Error: network error fetching {url}: {exc}")
+                sys.exit(1)
+            delay = random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * 2 ** attempt))
+            print(f"Warning: network error fetching {url} ({exc}); retrying in {delay:.1f}s")
+        else:
+            wait = _rate_limit_wait(response)
+            if wait is not None:
+                if wait > HTTP_RATE_LIMIT_MAX_WAIT:
+                    return response
+                response.close()
+                print(f"GitHub rate limit reached; waiting {wait:.0f}s for reset ...")
+                time.sleep(wait)
+                continue
+            if response.status_code not in HTTP_RETRY_STATUSES or attempt >= HTTP_MAX_RETRIES:
+                break
+            response.close()
+            delay = random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * 2 ** attempt))
+            print(f"Warning: HTTP {response.status_code} fetching {url}; retrying in {delay:.1f}s")
+        time.sleep(delay)
+        attempt += 1
+
+    if cached is not None and response.status_code == 200:
+        _remember_validators(key, response)
     return response
 
 
@@ -253,103 +496,166 @@ def _get(url: str, params: dict = None) -> requests.Response:
 # Line number calculation
 # ---------------------------------------------------------------------------
 
-def find_line_ranges(lines: list[str]) -> dict[tuple[str, str], tuple[int, int]]:
+def _last_line(node: yaml.Node) -> int:
+    """Return the 1-based line holding the last character of a composed node."""
+    end = node.end_mark
+    if end.column == 0 and end.line > node.start_mark.line:
+        return end.line  # mark sits at the start of the following line
+    return end.line + 1
+
+
+def find_line_ranges(
+    root: yaml.Node,
+    line_count: int,
+) -> dict[tuple[str, str], tuple[int, int]]:
     """
-    Scan raw YAML lines and return line ranges for each path+method block.
+    Return line ranges for each path+method block from a composed YAML node tree.
     Returns: {(path, method): (start_line, end_line)} — 1-based line numbers.
+
+    The start line is the line of the method key, taken from its node mark, so
+    flow-style mappings, quoted path keys and anchors are handled by the YAML
+    parser itself. A block ends on the line before the next method key in the
+    file; the last one ends on the line before the next top-level key after
+    `paths`, or at EOF. When several methods share a line (flow style), the
+    method's own value node bounds the range instead.
     """
-    ranges: dict[tuple[str, str], int] = {}
+    if not isinstance(root, yaml.MappingNode):
+        return {}
 
-    # Find the "paths:" top-level key
-    paths_line_idx = None
-    for i, line in enumerate(lines):
-        stripped = line.rstrip()
-        if re.match(r'^paths:\s*$', stripped):
-            paths_line_idx = i
+    paths_node = None
+    next_top_level: Optional[int] = None
+    for key_node, value_node in root.value:
+        if paths_node is not None:
+            next_top_level = key_node.start_mark.line  # 0-based == 1-based line before it
             break
-
-    if paths_line_idx is None:
+        if key_node.value == "paths" and isinstance(value_node, yaml.MappingNode):
+            paths_node = value_node
+    if paths_node is None:
         return {}
 
-    # Detect path indent (first /...: line after "paths:")
-    path_indent = None
-    for i in range(paths_line_idx + 1, len(lines)):
-        m = re.match(r'^(\s+)(/.*):\s*$', lines[i])
-        if m:
-            path_indent = len(m.group(1))
-            break
-        if lines[i].strip() and not lines[i].startswith(" ") and not lines[i].startswith("\t"):
-            break
+    starts: list[tuple[int, str, str, yaml.Node]] = []
+    for path_key, path_value in paths_node.value:
+        if not isinstance(path_key, yaml.ScalarNode) or not isinstance(path_value, yaml.MappingNode):
+            continue
+        for method_key, method_value in path_value.value:
+            if not isinstance(method_key, yaml.ScalarNode):
+                continue
+            method = method_key.value.lower()
+            if method in HTTP_METHODS:
+                starts.append((method_key.start_mark.line + 1, path_key.value, method, method_value))
 
-    if path_indent is None:
-        return {}
+    starts.sort(key=lambda x: x[0])
+    last_end = next_top_level if next_top_level is not None else line_count
+    result: dict[tuple[str, str], tuple[int, int]] = {}
+    for idx, (start, path, method, value_node) in enumerate(starts):
+        end = starts[idx + 1][0] - 1 if idx + 1 < len(starts) else last_end
+        if end < start:
+            end = max(start, _last_line(value_node))
+        result.setdefault((path, method), (start, end))
 
-    method_indent = None
-    current_path = None
-    current_method = None
-    current_method_start = None
+    return result
 
-    def flush():
-        nonlocal current_method, current_method_start
-        if current_path and current_method and current_method_start is not None:
-            ranges[(current_path, current_method)] = current_method_start
-        current_method = None
-        current_method_start = None
 
-    for i in range(paths_line_idx + 1, len(lines)):
-        line = lines[i]
-        rstripped = line.rstrip()
+# ---------------------------------------------------------------------------
+# YAML loading
+# ---------------------------------------------------------------------------
 
-        if not rstripped or rstripped.lstrip().startswith("#"):
-            continue
+# libyaml-backed loader when PyYAML was built with it; pure-Python otherwise.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-        # End of paths section (top-level key with no indentation)
-        if not line[0].isspace() and rstripped and not rstripped.startswith("#"):
-            flush()
-            break
+# Bump when the cached payload shape changes so older entries are ignored.
+_PARSE_CACHE_VERSION = 1
 
-        indent_len = len(line) - len(line.lstrip())
+# Parse cache counters for the current process (see print_parse_cache_stats).
+parse_cache_stats: dict[str, int] = {"hits": 0, "misses": 0}
 
-        # Path line
-        m = re.match(r'^(\s+)(/.*):\s*$', rstripped)
-        if m and indent_len == path_indent:
-            flush()
-            current_path = m.group(2).rstrip()
-            current_method = None
-            continue
+# Documents already loaded by this process, keyed like the on-disk entries, so
+# tools running in one interpreter (api-pipeline.py) share parsed objects.
+# Callers must treat the returned data as read-only.
+_parsed_documents: dict[str, tuple[Any, dict]] = {}
 
-        # Method line
-        if current_path and indent_len > path_indent:
-            m2 = re.match(r'^(\s+)(\w+):\s*$', rstripped)
-            if m2:
-                candidate = m2.group(2).lower()
-                candidate_indent = len(m2.group(1))
-                if candidate in HTTP_METHODS:
-                    if method_indent is None:
-                        method_indent = candidate_indent
-                    if candidate_indent == method_indent:
-                        flush()
-                        current_method = candidate
-                        current_method_start = i + 1  # 1-based
-
-    flush()
-
-    # Compute end lines from sorted start lines
-    sorted_entries = sorted(ranges.items(), key=lambda x: x[1])
-    result: dict[tuple[str, str], tuple[int, int]] = {}
-    for idx, ((path, method), start) in enumerate(sorted_entries):
-        if idx + 1 < len(sorted_entries):
-            end = sorted_entries[idx + 1][1] - 1
-        else:
-            end = len(lines)
-            for j in range(start, len(lines)):
-                rline = lines[j].rstrip()
-                if rline and not lines[j][0].isspace() and not rline.startswith("#"):
-                    end = j
-                    break
-        result[(path, method)] = (start, end)
 
-    return result
+def _parse_yaml(content: str) -> tuple[Any, dict]:
+    """Compose and construct a YAML document in one parse; return (data, line_ranges)."""
+    loader = YAML_LOADER(content)
+    try:
+        root = loader.get_single_node()
+        if root is None:
+            return None, {}
+        data = loader.construct_document(root)
+        return data, find_line_ranges(root, len(content.splitlines()))
+    finally:
+        loader.dispose()
+
+
+def _parse_cache_path(digest: str) -> Path:
+    return PARSE_CACHE_DIR / f"{digest}.v{_PARSE_CACHE_VERSION}.pickle"
+
+
+def is_parse_cached(path: Path) -> bool:
+    """True when load_yaml_document(path) would not need to parse any YAML."""
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    return digest in _parsed_documents or _parse_cache_path(digest).exists()
+
+
+def load_yaml_document(path: Path) -> tuple[Any, dict[tuple[str, str], tuple[int, int]]]:
+    """
+    Load a swagger YAML file through the shared on-disk parse cache.
+
+    Returns (data, line_ranges), where line_ranges is the find_line_ranges()
+    result for the document. Entries live in PARSE_CACHE_DIR keyed by the
+    SHA-256 of the file bytes, so every tool that loads the same swagger
+    (indexers, api-file-generator) parses it at most once across runs; within
+    one process the parsed objects are also kept in memory and shared.
+    Raises OSError / yaml.YAMLError like a plain read + parse would.
+    """
+    raw = path.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    if digest in _parsed_documents:
+        parse_cache_stats["hits"] += 1
+        return _parsed_documents[digest]
+    cache_path = _parse_cache_path(digest)
+
+    try:
+        with cache_path.open("rb") as fh:
+            data, line_ranges = pickle.load(fh)
+    except Exception:
+        pass  # Missing or unreadable entry — treat as a miss.
+    else:
+        parse_cache_stats["hits"] += 1
+        _parsed_documents[digest] = (data, line_ranges)
+        return data, line_ranges
+
+    parse_cache_stats["misses"] += 1
+    data, line_ranges = _parse_yaml(raw.decode("utf-8"))
+    _parsed_documents[digest] = (data, line_ranges)
+
+    try:
+        PARSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Per-process/thread temp name: variants with identical content share an entry.
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with tmp_path.open("wb") as fh:
+            pickle.dump((data, line_ranges), fh, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(cache_path)
+    except OSError as exc:
+        print(f"Warning: could not write parse cache for {path}: {exc}")
+
+    return data, line_ranges
+
+
+def clear_parse_cache() -> None:
+    """Drop every parsed document, in memory and on disk (cold-start benchmarks)."""
+    _parsed_documents.clear()
+    shutil.rmtree(PARSE_CACHE_DIR, ignore_errors=True)
+
+
+def print_parse_cache_stats() -> None:
+    """Print the YAML parse cache hit/miss counts for this run."""
+    backend = "libyaml" if YAML_LOADER is not yaml.SafeLoader else "pure-Python"
+    print(
+        f"YAML parse cache: {parse_cache_stats['hits']} hits, "
+        f"{parse_cache_stats['misses']} misses ({backend} loader)"
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -374,9 +680,7 @@ def index_swagger_file(
     Returns empty list on parse errors when fatal_on_error is False.
     """
     try:
-        content = swagger_path.read_text(encoding="utf-8")
-        lines = content.splitlines(keepends=True)
-        data = yaml.safe_load(content)
+        data, line_ranges = load_yaml_document(swagger_path)
     except yaml.YAMLError as exc:
         print(f"Error: {swagger_path} is not valid YAML ({exc}).")
         if fatal_on_error:
@@ -394,25 +698,26 @@ def index_swagger_file(
             sys.exit(1)
         return []
 
-    if "paths" not in data:
+    if not isinstance(data.get("paths"), dict):
         print(f"Warning: {swagger_path} has no 'paths' key, treating as 0 endpoints.")
         return []
 
-    line_ranges = find_line_ranges(lines)
     records = []
 
     for path, path_data in data["paths"].items():
         if not isinstance(path_data, dict):
             continue
-        for method in HTTP_METHODS:
-            if method not in path_data:
+        # File order, so the record order is stable across runs.
+        for method, method_data in path_data.items():
+            if method not in HTTP_METHODS:
                 continue
-            method_data = path_data[method]
             description = ""
             if isinstance(method_data, dict):
                 description = method_data.get("description", "") or ""
 
             key = (path, method)
+            if key not in line_ranges:
+                print(f"Warning: no line range for {method.upper()} {path} in {swagger_path}.")
             start_line, end_line = line_ranges.get(key, (0, 0))
 
             records.append({
@@ -425,3 +730,686 @@ def index_swagger_file(
             })
 
     return records
+
+
+# ---------------------------------------------------------------------------
+# Endpoint map files
+# ---------------------------------------------------------------------------
+
+# Endpoint maps are written as JSON Lines (one record per line) and streamed
+# instead of re-serializing the whole map. The legacy indented JSON array is
+# produced once, at the end of a run.
+#
+# A JSONL map may start with a header line: an object without an "endpoint"
+# key. The main indexer stores its variant table there ({"variant_table":
+# [...]}) and gives each record a "variants" bitmask over that table.
+
+def endpoint_map_jsonl_path(json_path: Path) -> Path:
+    """Return the JSON Lines sibling of a legacy endpoints_map.json path."""
+    return json_path.with_suffix(".jsonl")
+
+
+def open_endpoint_map(json_path: Path, header: Optional[dict] = None) -> TextIO:
+    """
+    Start writing an endpoint map: open a temporary JSONL file for appending.
+
+    Records go to `endpoints_map.jsonl.partial`; nothing visible to readers
+    changes until commit_endpoint_map() renames it into place, so an
+    interrupted run never leaves a truncated map behind. A `header` is
+    written as the first line (JSONL only; the legacy array has no header).
+    """
+    partial = endpoint_map_jsonl_path(json_path).with_suffix(".jsonl.partial")
+    partial.parent.mkdir(parents=True, exist_ok=True)
+    fh = partial.open("w", encoding="utf-8")
+    if header is not None:
+        fh.write(json.dumps(header, ensure_ascii=False))
+        fh.write("\n")
+    return fh
+
+
+def append_endpoint_records(fh: TextIO, records: Iterable[dict]) -> None:
+    """Append records to an open endpoint map as JSON Lines."""
+    for rec in records:
+        fh.write(json.dumps(rec, ensure_ascii=False))
+        fh.write("\n")
+    fh.flush()
+
+
+def commit_endpoint_map(fh: TextIO, json_path: Path) -> None:
+    """
+    Finish an endpoint map started with open_endpoint_map().
+
+    Atomically renames the JSONL file into place, then streams it into the
+    legacy `endpoints_map.json` array (indent=2, byte-identical to dumping
+    the whole list at once), also via a temp file and rename.
+    """
+    partial = Path(fh.name)
+    os.fsync(fh.fileno())
+    fh.close()
+    jsonl_path = endpoint_map_jsonl_path(json_path)
+    partial.replace(jsonl_path)
+
+    tmp_path = json_path.with_suffix(".json.partial")
+    with tmp_path.open("w", encoding="utf-8") as out:
+        count = 0
+        for rec in iter_endpoint_map(jsonl_path):
+            out.write("[\n" if count == 0 else ",\n")
+            body = json.dumps(rec, indent=2, ensure_ascii=False)
+            out.write("\n".join("  " + line for line in body.split("\n")))
+            count += 1
+        out.write("\n]" if count else "[]")
+    tmp_path.replace(json_path)
+
+
+def write_endpoint_records(path: Path, records: Iterable[dict]) -> None:
+    """Write records to a standalone JSONL file atomically (temp file + rename)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".partial")
+    with tmp_path.open("w", encoding="utf-8") as fh:
+        append_endpoint_records(fh, records)
+    tmp_path.replace(path)
+
+
+def iter_endpoint_map(path: Path) -> Iterator[dict]:
+    """
+    Yield endpoint records from a JSONL (`.jsonl`) or legacy JSON array map.
+
+    JSONL maps are streamed line by line; a header line is skipped (see
+    read_endpoint_map_header). Raises OSError on read errors and
+    json.JSONDecodeError (with the 1-based line number in the message for
+    JSONL) on malformed content.
+    """
+    if path.suffix != ".jsonl":
+        yield from json.loads(path.read_text(encoding="utf-8"))
+        return
+    with path.open(encoding="utf-8") as fh:
+        for lineno, line in enumerate(fh, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise json.JSONDecodeError(f"line {lineno}: {exc.msg}", exc.doc, exc.pos) from exc
+            if lineno == 1 and "endpoint" not in record:
+                continue  # header
+            yield record
+
+
+def read_endpoint_map_header(path: Path) -> dict:
+    """Return the header of a JSONL endpoint map, or {} if it has none."""
+    with endpoint_map_jsonl_path(path).open(encoding="utf-8") as fh:
+        first = fh.readline()
+    header = json.loads(first) if first.strip() else {}
+    return {} if "endpoint" in header else header
+
+
+def record_variants(record: dict, variant_table: list[str]) -> list[str]:
+    """
+    Decode a record's "variants" bitmask into variant names (bit i is
+    variant_table[i]). For one variant, `record["variants"] >> i & 1` is enough.
+    """
+    mask = record.get("variants", 0)
+    return [name for i, name in enumerate(variant_table) if mask >> i & 1]
+
+
+# ---------------------------------------------------------------------------
+# Reference documents
+# ---------------------------------------------------------------------------
+
+# The generated markdown, keyed by path relative to REFERENCES_DIR: the index
+# file plus "blockscout-api/<file>.md" for every API file, and the entry
+# offsets sidecar derived from them. api-file-generator builds this dict,
+# api-extras-applier patches it, and both (or api-pipeline.py, which passes
+# the dict from one to the other) write it out.
+
+INDEX_DOCUMENT = "blockscout-api-index.md"
+OFFSETS_DOCUMENT = "blockscout-api-offsets.json"
+
+
+def api_document(filename: str) -> str:
+    """Return the document key of an API file (e.g. "blockscout-api/blocks.md")."""
+    return f"{API_DIR.name}/{filename}"
+
+
+def read_reference_documents() -> dict[str, str]:
+    """
+    Read the index, every API file and the offsets sidecar on disk; missing
+    files are simply absent.
+    """
+    documents: dict[str, str] = {}
+    index_path = REFERENCES_DIR / INDEX_DOCUMENT
+    if index_path.exists():
+        documents[INDEX_DOCUMENT] = index_path.read_text(encoding="utf-8")
+    for path in sorted(API_DIR.glob("*.md")):
+        documents[api_document(path.name)] = path.read_text(encoding="utf-8")
+    offsets_path = REFERENCES_DIR / OFFSETS_DOCUMENT
+    if offsets_path.exists():
+        documents[OFFSETS_DOCUMENT] = offsets_path.read_text(encoding="utf-8")
+    return documents
+
+
+def write_reference_documents(documents: dict[str, str], remove_stale: bool = False) -> dict[str, int]:
+    """
+    Write documents under REFERENCES_DIR, skipping every file whose content
+    hash already matches the file on disk, so unchanged files keep their
+    mtime. Changed files are replaced atomically, the offsets sidecar last,
+    so it is never newer than the markdown it describes. With remove_stale,
+    API files on disk that are not in `documents` (no endpoints any more)
+    are deleted.
+
+    Returns {"written", "unchanged", "removed"} counts and prints them.
+    Exits with code 1 if a file cannot be written.
+    """
+    counts = {"written": 0, "unchanged": 0, "removed": 0}
+    API_DIR.mkdir(parents=True, exist_ok=True)
+    if remove_stale:
+        for path in sorted(API_DIR.glob("*.md")):
+            if api_document(path.name) not in documents:
+                path.unlink()
+                counts["removed"] += 1
+                print(f"  Removed: {api_document(path.name)}")
+    for key, content in sorted(documents.items(), key=lambda item: item[0] == OFFSETS_DOCUMENT):
+        if not write_file_if_changed(REFERENCES_DIR / key, content.encode("utf-8")):
+            counts["unchanged"] += 1
+            continue
+        counts["written"] += 1
+        print(f"  Written: {key}")
+    print(f"  {counts['written']} written, {counts['unchanged']} unchanged, {counts['removed']} removed")
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Endpoint entries and their locations
+# ---------------------------------------------------------------------------
+
+# An entry heading (`#### METHOD /path`) or an H2/H3 heading, which ends the
+# entry before it. Matched on the UTF-8 bytes after a newline, so the match
+# positions are byte offsets and the search can skip ahead to each "\n#".
+_ENTRY_BOUNDARY_RE = re.compile(rb"\n(?:#### ([A-Z]+) (\S+)|## |### ([^\n]*))")
+_INDEX_FILE_LINK_RE = re.compile(r"\((blockscout-api/[^)]+\.md)\)")
+_INDEX_ITEM_RANGE_RE = re.compile(r"^(-\s+`([^`]+)`)(?: \(lines \d+-\d+\))?")
+
+
+def iter_api_entries(documents: dict[str, str], prefix: Optional[str] = None) -> Iterator[dict]:
+    """
+    Yield every endpoint entry of the API files in `documents`, in
+    document-key order, as {"document", "section", "method", "path", "lines",
+    "start_line", "end_line", "offset", "length"}. Only documents whose key
+    starts with `prefix` (default: the API files directory) are read.
+
+    An entry runs from its `#### METHOD /path` heading to the last non-blank
+    line before the next heading. `section` is its H3 heading. Line numbers
+    are 1-based and inclusive; `offset` and `length` count bytes of the UTF-8
+    file and cover the same lines, including the final newline.
+    """
+    prefix = api_document("") if prefix is None else prefix
+    for key in sorted(documents):
+        if not key.startswith(prefix):
+            continue
+        # A leading newline lets a heading on the first line match too; match
+        # position i is then the heading's byte offset in the file.
+        data = b"\n" + documents[key].encode("utf-8")
+        size = len(data) - 1
+        section = ""
+        entry: Optional[dict] = None
+        line, pos = 1, 0
+
+        def close(end: int) -> dict:
+            start = entry["offset"] + 1
+            # Keep whole lines up to the last non-blank one.
+            stop = data.find(b"\n", start + len(data[start:end].rstrip()), end)
+            stop = end if stop < 0 else stop
+            entry["lines"] = data[start:stop].decode("utf-8").split("\n")
+            entry["end_line"] = entry["start_line"] + len(entry["lines"]) - 1
+            entry["length"] = min(stop - start + 1, size - entry["offset"])
+            return entry
+
+        for m in _ENTRY_BOUNDARY_RE.finditer(data):
+            offset = m.start()
+            line += data.count(b"\n", pos, offset)
+            pos = offset
+            if entry:
+                yield close(offset + 1)
+                entry = None
+            if m.group(1):
+                entry = {"document": key, "section": section, "method": m.group(1).decode(),
+                         "path": m.group(2).decode("utf-8"), "start_line": line, "offset": offset}
+            elif m.group(3) is not None:
+                section = m.group(3).decode("utf-8").strip()
+        if entry:
+            yield close(len(data))
+
+
+def locate_entries(documents: dict[str, str]) -> dict[str, dict]:
+    """
+    Map "METHOD /path" of every API file entry to its location:
+    {"file", "offset", "length", "start_line", "end_line"}, with `file` the
+    document key (relative to REFERENCES_DIR).
+    """
+    return {
+        f"{entry['method']} {entry['path']}": {
+            "file": entry["document"],
+            "offset": entry["offset"],
+            "length": entry["length"],
+            "start_line": entry["start_line"],
+            "end_line": entry["end_line"],
+        }
+        for entry in iter_api_entries(documents)
+    }
+
+
+def add_entry_locations(documents: dict[str, str]) -> set[str]:
+    """
+    Record where every endpoint entry sits in the API files: rewrite the
+    offsets sidecar (OFFSETS_DOCUMENT) and give each index line item the
+    `(lines N-M)` range of its entries in the file its section links to (the
+    union, if the path has several methods). Must run after the last change
+    to the API files, so the sidecar and the ranges are written together
+    with the markdown they describe. Returns the keys of changed documents.
+    """
+    locations = locate_entries(documents)
+    ranges: dict[tuple[str, str], tuple[int, int]] = {}
+    for key, location in locations.items():
+        span = (location["file"], key.split(" ", 1)[1])
+        start, end = ranges.get(span, (location["start_line"], location["end_line"]))
+        ranges[span] = (min(start, location["start_line"]), max(end, location["end_line"]))
+
+    changed: set[str] = set()
+    offsets = render_offsets(locations)
+    if documents.get(OFFSETS_DOCUMENT) != offsets:
+        documents[OFFSETS_DOCUMENT] = offsets
+        changed.add(OFFSETS_DOCUMENT)
+
+    index = documents.get(INDEX_DOCUMENT)
+    if index is not None:
+        lines = []
+        document = None
+        for line in index.split("\n"):
+            if line.startswith("## "):
+                m = _INDEX_FILE_LINK_RE.search(line)
+                document = m.group(1) if m else None
+            else:
+                m = _INDEX_ITEM_RANGE_RE.match(line)
+                if m:
+                    span = ranges.get((document, m.group(2)))
+                    suffix = f" (lines {span[0]}-{span[1]})" if span else ""
+                    line = m.group(1) + suffix + line[m.end():]
+            lines.append(line)
+        annotated = "\n".join(lines)
+        if annotated != index:
+            documents[INDEX_DOCUMENT] = annotated
+            changed.add(INDEX_DOCUMENT)
+    return changed
+
+# ---------------------------------------------------------------------------
+# Endpoint search index
+# ---------------------------------------------------------------------------
+
+# One row per H4 endpoint entry of the API files. The text columns are
+# indexed for full-text search (Porter-stemmed, so "transfers" matches
+# "transfer"); `path` has its {placeholders} blanked out, which keeps
+# parameter names such as address_hash_param from matching every path.
+# `entry` holds the entry markdown verbatim and is what the query script
+# prints. Column order is part of the database format (the query script's
+# bm25 weights follow it).
+SEARCH_COLUMNS = ("path", "method", "description", "param_names", "param_descriptions", "file", "section", "entry")
+
+_SEARCH_PARAM_ROW_RE = re.compile(r"^\s*\|\s*`([^`]+)`\s*\|")
+_PLACEHOLDER_RE = re.compile(r"\{[^}]+\}")
+
+
+def iter_search_rows(documents: dict[str, str]) -> Iterator[tuple[str, ...]]:
+    """
+    Yield a SEARCH_COLUMNS row for every endpoint entry of the API files in
+    `documents`, in document-key order. `section` is the entry's H3 heading
+    (the chain family in chain files); `file` is the API file name.
+    """
+    prefix = api_document("")
+    for entry in iter_api_entries(documents):
+        lines = entry["lines"]
+        description: list[str] = []
+        names: list[str] = []
+        param_text: list[str] = []
+        in_params = False
+        for line in lines[1:]:
+            if line.startswith("- **"):
+                in_params = True
+            elif not in_params:
+                description.append(line.strip())
+            else:
+                m = _SEARCH_PARAM_ROW_RE.match(line)
+                if m:
+                    names.append(m.group(1))
+                    # Cells after Name: Type, Required, Description.
+                    param_text.append(" ".join(line.split("|")[4:]).strip())
+                elif line.strip() and not line.strip().startswith(("| Name", "| ----", "*None*")):
+                    param_text.append(line.strip(" |"))
+        yield (_PLACEHOLDER_RE.sub("{}", entry["path"]), entry["method"], " ".join(" ".join(description).split()),
+               " ".join(names), " ".join(" ".join(param_text).split()), entry["document"][len(prefix):],
+               entry["section"], "\n".join(lines).rstrip())
+
+
+def build_search_index(documents: dict[str, str], path: Path) -> int:
+    """
+    Write a fresh FTS5 search database of the API files to `path` and return
+    the number of endpoints. The same documents always produce the same bytes.
+    Raises sqlite3.OperationalError if SQLite lacks FTS5.
+    """
+    path.unlink(missing_ok=True)
+    conn = sqlite3.connect(path)
+    try:
+        # A scratch file that is renamed into place once complete: skip the
+        # rollback journal and the fsyncs.
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute(
+            f"CREATE VIRTUAL TABLE endpoints USING fts5("
+            f"{', '.join(SEARCH_COLUMNS[:-1])}, entry UNINDEXED, tokenize='porter unicode61')"
+        )
+        rows = list(iter_search_rows(documents))
+        conn.executemany(f"INSERT INTO endpoints VALUES ({', '.join('?' * len(SEARCH_COLUMNS))})", rows)
+        conn.execute("INSERT INTO endpoints(endpoints) VALUES ('optimize')")
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    return len(rows)
+
+
+def write_search_index(documents: dict[str, str]) -> bool:
+    """
+    Rebuild SEARCH_DB_PATH from the complete set of reference documents,
+    replacing the file only if its content changed. Returns True if it was
+    written. Prints a warning and leaves the database alone when the local
+    SQLite has no FTS5 support.
+    """
+    tmp_path = SEARCH_DB_PATH.with_name(SEARCH_DB_PATH.name + ".partial")
+    try:
+        count = build_search_index(documents, tmp_path)
+    except sqlite3.OperationalError as exc:
+        tmp_path.unlink(missing_ok=True)
+        print(f"Warning: search index not written ({exc})")
+        return False
+    if not replace_file_if_changed(tmp_path, SEARCH_DB_PATH):
+        print(f"  Search index: {count} endpoints, unchanged")
+        return False
+    print(f"  Search index: {count} endpoints, written to {SEARCH_DB_PATH.name}")
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Endpoint catalog
+# ---------------------------------------------------------------------------
+
+# The Blockscout API files and the PRO API detail shards of the web3-dev skill
+# (web3-dev/references/pro-api/) document many of the same endpoints: a PRO
+# path is the Blockscout path behind a /{chain_id} prefix. The catalog joins
+# both on that mapping into one model, keyed "METHOD /path" with placeholders
+# blanked. Descriptions and parameter tables are normalized (whitespace
+# collapsed, one [name, type, required, description] row per parameter) and
+# stored once under their SHA-256, so an endpoint documented the same way by
+# both sources points at the same hashes.
+CATALOG_PATH = BUILD_DIR / "catalog.json"
+CATALOG_FORMAT = 1
+
+# Document-key prefix of the PRO API shards passed to build_catalog().
+PRO_API_DOCUMENT_PREFIX = "pro-api/"
+PRO_API_PATH_PREFIX = "/{chain_id}"
+
+# A cell separator: a "|" that is neither escaped nor inside a code span
+# (PRO API types such as `integer | string` are not escaped).
+_TABLE_CELL_SPLIT_RE = re.compile(r"(?<!\\)\|(?=(?:[^`]*`[^`]*`)*[^`]*$)")
+
+
+def catalog_key(method: str, path: str) -> str:
+    """Catalog key of a Blockscout or PRO API endpoint ("GET /api/v2/blocks/{}")."""
+    if path.startswith(PRO_API_PATH_PREFIX + "/"):
+        path = path[len(PRO_API_PATH_PREFIX):]
+    return f"{method} {_PLACEHOLDER_RE.sub('{}', path)}"
+
+
+def _entry_parts(lines: list[str]) -> tuple[str, list[list[str]]]:
+    """
+    Normalized description and parameter rows of an API file entry. The
+    description is the text before the first `- **` bullet; rows come from the
+    `- **Parameters**` table only, with multi-line cells joined.
+    """
+    description: list[str] = []
+    rows: list[str] = []
+    block = None
+    for line in lines[1:]:
+        if line.startswith("- **"):
+            if block is not None or not line.startswith("- **Parameters**"):
+                break
+            block = rows
+        elif block is None:
+            description.append(line)
+        elif _SEARCH_PARAM_ROW_RE.match(line):
+            rows.append(line.strip())
+        elif rows and line.strip():
+            rows[-1] += " " + line.strip()
+    table = []
+    for row in rows:
+        cells = _TABLE_CELL_SPLIT_RE.split(row.strip().strip("|"))
+        # An unescaped "|" inside the description adds cells; keep them together.
+        name, kind, required, text = (*cells[:3], "|".join(cells[3:]))
+        table.append([name.strip().strip("`"), kind.strip().strip("`"), required.strip(),
+                      " ".join(text.split()).replace("\\|", "|")])
+    return " ".join(" ".join(description).split()), table
+
+
+def _intern(pool: dict, value) -> Optional[str]:
+    """Store `value` in `pool` under its SHA-256 and return the hash (None for an empty value)."""
+    if not value:
+        return None
+    digest = hashlib.sha256(json.dumps(value, ensure_ascii=False).encode("utf-8")).hexdigest()
+    pool.setdefault(digest, value)
+    return digest
+
+
+def build_catalog(blockscout_documents: dict[str, str], pro_documents: dict[str, str]) -> dict:
+    """
+    Build the endpoint catalog from the Blockscout reference documents
+    (keyed as by build_documents()) and the PRO API shards (keyed
+    "pro-api/<file>.md"):
+
+        {"format", "summary", "endpoints": {key: {"blockscout", "pro"}},
+         "descriptions": {hash: text}, "parameters": {hash: rows}}
+
+    Each source record is {"path", "document", "section", "start_line",
+    "description", "parameters"}, the last two hashes or None. The PRO
+    `chain_id` parameter is dropped, since it is the mapped-away prefix. An
+    endpoint documented twice by one source keeps its first entry.
+    """
+    catalog: dict = {"format": CATALOG_FORMAT, "summary": {}, "endpoints": {}, "descriptions": {}, "parameters": {}}
+    endpoints = catalog["endpoints"]
+    duplicates = 0
+    for source, documents, prefix in (("blockscout", blockscout_documents, None),
+                                      ("pro", pro_documents, PRO_API_DOCUMENT_PREFIX)):
+        for entry in iter_api_entries(documents, prefix):
+            record = endpoints.setdefault(catalog_key(entry["method"], entry["path"]), {})
+            if source in record:
+                duplicates += 1
+                continue
+            description, table = _entry_parts(entry["lines"])
+            if source == "pro":
+                table = [row for row in table if row[0] != "chain_id"]
+            record[source] = {
+                "path": entry["path"],
+                "document": entry["document"],
+                "section": entry["section"],
+                "start_line": entry["start_line"],
+                "description": _intern(catalog["descriptions"], description),
+                "parameters": _intern(catalog["parameters"], table),
+            }
+    catalog["endpoints"] = dict(sorted(endpoints.items()))
+
+    shared = [record for record in endpoints.values() if len(record) == 2]
+    catalog["summary"] = {
+        "endpoints": len(endpoints),
+        "both": len(shared),
+        "blockscout_only": sum("pro" not in record for record in endpoints.values()),
+        "pro_only": sum("blockscout" not in record for record in endpoints.values()),
+        "same_description": sum(r["blockscout"]["description"] == r["pro"]["description"] for r in shared),
+        "same_parameters": sum(r["blockscout"]["parameters"] == r["pro"]["parameters"] for r in shared),
+        "duplicates": duplicates,
+        "descriptions": len(catalog["descriptions"]),
+        "parameter_tables": len(catalog["parameters"]),
+    }
+    return catalog
+
+
+def write_catalog(catalog: dict) -> bool:
+    """
+    Write the catalog to CATALOG_PATH unless it is unchanged, and print its
+    summary. Returns True if the file was written.
+    """
+    summary = catalog["summary"]
+    CATALOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    data = (json.dumps(catalog, indent=1, ensure_ascii=False) + "\n").encode("utf-8")
+    written = write_file_if_changed(CATALOG_PATH, data)
+    print(
+        f"  Catalog: {summary['endpoints']} endpoints ({summary['both']} in both, "
+        f"{summary['blockscout_only']} Blockscout only, {summary['pro_only']} PRO only), "
+        + (f"written to {CATALOG_PATH}" if written else "unchanged")
+    )
+    print(
+        f"  Shared endpoints with the same description: {summary['same_description']}, "
+        f"same parameters: {summary['same_parameters']}; "
+        f"{summary['descriptions']} descriptions and {summary['parameter_tables']} parameter tables stored"
+    )
+    return written
+
+
+# ---------------------------------------------------------------------------
+# Hyphen-named tool scripts
+# ---------------------------------------------------------------------------
+
+def load_tool(filename: str, directory: Optional[Path] = None):
+    """
+    Import a tool script such as "api-file-generator.py" as a module.
+
+    The module is registered in sys.modules under its underscored name, so
+    process-pool workers can unpickle its functions.
+    """
+    directory = directory or Path(__file__).resolve().parent
+    name = filename.replace("-", "_").removesuffix(".py")
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, directory / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def process_pool(max_workers: int, tool_file: str) -> ProcessPoolExecutor:
+    """
+    Process pool for the workers of the tool script at `tool_file`.
+
+    Workers come from a fork server (spawned where there is none), never
+    from a fork of the calling process: in api-pipeline.py other stage
+    threads may be holding locks (stdio, logging, sqlite) at that moment,
+    and a forked child would inherit them locked. The fork server preloads
+    the third-party modules, which make up most of a worker's import time.
+    Each worker imports the tool with load_tool(), so the tool's functions
+    can be unpickled there.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    if context.get_start_method() == "forkserver":
+        context.set_forkserver_preload(["requests", "yaml"])
+    path = Path(tool_file).resolve()
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=context, initializer=load_tool, initargs=(path.name, path.parent)
+    )
+
+
+# ---------------------------------------------------------------------------
+# Run manifests
+# ---------------------------------------------------------------------------
+
+# Each indexer keeps a manifest.json in its output directory recording the
+# resolved release version and, per swagger file, its SHA-256 and record
+# count. It lets a re-run skip unchanged work and pins the inputs of an
+# offline rebuild.
+
+def load_manifest(path: Path) -> dict:
+    """Return a run manifest, or {} when it is missing or unreadable."""
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def save_manifest(path: Path, manifest: dict) -> None:
+    """Write a run manifest atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.partial")
+    tmp_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    tmp_path.replace(path)
+
+
+# ---------------------------------------------------------------------------
+# Swaggers repository mirror
+# ---------------------------------------------------------------------------
+
+def version_key(version: str) -> tuple[int, ...]:
+    """Sort key for release version strings: '9.10.0' sorts after '9.9.1'."""
+    return tuple(int(part) for part in re.findall(r"\d+", version))
+
+
+def latest_version_dir(directory: Path) -> Optional[str]:
+    """
+    Return the highest version-named subdirectory of `directory` (e.g. the
+    `blockscout/` folder of a local blockscout/swaggers checkout), or None.
+    """
+    if not directory.is_dir():
+        return None
+    versions = [
+        entry.name for entry in directory.iterdir()
+        if entry.is_dir() and re.fullmatch(r"v?\d+(\.\d+)*", entry.name)
+    ]
+    return max(versions, key=version_key) if versions else None
+
+
+# ---------------------------------------------------------------------------
+# Stage profiling
+# ---------------------------------------------------------------------------
+
+# The profiler itself is common_base's (one per process, shared with the PRO
+# API indexer when api-pipeline.py runs it). The Blockscout tools add the
+# shared flags, the PROFILE_DIR default and their YAML counters.
+
+
+def add_profile_arguments(parser: Any, tool: str) -> None:
+    """Add the shared --profile / --cprofile flags to an argparse parser."""
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        type=Path,
+        const=PROFILE_DIR / f"{tool}.json",
+        metavar="REPORT",
+        help=f"Write a JSON per-stage timing report (default: {PROFILE_DIR / (tool + '.json')})",
+    )
+    parser.add_argument(
+        "--cprofile",
+        type=Path,
+        metavar="PSTATS",
+        help="Also write a cProfile dump (load with pstats / snakeviz); implies --profile",
+    )
+
+
+def _profile_report_fields() -> dict[str, Any]:
+    return {
+        "yaml_loader": "libyaml" if YAML_LOADER is not yaml.SafeLoader else "pure-Python",
+        "counters": {"parse_cache": dict(parse_cache_stats)},
+    }
+
+
+def start_profile(tool: str, report_path: Optional[Path], cprofile_path: Optional[Path] = None) -> None:
+    """Start stage profiling if requested; the report is written when the process exits."""
+    if report_path is None and cprofile_path is not None:
+        report_path = PROFILE_DIR / f"{tool}.json"
+    _start_profile(tool, report_path, cprofile_path, _profile_report_fields)
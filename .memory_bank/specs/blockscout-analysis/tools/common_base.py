@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Standard-library-only helpers shared by the Blockscout tools and the web3-dev
+PRO API indexer: atomic file writes, the offsets sidecar format, local `$ref`
+resolution and stage profiling.
+
+common.py re-exports everything here; scripts that must not depend on
+requests or PyYAML (web3-dev/tools/pro-api-indexer.py) import this module
+directly.
+"""
+
+import atexit
+import cProfile
+import hashlib
+import json
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Optional, TextIO
+
+try:
+    import resource  # Unix only; peak RSS is omitted from profiles elsewhere
+except ImportError:
+    resource = None
+
+# ---------------------------------------------------------------------------
+# File writes
+# ---------------------------------------------------------------------------
+
+def file_sha256(path: Path) -> str:
+    """Return the hex SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_file_if_changed(path: Path, data: bytes) -> bool:
+    """
+    Replace `path` with `data` atomically (through a ".partial" sibling)
+    unless the file already has that content, so an unchanged file keeps its
+    mtime. Returns True if the file was written. Exits with code 1 if it
+    cannot be written.
+    """
+    try:
+        if path.exists() and file_sha256(path) == hashlib.sha256(data).hexdigest():
+            return False
+        tmp_path = path.with_name(path.name + ".partial")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+    except OSError as exc:
+        print(f"Error: cannot write {path}: {exc}")
+        sys.exit(1)
+    return True
+
+
+def replace_file_if_changed(tmp_path: Path, path: Path) -> bool:
+    """
+    Rename a finished `tmp_path` over `path` if their contents differ,
+    otherwise delete it. Returns True if `path` was replaced.
+    """
+    if path.exists() and file_sha256(path) == file_sha256(tmp_path):
+        tmp_path.unlink()
+        return False
+    tmp_path.replace(path)
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Entry offsets
+# ---------------------------------------------------------------------------
+
+def render_offsets(locations: dict[str, dict]) -> str:
+    """Serialize entry locations as a JSON object with one entry per line."""
+    items = [f"  {json.dumps(key)}: {json.dumps(location)}" for key, location in locations.items()]
+    return "{\n" + ",\n".join(items) + "\n}\n"
+
+
+# ---------------------------------------------------------------------------
+# Local $ref resolution
+# ---------------------------------------------------------------------------
+
+# Shared by api-file-generator.py (swaggers) and the web3-dev PRO API indexer
+# (pro-api.json). A resolver holds one document and the memo of its resolved
+# references, so a reloaded or different document never sees another's
+# targets. Unresolvable and cyclic references are memoized as None, so each
+# is reported once.
+
+
+def ref_resolver(document: dict, label: str, out: Optional[TextIO] = None) -> dict:
+    """
+    Resolver state for the local `$ref`s of `document`. `label` names the
+    document in warnings (e.g. "swagger (path)"); `out` is where they go
+    unless a call passes its own stream (default stdout).
+    """
+    return {"document": document, "label": label, "out": out, "memo": {}}
+
+
+def _lookup_pointer(document: dict, ref: str) -> Optional[dict]:
+    """Follow a local JSON pointer ("#/components/parameters/page"). None if absent."""
+    if not ref.startswith("#/"):
+        return None
+    node = document
+    for token in ref[2:].split("/"):
+        token = token.replace("~1", "/").replace("~0", "~")
+        if not isinstance(node, dict) or token not in node:
+            return None
+        node = node[token]
+    return node if isinstance(node, dict) else None
+
+
+def resolve_ref(resolver: dict, ref: str, out: Optional[TextIO] = None) -> Optional[dict]:
+    """
+    Resolve a local `$ref` (OpenAPI 3.0 `#/components/...` or Swagger 2.0
+    `#/parameters/...`, `#/definitions/...`), following chained references.
+    Returns None for external, missing or cyclic references (prints a warning
+    the first time).
+    """
+    memo = resolver["memo"]
+    if ref in memo:
+        return memo[ref]
+    out = out if out is not None else resolver["out"]
+    document = resolver["document"]
+    chain = [ref]
+    target = _lookup_pointer(document, ref)
+    while target is not None and "$ref" in target:
+        next_ref = target["$ref"]
+        if next_ref in memo:
+            target = memo[next_ref]
+            break
+        if next_ref in chain:
+            print(f"Warning: $ref cycle in {resolver['label']}: {' -> '.join(chain + [next_ref])}", file=out)
+            target = None
+            break
+        chain.append(next_ref)
+        target = _lookup_pointer(document, next_ref)
+    else:
+        if target is None:
+            print(f"Warning: unresolvable $ref in {resolver['label']}: {chain[-1]}", file=out)
+    for r in chain:
+        memo[r] = target
+    return target
+
+
+def deref(node, resolver: dict, out: Optional[TextIO] = None) -> Optional[dict]:
+    """Return `node`, or its `$ref` target. None if it is not a mapping or cannot be resolved."""
+    if not isinstance(node, dict):
+        return None
+    if "$ref" in node:
+        return resolve_ref(resolver, node["$ref"], out)
+    return node
+
+
+def schema_type(
+    schema, resolver: dict, seen: frozenset = frozenset(), out: Optional[TextIO] = None
+) -> Optional[str]:
+    """
+    Type name of a schema: its `type`, the first typed `allOf` member, or the
+    distinct types of `oneOf`/`anyOf` joined with " | ". `seen` holds the ids
+    of schemas on the current branch, guarding against self-referencing
+    compositions.
+    """
+    schema = deref(schema, resolver, out)
+    if schema is None or id(schema) in seen:
+        return None
+    seen = seen | {id(schema)}
+    t = schema.get("type")
+    if isinstance(t, str) and t:
+        return t
+    for member in schema.get("allOf") or []:
+        t = schema_type(member, resolver, seen, out)
+        if t:
+            return t
+    for key in ("oneOf", "anyOf"):
+        types: list[str] = []
+        for member in schema.get(key) or []:
+            t = schema_type(member, resolver, seen, out)
+            if t and t not in types:
+                types.append(t)
+        if types:
+            return " | ".join(types)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Stage profiling
+# ---------------------------------------------------------------------------
+
+# Tools call profile_step() at the end of each numbered step of main(); it is
+# a no-op unless start_profile() was called (the --profile flag). Each call
+# records the step that just finished: wall and CPU time since the previous
+# call, the tracemalloc allocation peak within the step, the process peak RSS
+# so far and an optional item count. The report is written at exit.
+#
+# Step boundaries are tracked per thread, so stages that api-pipeline.py runs
+# concurrently are timed separately; their steps carry a "thread" label. CPU
+# time and the allocation peak stay process-wide.
+
+_profile: Optional[dict] = None
+
+
+def start_profile(
+    tool: str,
+    report_path: Optional[Path],
+    cprofile_path: Optional[Path] = None,
+    report_fields: Optional[Callable[[], dict[str, Any]]] = None,
+) -> None:
+    """
+    Start stage profiling if requested; the report is written when the
+    process exits. Without `report_path` it goes next to the cProfile dump.
+    `report_fields` returns extra top-level report fields at exit.
+    """
+    global _profile
+    if report_path is None and cprofile_path is None:
+        return
+    if report_path is None:
+        report_path = Path(cprofile_path).with_suffix(".json")
+    tracemalloc.start()
+    profiler = None
+    if cprofile_path is not None:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    now = (time.perf_counter(), time.process_time())
+    _profile = {
+        "tool": tool,
+        "report_path": Path(report_path),
+        "cprofile_path": cprofile_path,
+        "profiler": profiler,
+        "report_fields": report_fields,
+        "start": now,
+        "marks": {threading.main_thread().ident: now},
+        "stages": [],
+    }
+    atexit.register(_finish_profile)
+
+
+def profile_step(name: str, items: Optional[int] = None) -> None:
+    """Record the step that just finished (no-op when not profiling)."""
+    if _profile is None:
+        return
+    wall, cpu = time.perf_counter(), time.process_time()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    thread = threading.current_thread()
+    start_wall, start_cpu = _profile["marks"].get(thread.ident, _profile["start"])
+    stage = {
+        "name": name,
+        "wall_s": round(wall - start_wall, 6),
+        "cpu_s": round(cpu - start_cpu, 6),
+        "peak_alloc_bytes": peak,
+    }
+    if resource is not None:
+        stage["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if items is not None:
+        stage["items"] = items
+    if thread is not threading.main_thread():
+        stage["thread"] = thread.name
+    _profile["stages"].append(stage)
+    _profile["marks"][thread.ident] = (time.perf_counter(), time.process_time())
+
+
+def profile_restart() -> None:
+    """Start timing the calling thread's next step from now, recording nothing."""
+    if _profile is not None:
+        _profile["marks"][threading.get_ident()] = (time.perf_counter(), time.process_time())
+
+
+def _finish_profile() -> None:
+    """Write the JSON stage report (and cProfile dump) and print a summary table."""
+    global _profile
+    if _profile is None:
+        return
+    profile, _profile = _profile, None
+    if profile["profiler"] is not None:
+        profile["profiler"].disable()
+        profile["cprofile_path"].parent.mkdir(parents=True, exist_ok=True)
+        profile["profiler"].dump_stats(str(profile["cprofile_path"]))
+    tracemalloc.stop()
+
+    start_wall, start_cpu = profile["start"]
+    report = {
+        "tool": profile["tool"],
+        "argv": sys.argv[1:],
+        "python": platform.python_version(),
+        "total": {
+            "wall_s": round(time.perf_counter() - start_wall, 6),
+            "cpu_s": round(time.process_time() - start_cpu, 6),
+        },
+        "stages": profile["stages"],
+    }
+    if profile["report_fields"] is not None:
+        report.update(profile["report_fields"]())
+    path = profile["report_path"]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    print()
+    print(f"Profile ({profile['tool']}; CPU time covers this process only):")
+    print(f"  {'stage':<36}{'wall':>9}{'cpu':>9}{'peak alloc':>12}{'items':>8}")
+    for stage in profile["stages"]:
+        items = stage.get("items", "")
+        name = f"{stage['thread']}: {stage['name']}" if "thread" in stage else stage["name"]
+        print(
+            f"  {name:<36}{stage['wall_s']:>8.3f}s{stage['cpu_s']:>8.3f}s"
+            f"{stage['peak_alloc_bytes'] / 1e6:>9.1f} MB{items:>8}"
+        )
+    print(f"  {'total':<36}{report['total']['wall_s']:>8.3f}s{report['total']['cpu_s']:>8.3f}s")
+    print(f"Saved profile report: {path}")
+    if profile["cprofile_path"] is not None:
+        print(f"Saved cProfile dump: {profile['cprofile_path']}")
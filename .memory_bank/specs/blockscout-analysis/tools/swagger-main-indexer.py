@@ -5,21 +5,59 @@ Swagger Main Indexer for Blockscout API.
 Discovers the latest Blockscout release, downloads all swagger variants from
 the blockscout/swaggers repo, and builds a JSON endpoint index across all variants.
 
+Instead of one GitHub request per variant, --tarball fetches the swaggers
+repository as a single archive and --mirror reads a local checkout of it.
+
+Re-runs are incremental: a manifest records the indexed version and the
+SHA-256 of every variant's swagger, so an unchanged release is skipped
+without parsing any YAML and only changed variants are re-indexed.
+
 Usage:
-    python swagger-main-indexer.py
+    python swagger-main-indexer.py [--jobs N] [--version V] [--force]
+                                   [--tarball | --mirror PATH | --offline]
+                                   [--profile [REPORT]] [--cprofile PSTATS]
 
 Output:
-    blockscout-analysis/.build/swaggers/main-indexer/endpoints_map.json
+    blockscout-analysis/.build/swaggers/main-indexer/endpoints_map.jsonl
+    blockscout-analysis/.build/swaggers/main-indexer/endpoints_map.json (legacy array)
+    blockscout-analysis/.build/swaggers/main-indexer/manifest.json
 """
 
-import json
+import argparse
+import os
 import sys
+import tarfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional
 
 import requests
 
-from common import HTTP_METHODS, _get, find_line_ranges, index_swagger_file
+from common import (
+    BUILD_DIR,
+    HTTP_METHODS,
+    _get,
+    add_profile_arguments,
+    append_endpoint_records,
+    commit_endpoint_map,
+    endpoint_map_jsonl_path,
+    file_sha256,
+    find_line_ranges,
+    index_swagger_file,
+    iter_endpoint_map,
+    latest_version_dir,
+    load_manifest,
+    open_endpoint_map,
+    parse_cache_stats,
+    print_parse_cache_stats,
+    process_pool,
+    profile_step,
+    save_manifest,
+    start_profile,
+    write_endpoint_records,
+)
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -28,9 +66,19 @@ from common import HTTP_METHODS, _get, find_line_ranges, index_swagger_file
 RELEASES_URL = "https://api.github.com/repos/blockscout/blockscout/releases"
 SWAGGERS_CONTENTS_URL = "https://api.github.com/repos/blockscout/swaggers/contents/blockscout/{version}"
 SWAGGER_RAW_URL = "https://raw.githubusercontent.com/blockscout/swaggers/master/blockscout/{version}/{variant}/swagger.yaml"
+# Whole-repository archive; codeload is not counted against the API rate limit.
+SWAGGERS_TARBALL_URL = "https://codeload.github.com/blockscout/swaggers/tar.gz/refs/heads/master"
 
-OUTPUT_DIR = Path("blockscout-analysis/.build/swaggers/main-indexer")
+OUTPUT_DIR = BUILD_DIR / "swaggers" / "main-indexer"
 ENDPOINTS_MAP_PATH = OUTPUT_DIR / "endpoints_map.json"
+MANIFEST_PATH = OUTPUT_DIR / "manifest.json"
+# Per-variant index, reused when the variant's swagger hash is unchanged.
+VARIANT_RECORDS_NAME = "endpoints.jsonl"
+
+# Default for --jobs: downloads are I/O-bound, indexing is CPU-bound YAML parsing.
+DEFAULT_JOBS = min(8, os.cpu_count() or 1)
+
+_print_lock = threading.Lock()
 
 
 # ---------------------------------------------------------------------------
@@ -69,8 +117,11 @@ def discover_variants(version: str) -> list[str]:
 
     entries = response.json()
     dirs = [e["name"] for e in entries if e.get("type") == "dir"]
+    return _order_variants(dirs)
+
 
-    # Put 'default' first
+def _order_variants(dirs: list[str]) -> list[str]:
+    """Move 'default' to the front of the variant names and print them."""
     if "default" in dirs:
         dirs.remove("default")
         dirs.insert(0, "default")
@@ -80,81 +131,395 @@ def discover_variants(version: str) -> list[str]:
     return dirs
 
 
+# ---------------------------------------------------------------------------
+# Archive and mirror sources
+# ---------------------------------------------------------------------------
+
+def _store_swagger(variant: str, content: Optional[bytes]) -> None:
+    """Save a variant's swagger.yaml, or drop a stale copy when the variant has none."""
+    dest = OUTPUT_DIR / variant / "swagger.yaml"
+    if content is None:
+        dest.unlink(missing_ok=True)
+        return
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.write_bytes(content)
+
+
+def extract_tarball_variants(version: str) -> list[str]:
+    """
+    Fetch the swaggers repository as one tar.gz and extract every
+    blockscout/{version}/{variant}/swagger.yaml in a single streaming pass.
+    Returns the ordered variant names (Step 2 + Step 3 in one request).
+    """
+    print("Fetching blockscout/swaggers tarball ...", end=" ", flush=True)
+    response = _get(SWAGGERS_TARBALL_URL, stream=True)
+    if not response.ok:
+        print()
+        print(f"Error: HTTP {response.status_code} fetching {SWAGGERS_TARBALL_URL}.")
+        sys.exit(1)
+
+    found: dict[str, Optional[bytes]] = {}
+    response.raw.decode_content = True  # undo any transport compression only
+    try:
+        with tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+            # Members look like "swaggers-master/blockscout/{version}/{variant}/swagger.yaml".
+            for member in archive:
+                parts = member.name.split("/")
+                if len(parts) < 4 or parts[1:3] != ["blockscout", version]:
+                    continue
+                if len(parts) == 4 and member.isdir():
+                    found.setdefault(parts[3], None)
+                elif len(parts) == 5 and parts[4] == "swagger.yaml" and member.isfile():
+                    found[parts[3]] = archive.extractfile(member).read()
+    except (tarfile.TarError, requests.RequestException, OSError) as exc:
+        print()
+        print(f"Error: could not read swaggers tarball: {exc}")
+        sys.exit(1)
+    finally:
+        response.close()
+    print("done")
+
+    if not found:
+        print(f"Error: swagger folder for version {version} not found in blockscout/swaggers.")
+        sys.exit(1)
+    for variant, content in found.items():
+        _store_swagger(variant, content)
+    return _order_variants(sorted(found))
+
+
+def copy_mirror_variants(mirror: Path, version: str) -> list[str]:
+    """Copy blockscout/{version}/*/swagger.yaml from a local swaggers checkout; return variant names."""
+    version_dir = mirror / "blockscout" / version
+    if not version_dir.is_dir():
+        print(f"Error: swagger folder for version {version} not found in mirror {mirror}.")
+        sys.exit(1)
+
+    variants = sorted(entry.name for entry in version_dir.iterdir() if entry.is_dir())
+    for variant in variants:
+        source = version_dir / variant / "swagger.yaml"
+        _store_swagger(variant, source.read_bytes() if source.is_file() else None)
+    print(f"Read blockscout/{version} from mirror {mirror}")
+    return _order_variants(variants)
+
+
 # ---------------------------------------------------------------------------
 # Download
 # ---------------------------------------------------------------------------
 
+def _log(message: str) -> None:
+    """Print one progress line; downloads run on several threads."""
+    with _print_lock:
+        print(message)
+
+
 def download_swagger(version: str, variant: str, index: int, total: int) -> Optional[Path]:
     """Download swagger.yaml for a variant. Returns the saved path, or None on failure."""
     url = SWAGGER_RAW_URL.format(version=version, variant=variant)
-    response = _get(url)
+    dest = OUTPUT_DIR / variant / "swagger.yaml"
+    response = _get(url, cached=dest)
+    if response.status_code == 304:
+        _log(f"[{index}/{total}] Downloading {variant}/swagger.yaml ... not modified")
+        return dest
     if response.status_code == 404:
-        print(f"[{index}/{total}] Warning: no swagger.yaml found for variant '{variant}', skipping.")
+        _log(f"[{index}/{total}] Warning: no swagger.yaml found for variant '{variant}', skipping.")
         return None
     if not response.ok:
-        print(f"[{index}/{total}] Warning: HTTP {response.status_code} fetching {url}, skipping.")
+        _log(f"[{index}/{total}] Warning: HTTP {response.status_code} fetching {url}, skipping.")
         return None
 
-    dest = OUTPUT_DIR / variant / "swagger.yaml"
     dest.parent.mkdir(parents=True, exist_ok=True)
     dest.write_bytes(response.content)
-    print(f"[{index}/{total}] Downloading {variant}/swagger.yaml ... done")
+    _log(f"[{index}/{total}] Downloading {variant}/swagger.yaml ... done")
     return dest
 
 
-def save_map(endpoint_map: list[dict]) -> None:
-    ENDPOINTS_MAP_PATH.parent.mkdir(parents=True, exist_ok=True)
-    ENDPOINTS_MAP_PATH.write_text(
-        json.dumps(endpoint_map, indent=2, ensure_ascii=False),
-        encoding="utf-8",
-    )
+def _download_timed(version: str, variant: str, index: int, total: int) -> tuple[Optional[Path], float]:
+    """Thread-pool worker: download one variant; return (path or None, seconds)."""
+    start = time.perf_counter()
+    swagger_path = download_swagger(version, variant, index, total)
+    return swagger_path, time.perf_counter() - start
+
+
+def _use_local_swagger(version: str, variant: str, index: int, total: int) -> tuple[Optional[Path], float]:
+    """Counterpart of _download_timed for --offline/--tarball/--mirror: use the swagger already on disk."""
+    dest = OUTPUT_DIR / variant / "swagger.yaml"
+    if not dest.exists():
+        _log(f"[{index}/{total}] Warning: no local {variant}/swagger.yaml, skipping.")
+        return None, 0.0
+    _log(f"[{index}/{total}] Using local {variant}/swagger.yaml")
+    return dest, 0.0
+
+
+def _index_variant(swagger_path: Path, variant: str) -> tuple[list[dict], dict[str, int], float]:
+    """
+    Process-pool worker: index one variant's swagger.
+
+    Returns (records, parse cache counts from this call, seconds). The counts
+    are returned because the worker's parse_cache_stats live in its own process.
+    """
+    before = dict(parse_cache_stats)
+    start = time.perf_counter()
+    records = index_swagger_file(swagger_path, f"{variant}/swagger.yaml")
+    seconds = time.perf_counter() - start
+    counts = {counter: parse_cache_stats[counter] - before[counter] for counter in before}
+    return records, counts, seconds
+
+
+# ---------------------------------------------------------------------------
+# Manifest
+# ---------------------------------------------------------------------------
+
+def is_up_to_date(manifest: dict, version: str, variants: list[str]) -> bool:
+    """
+    True when the manifest already describes `version` with the same variant
+    list, and every recorded
+    swagger file, per-variant index and the merged map are still on disk
+    with matching hashes. Checking this needs no YAML parsing.
+    """
+    if manifest.get("version") != version or manifest.get("variants") != variants:
+        return False
+    if "files" not in manifest:
+        return False
+    if not (ENDPOINTS_MAP_PATH.exists() and endpoint_map_jsonl_path(ENDPOINTS_MAP_PATH).exists()):
+        return False
+    for variant, entry in manifest["files"].items():
+        swagger_path = OUTPUT_DIR / variant / "swagger.yaml"
+        if not (swagger_path.exists() and (OUTPUT_DIR / variant / VARIANT_RECORDS_NAME).exists()):
+            return False
+        if file_sha256(swagger_path) != entry.get("sha256"):
+            return False
+    return True
 
 
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
-def main() -> None:
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command-line parser (also used by api-pipeline.py)."""
+    parser = argparse.ArgumentParser(
+        description="Index every swagger variant of the latest Blockscout release."
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Concurrent downloads / indexing processes (default: {DEFAULT_JOBS})",
+    )
+    parser.add_argument(
+        "--version",
+        help="Index this Blockscout version instead of the latest release",
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--tarball",
+        action="store_true",
+        help="Fetch all variants in one tar.gz of the swaggers repository instead of per-file requests",
+    )
+    source.add_argument(
+        "--mirror",
+        type=Path,
+        metavar="PATH",
+        help="Read swaggers from a local blockscout/swaggers checkout; without --version, "
+             "its newest blockscout/ version is used and no network access is needed",
+    )
+    source.add_argument(
+        "--offline",
+        action="store_true",
+        help="Rebuild from the version, variants and swagger files pinned in manifest.json; no network access",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-index every variant even if its swagger hash is unchanged",
+    )
+    add_profile_arguments(parser, "swagger-main-indexer")
+    return parser
+
+
+def run(args: argparse.Namespace) -> list[dict]:
+    """
+    Index the release described by `args` and write the endpoint map.
+
+    Returns the map records (as written, with their `variants` bitmask), so
+    api-pipeline.py can hand them to the generator without re-reading the map.
+    """
+    jobs = max(1, args.jobs)
+    manifest = load_manifest(MANIFEST_PATH)
+    manifest_files: dict[str, dict] = manifest.get("files", {})
+
     print()
 
-    # Step 1: Discover release
-    version = discover_latest_version()
+    if args.offline:
+        # Steps 1 & 2 come from the manifest instead of GitHub.
+        if "version" not in manifest:
+            print(f"Error: --offline needs {MANIFEST_PATH} from a previous online run.")
+            sys.exit(1)
+        version = manifest["version"]
+        if args.version and args.version != version:
+            print(f"Error: manifest pins version {version}, not {args.version}.")
+            sys.exit(1)
+        variants = manifest["variants"]
+        print(f"Offline rebuild of pinned Blockscout release: {version}")
+        print(f"Using {len(variants)} swagger variants from manifest: {', '.join(variants)}")
+        profile_step("1-2. Read manifest", items=len(variants))
+    else:
+        # Step 1: Discover release (or take the pinned one)
+        if args.version:
+            version = args.version
+            print(f"Using pinned Blockscout release: {version}")
+        elif args.mirror:
+            version = latest_version_dir(args.mirror / "blockscout")
+            if version is None:
+                print(f"Error: no blockscout/<version> folder found in mirror {args.mirror}.")
+                sys.exit(1)
+            print(f"Latest Blockscout version in mirror: {version}")
+        else:
+            version = discover_latest_version()
+        profile_step("1. Discover release")
+
+        # Step 2: Discover variants. The archive sources also place every
+        # swagger.yaml on disk here, so Step 3 only picks up local files.
+        if args.mirror:
+            variants = copy_mirror_variants(args.mirror, version)
+        elif args.tarball:
+            variants = extract_tarball_variants(version)
+        else:
+            variants = discover_variants(version)
+        profile_step("2. Discover variants", items=len(variants))
+
+    up_to_date = not args.force and is_up_to_date(manifest, version, variants)
+    profile_step("Check manifest")
+    if up_to_date:
+        print(f"Index for {version} is up to date ({MANIFEST_PATH}); nothing to do.")
+        return list(iter_endpoint_map(endpoint_map_jsonl_path(ENDPOINTS_MAP_PATH)))
 
-    # Step 2: Discover variants
-    variants = discover_variants(version)
     total = len(variants)
     print()
 
-    endpoint_map: list[dict] = []
-    # Set of (endpoint, method) already in the map — for dedup
-    seen: set[tuple[str, str]] = set()
-
-    for idx, variant in enumerate(variants, start=1):
-        # Step 3: Download
-        swagger_path = download_swagger(version, variant, idx, total)
-        if swagger_path is None:
-            continue
-
-        # Steps 4 & 5: Index
-        records = index_swagger_file(swagger_path, f"{variant}/swagger.yaml")
-        new_count = 0
-        for rec in records:
-            key = (rec["endpoint"], rec["method"])
-            if key not in seen:
-                seen.add(key)
-                endpoint_map.append(rec)
-                new_count += 1
-
-        save_map(endpoint_map)
-
-        if variant == "default":
-            print(f"[{idx}/{total}] Indexing {variant}: {new_count} endpoints added ({len(endpoint_map)} total)")
-        else:
-            print(f"[{idx}/{total}] Indexing {variant}: {new_count} new endpoints ({len(endpoint_map)} total)")
-        print(f"        Saved endpoints_map.json")
-        print()
+    # One record per (endpoint, method), in first-seen order, plus the
+    # variant-membership bitmask of each key (bit i = variants[i]).
+    merged: dict[tuple[str, str], dict] = {}
+    membership: dict[tuple[str, str], int] = {}
+
+    # Download threads are named after the calling thread, so api-pipeline.py
+    # can attribute their progress lines to the main-indexer stage.
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix=threading.current_thread().name) as downloads, \
+            process_pool(jobs, __file__) as indexers:
+        # Step 3: Download all variants concurrently; each finished download is
+        # handed to the process pool for indexing straight away.
+        # Variants whose swagger hash matches the manifest reuse their stored
+        # per-variant index instead of being parsed again, and a swagger whose
+        # bytes are identical to another variant's is parsed only once.
+        local = args.offline or args.tarball or args.mirror is not None
+        fetch = _use_local_swagger if local else _download_timed
+        download_futures = {
+            downloads.submit(fetch, version, variant, idx, total): variant
+            for idx, variant in enumerate(variants, start=1)
+        }
+        downloaded: dict[str, tuple[Optional[Path], float]] = {}
+        hashes: dict[str, str] = {}
+        index_futures: dict[str, Future] = {}
+        parsed_as: dict[str, str] = {}  # variant -> variant whose identical swagger is parsed
+        first_by_hash: dict[str, str] = {}
+        for future in as_completed(download_futures):
+            variant = download_futures[future]
+            swagger_path, seconds = future.result()
+            downloaded[variant] = (swagger_path, seconds)
+            if swagger_path is None:
+                continue
+            sha = hashes[variant] = file_sha256(swagger_path)
+            unchanged = (
+                not args.force
+                and manifest_files.get(variant, {}).get("sha256") == sha
+                and (swagger_path.parent / VARIANT_RECORDS_NAME).exists()
+            )
+            if unchanged:
+                continue
+            if sha in first_by_hash:
+                parsed_as[variant] = first_by_hash[sha]
+            else:
+                first_by_hash[sha] = variant
+                index_futures[variant] = indexers.submit(_index_variant, swagger_path, variant)
+        profile_step("3. Download and hash swaggers", items=len(hashes))
+
+        # Steps 4 & 5: Merge in variant order ('default' first, then listed
+        # order) so first-seen precedence matches a sequential run exactly.
+        # Unchanged variants still take part, so dedup is never affected.
+        files: dict[str, dict] = {}
+        reindexed = 0
+        for idx, variant in enumerate(variants, start=1):
+            swagger_path, download_seconds = downloaded[variant]
+            if swagger_path is None:
+                continue
+
+            records_path = swagger_path.parent / VARIANT_RECORDS_NAME
+            if variant in index_futures:
+                records, cache_counts, index_seconds = index_futures[variant].result()
+                for counter, count in cache_counts.items():
+                    parse_cache_stats[counter] += count
+                write_endpoint_records(records_path, records)
+                index_note = f"index {index_seconds:.2f}s"
+                reindexed += 1
+            elif variant in parsed_as:
+                source = parsed_as[variant]
+                swagger_file = f"{variant}/swagger.yaml"
+                records = [
+                    {**rec, "swagger_file": swagger_file}
+                    for rec in index_futures[source].result()[0]
+                ]
+                write_endpoint_records(records_path, records)
+                index_note = f"identical to {source}, parsed once"
+                reindexed += 1
+            else:
+                records = list(iter_endpoint_map(records_path))
+                index_note = "unchanged, reused stored index"
+            files[variant] = {"sha256": hashes[variant], "records": len(records)}
+
+            bit = 1 << (idx - 1)
+            new_count = 0
+            for rec in records:
+                key = (rec["endpoint"], rec["method"])
+                if key not in merged:
+                    merged[key] = rec
+                    new_count += 1
+                membership[key] = membership.get(key, 0) | bit
+            map_count = len(merged)
+
+            if variant == "default":
+                print(f"[{idx}/{total}] Indexing {variant}: {new_count} endpoints added ({map_count} total)")
+            else:
+                print(f"[{idx}/{total}] Indexing {variant}: {new_count} new endpoints ({map_count} total)")
+            print(f"        Download {download_seconds:.2f}s, {index_note}")
+            print()
+        profile_step("4-5. Index and merge variants", items=len(merged))
+
+    # Step 6: Write the map once membership is complete: a header line with
+    # the variant table, then one record per (endpoint, method) with its
+    # bitmask. Rename the JSONL map into place and write the legacy JSON array.
+    map_count = len(merged)
+    map_records = [{**rec, "variants": membership[key]} for key, rec in merged.items()]
+    map_file = open_endpoint_map(ENDPOINTS_MAP_PATH, header={"variant_table": variants})
+    append_endpoint_records(map_file, map_records)
+    commit_endpoint_map(map_file, ENDPOINTS_MAP_PATH)
+    print("Saved endpoints_map.jsonl and endpoints_map.json")
+    profile_step("6. Write endpoint map", items=map_count)
+
+    # The manifest is written last, so an interrupted run is never taken as up to date.
+    save_manifest(MANIFEST_PATH, {"version": version, "variants": variants, "files": files})
+    print(f"Saved manifest.json ({reindexed} of {len(files)} variants re-indexed)")
+    print()
+    profile_step("7. Save manifest")
+
+    print_parse_cache_stats()
+    print(f"Complete. {map_count} total endpoints indexed across {total} variants.")
+    return map_records
 
-    print(f"Complete. {len(endpoint_map)} total endpoints indexed across {total} variants.")
+
+def main() -> None:
+    args = build_parser().parse_args()
+    start_profile("swagger-main-indexer", args.profile, args.cprofile)
+    run(args)
 
 
 if __name__ == "__main__":
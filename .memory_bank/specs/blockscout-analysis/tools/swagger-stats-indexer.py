@@ -5,18 +5,41 @@ Swagger Stats Indexer for Blockscout Stats service.
 Discovers the latest Stats service release, downloads the Stats swagger file
 from the blockscout/swaggers repo, and builds a JSON endpoint index.
 
+A manifest records the indexed version and the swagger's SHA-256, so a re-run
+against an unchanged release exits without parsing any YAML.
+
 Usage:
-    python swagger-stats-indexer.py
+    python swagger-stats-indexer.py [--version V] [--force] [--mirror PATH | --offline]
+                                    [--profile [REPORT]] [--cprofile PSTATS]
 
 Output:
-    blockscout-analysis/.build/swaggers/stats-service/endpoints_map.json
+    blockscout-analysis/.build/swaggers/stats-service/endpoints_map.jsonl
+    blockscout-analysis/.build/swaggers/stats-service/endpoints_map.json (legacy array)
+    blockscout-analysis/.build/swaggers/stats-service/manifest.json
 """
 
-import json
+import argparse
 import sys
 from pathlib import Path
 
-from common import _get, index_swagger_file
+from common import (
+    BUILD_DIR,
+    _get,
+    add_profile_arguments,
+    append_endpoint_records,
+    commit_endpoint_map,
+    endpoint_map_jsonl_path,
+    file_sha256,
+    index_swagger_file,
+    iter_endpoint_map,
+    latest_version_dir,
+    load_manifest,
+    open_endpoint_map,
+    print_parse_cache_stats,
+    profile_step,
+    save_manifest,
+    start_profile,
+)
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -28,9 +51,10 @@ SWAGGER_RAW_URL = (
     "/services/stats/{version}/swagger.yaml"
 )
 
-OUTPUT_DIR = Path("blockscout-analysis/.build/swaggers/stats-service")
+OUTPUT_DIR = BUILD_DIR / "swaggers" / "stats-service"
 SWAGGER_PATH = OUTPUT_DIR / "swagger.yaml"
 ENDPOINTS_MAP_PATH = OUTPUT_DIR / "endpoints_map.json"
+MANIFEST_PATH = OUTPUT_DIR / "manifest.json"
 
 
 # ---------------------------------------------------------------------------
@@ -69,8 +93,11 @@ def download_swagger(version: str) -> None:
     """Download swagger.yaml for the given Stats version and save to OUTPUT_DIR."""
     url = SWAGGER_RAW_URL.format(version=version)
     print("Downloading swagger.yaml ...", end=" ", flush=True)
-    response = _get(url)
+    response = _get(url, cached=SWAGGER_PATH)
 
+    if response.status_code == 304:
+        print("not modified")
+        return
     if response.status_code == 404:
         print()
         print(f"Error: swagger.yaml for Stats version {version} not found (HTTP 404).")
@@ -85,41 +112,134 @@ def download_swagger(version: str) -> None:
     print("done")
 
 
+def copy_mirror_swagger(mirror: Path, version: str) -> None:
+    """Copy services/stats/{version}/swagger.yaml from a local swaggers checkout."""
+    source = mirror / "services" / "stats" / version / "swagger.yaml"
+    if not source.is_file():
+        print(f"Error: swagger.yaml for Stats version {version} not found in mirror {mirror}.")
+        sys.exit(1)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    SWAGGER_PATH.write_bytes(source.read_bytes())
+    print(f"Read services/stats/{version}/swagger.yaml from mirror {mirror}")
+
+
 # ---------------------------------------------------------------------------
-# Save
+# Manifest
 # ---------------------------------------------------------------------------
 
-def save_map(endpoint_map: list[dict]) -> None:
-    """Write endpoint_map as indented JSON to ENDPOINTS_MAP_PATH."""
-    ENDPOINTS_MAP_PATH.parent.mkdir(parents=True, exist_ok=True)
-    ENDPOINTS_MAP_PATH.write_text(
-        json.dumps(endpoint_map, indent=2, ensure_ascii=False),
-        encoding="utf-8",
-    )
+def is_up_to_date(manifest: dict, version: str) -> bool:
+    """True when the manifest describes `version` and the swagger and maps on disk match it."""
+    if manifest.get("version") != version:
+        return False
+    if not all(p.exists() for p in (SWAGGER_PATH, ENDPOINTS_MAP_PATH, endpoint_map_jsonl_path(ENDPOINTS_MAP_PATH))):
+        return False
+    return file_sha256(SWAGGER_PATH) == manifest.get("sha256")
 
 
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
-def main() -> None:
-    # Step 1: Discover latest Stats release version
-    version = discover_latest_stats_version()
-
-    # Step 2: Download swagger.yaml
-    download_swagger(version)
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command-line parser (also used by api-pipeline.py)."""
+    parser = argparse.ArgumentParser(
+        description="Index the swagger of the latest Blockscout Stats service release."
+    )
+    parser.add_argument(
+        "--version",
+        help="Index this Stats version instead of the latest release",
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--mirror",
+        type=Path,
+        metavar="PATH",
+        help="Read the swagger from a local blockscout/swaggers checkout; without --version, "
+             "its newest services/stats/ version is used and no network access is needed",
+    )
+    source.add_argument(
+        "--offline",
+        action="store_true",
+        help="Rebuild from the version and swagger file pinned in manifest.json; no network access",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-index even if the swagger hash is unchanged",
+    )
+    add_profile_arguments(parser, "swagger-stats-indexer")
+    return parser
+
+
+def run(args: argparse.Namespace) -> list[dict]:
+    """Index the Stats release described by `args`; returns the map records."""
+    manifest = load_manifest(MANIFEST_PATH)
+
+    if args.offline:
+        # Steps 1 & 2 come from the manifest and the local swagger copy.
+        if "version" not in manifest or not SWAGGER_PATH.exists():
+            print(f"Error: --offline needs {MANIFEST_PATH} and {SWAGGER_PATH} from a previous online run.")
+            sys.exit(1)
+        version = manifest["version"]
+        if args.version and args.version != version:
+            print(f"Error: manifest pins version {version}, not {args.version}.")
+            sys.exit(1)
+        print(f"Offline rebuild of pinned Stats release: {version}")
+        profile_step("1-2. Read manifest")
+    else:
+        # Step 1: Discover latest Stats release version (or take the pinned one)
+        if args.version:
+            version = args.version
+            print(f"Using pinned Stats release: {version}")
+        elif args.mirror:
+            version = latest_version_dir(args.mirror / "services" / "stats")
+            if version is None:
+                print(f"Error: no services/stats/<version> folder found in mirror {args.mirror}.")
+                sys.exit(1)
+            print(f"Latest Stats version in mirror: {version}")
+        else:
+            version = discover_latest_stats_version()
+        profile_step("1. Discover release")
+
+        # Step 2: Download swagger.yaml (or copy it from the mirror)
+        if args.mirror:
+            copy_mirror_swagger(args.mirror, version)
+        else:
+            download_swagger(version)
+        profile_step("2. Download swagger")
     print()
 
+    up_to_date = not args.force and is_up_to_date(manifest, version)
+    profile_step("Check manifest")
+    if up_to_date:
+        print(f"Index for {version} is up to date ({MANIFEST_PATH}); nothing to do.")
+        return list(iter_endpoint_map(endpoint_map_jsonl_path(ENDPOINTS_MAP_PATH)))
+
     # Step 3: Index endpoints
     records = index_swagger_file(SWAGGER_PATH, "swagger.yaml", fatal_on_error=True)
     count = len(records)
     print(f"Indexing endpoints: {count} endpoints indexed")
-
-    # Step 4: Save
-    save_map(records)
-    print("Saved endpoints_map.json")
+    profile_step("3. Index endpoints", items=count)
+
+    # Step 4: Save (JSONL map plus the legacy JSON array)
+    map_file = open_endpoint_map(ENDPOINTS_MAP_PATH)
+    append_endpoint_records(map_file, records)
+    commit_endpoint_map(map_file, ENDPOINTS_MAP_PATH)
+    print("Saved endpoints_map.jsonl and endpoints_map.json")
+    # Written last, so an interrupted run is never taken as up to date.
+    save_manifest(MANIFEST_PATH, {"version": version, "sha256": file_sha256(SWAGGER_PATH), "records": count})
+    print("Saved manifest.json")
+    profile_step("4. Save maps and manifest", items=count)
     print()
+    print_parse_cache_stats()
     print(f"Complete. {count} endpoints indexed.")
+    return records
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    start_profile("swagger-stats-indexer", args.profile, args.cprofile)
+    run(args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Tests for the HTTP layer of common.py (_get) against a local http.server
+stand-in: retries and backoff on 5xx, rate-limit waits, conditional GETs with
+the persisted validator store, and exhausted connection retries.
+
+Usage (from repo root):
+    python -m unittest discover -s .memory_bank/specs/blockscout-analysis/tools/tests
+"""
+
+import io
+import json
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent
+
+# Add the tools directory to sys.path for local imports.
+sys.path.insert(0, str(TOOLS_DIR))
+
+import requests  # noqa: E402
+
+import common  # noqa: E402
+
+main_indexer = common.load_tool("swagger-main-indexer.py", TOOLS_DIR)
+
+
+# ---------------------------------------------------------------------------
+# Local stand-in server
+# ---------------------------------------------------------------------------
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answers each GET with the next scripted (status, headers, body); 200 once the script is used up."""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append({"path": self.path, "headers": dict(self.headers)})
+            status, headers, body = server.script.pop(0) if server.script else (200, {}, b"ok")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInTestCase(unittest.TestCase):
+    """
+    Runs a stand-in server per test. Sleeps and backoff jitter are recorded
+    instead of taken (jitter returns its upper bound), the validator store
+    lives in a temporary directory and console output is swallowed.
+    """
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.script = []
+        thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.validators_path = self.tmp / ".build" / "http-validators.json"
+
+        self.sleeps: list[float] = []
+        self.jitter_bounds: list[tuple[float, float]] = []
+
+        def uniform(low, high):
+            self.jitter_bounds.append((low, high))
+            return high
+
+        for patcher in (
+            mock.patch.object(common, "HTTP_VALIDATORS_PATH", self.validators_path),
+            mock.patch.object(common, "_validators", None),
+            mock.patch.object(common.time, "sleep", self.sleeps.append),
+            mock.patch.object(common.random, "uniform", uniform),
+            mock.patch("sys.stdout", io.StringIO()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def respond(self, *responses):
+        """Queue (status, headers, body) responses for the next requests."""
+        self.server.script.extend(responses)
+
+    @property
+    def request_headers(self) -> list[dict]:
+        return [request["headers"] for request in self.server.requests]
+
+
+# ---------------------------------------------------------------------------
+# Retries and backoff
+# ---------------------------------------------------------------------------
+
+class RetryTest(StandInTestCase):
+    def test_5xx_is_retried_with_exponential_backoff(self):
+        self.respond((503, {}, b""), (502, {}, b""), (500, {}, b""))
+        response = common._get(self.url + "/file")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.server.requests), 4)
+        expected = [min(common.HTTP_BACKOFF_MAX, common.HTTP_BACKOFF_BASE * 2 ** n) for n in range(3)]
+        self.assertEqual(self.jitter_bounds, [(0, bound) for bound in expected])
+        self.assertEqual(self.sleeps, expected)
+
+    def test_backoff_is_capped(self):
+        with mock.patch.object(common, "HTTP_BACKOFF_MAX", 3.0):
+            self.respond(*[(503, {}, b"")] * 4)
+            common._get(self.url + "/file")
+        self.assertEqual(self.sleeps, [1.0, 2.0, 3.0, 3.0])
+
+    def test_5xx_after_last_retry_is_returned(self):
+        self.respond(*[(503, {}, b"")] * (common.HTTP_MAX_RETRIES + 1))
+        response = common._get(self.url + "/file")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(self.server.requests), common.HTTP_MAX_RETRIES + 1)
+        self.assertEqual(len(self.sleeps), common.HTTP_MAX_RETRIES)
+
+    def test_4xx_is_not_retried(self):
+        self.respond((404, {}, b""))
+        response = common._get(self.url + "/missing")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(self.sleeps, [])
+
+
+# ---------------------------------------------------------------------------
+# Rate limits
+# ---------------------------------------------------------------------------
+
+class RateLimitTest(StandInTestCase):
+    def test_rate_limit_reset_is_waited_out(self):
+        reset = int(time.time()) + 10
+        self.respond((403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)}, b""))
+        response = common._get(self.url + "/releases")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(len(self.sleeps), 1)
+        self.assertAlmostEqual(self.sleeps[0], reset - time.time() + 1, delta=2)
+
+    def test_retry_after_is_waited_out(self):
+        self.respond((429, {"Retry-After": "7"}, b""))
+        response = common._get(self.url + "/releases")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.sleeps, [7.0])
+
+    def test_rate_limit_waits_do_not_use_up_retries(self):
+        self.respond(*[(429, {"Retry-After": "1"}, b"")] * (common.HTTP_MAX_RETRIES + 2))
+        response = common._get(self.url + "/releases")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.sleeps, [1.0] * (common.HTTP_MAX_RETRIES + 2))
+
+    def test_wait_beyond_limit_returns_response(self):
+        reset = int(time.time()) + common.HTTP_RATE_LIMIT_MAX_WAIT + 60
+        self.respond((403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)}, b""))
+        response = common._get(self.url + "/releases")
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.sleeps, [])
+
+    def test_plain_403_is_not_a_rate_limit(self):
+        self.respond((403, {"X-RateLimit-Remaining": "12"}, b""))
+        response = common._get(self.url + "/releases")
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(len(self.server.requests), 1)
+
+
+# ---------------------------------------------------------------------------
+# Conditional GETs and the validator store
+# ---------------------------------------------------------------------------
+
+ETAG = '"abc123"'
+LAST_MODIFIED = "Wed, 01 Oct 2025 12:00:00 GMT"
+
+
+class ConditionalGetTest(StandInTestCase):
+    def test_validators_are_persisted_and_sent(self):
+        cached = self.tmp / "swagger.yaml"
+        self.respond((200, {"ETag": ETAG, "Last-Modified": LAST_MODIFIED}, b"v1"))
+        response = common._get(self.url + "/swagger.yaml", cached=cached)
+        self.assertEqual(response.content, b"v1")
+        self.assertNotIn("If-None-Match", self.request_headers[0])
+
+        stored = json.loads(self.validators_path.read_text(encoding="utf-8"))
+        self.assertEqual(stored, {self.url + "/swagger.yaml": {"etag": ETAG, "last_modified": LAST_MODIFIED}})
+
+        cached.write_bytes(b"v1")
+        self.respond((304, {}, b""))
+        response = common._get(self.url + "/swagger.yaml", cached=cached)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.request_headers[1].get("If-None-Match"), ETAG)
+        self.assertEqual(self.request_headers[1].get("If-Modified-Since"), LAST_MODIFIED)
+
+    def test_validator_store_survives_a_new_run(self):
+        cached = self.tmp / "swagger.yaml"
+        self.respond((200, {"ETag": ETAG}, b"v1"))
+        common._get(self.url + "/swagger.yaml", cached=cached)
+        cached.write_bytes(b"v1")
+
+        # A new process starts with no in-memory store and reads the file.
+        common._validators = None
+        common._get(self.url + "/swagger.yaml", cached=cached)
+        self.assertEqual(self.request_headers[1].get("If-None-Match"), ETAG)
+
+    def test_no_validators_without_local_copy(self):
+        self.respond((200, {"ETag": ETAG}, b"v1"))
+        common._get(self.url + "/swagger.yaml", cached=self.tmp / "swagger.yaml")
+        common._get(self.url + "/swagger.yaml", cached=self.tmp / "swagger.yaml")
+        self.assertNotIn("If-None-Match", self.request_headers[1])
+
+    def test_not_modified_keeps_local_file(self):
+        output_dir = self.tmp / "main-indexer"
+        dest = output_dir / "default" / "swagger.yaml"
+        url = self.url + "/{version}/{variant}/swagger.yaml"
+        with mock.patch.object(main_indexer, "SWAGGER_RAW_URL", url), \
+                mock.patch.object(main_indexer, "OUTPUT_DIR", output_dir):
+            self.respond((200, {"ETag": ETAG}, b"openapi: 3.0.0\n"))
+            self.assertEqual(main_indexer.download_swagger("9.0.0", "default", 1, 1), dest)
+            mtime = dest.stat().st_mtime_ns
+
+            self.respond((304, {}, b""))
+            self.assertEqual(main_indexer.download_swagger("9.0.0", "default", 1, 1), dest)
+        self.assertEqual(self.request_headers[1].get("If-None-Match"), ETAG)
+        self.assertEqual(dest.read_bytes(), b"openapi: 3.0.0\n")
+        self.assertEqual(dest.stat().st_mtime_ns, mtime)
+
+
+# ---------------------------------------------------------------------------
+# Connection errors
+# ---------------------------------------------------------------------------
+
+def _refused_url() -> str:
+    """URL of a local port nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/file"
+
+
+class ConnectionErrorTest(StandInTestCase):
+    def test_exits_after_last_retry(self):
+        with self.assertRaises(SystemExit) as raised:
+            common._get(_refused_url())
+        self.assertEqual(raised.exception.code, 1)
+        self.assertEqual(len(self.sleeps), common.HTTP_MAX_RETRIES)
+
+    def test_recovers_before_last_retry(self):
+        real_get = requests.Session.get
+        failures = iter([requests.ConnectionError("refused")] * common.HTTP_MAX_RETRIES)
+
+        def flaky_get(session, *args, **kwargs):
+            error = next(failures, None)
+            if error is not None:
+                raise error
+            return real_get(session, *args, **kwargs)
+
+        with mock.patch.object(requests.Session, "get", flaky_get):
+            response = common._get(self.url + "/file")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.sleeps), common.HTTP_MAX_RETRIES)
+
+
+if __name__ == "__main__":
+    unittest.main()
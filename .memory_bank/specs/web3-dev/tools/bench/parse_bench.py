@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Benchmark pro-api-indexer's streaming parser against json.loads.
+
+For each scale, writes a synthetic spec made of that many copies of the
+committed web3-dev/references/pro-api.json (paths and components renamed per
+copy) and extracts the endpoint tuples from it twice, each in a fresh child
+process:
+
+    loads    read the whole file, json.loads it, walk spec["paths"]
+    stream   pro-api-indexer.iter_operations over the open file
+
+Each child reports wall time (fastest of REPEATS runs), its peak RSS and the
+tracemalloc peak of one run. Both parsers must return the same endpoints;
+exit code 1 if they do not.
+
+It then locates every operation with iter_operations and times looking each
+one up through the offsets map: memory-map the spec and json.loads only the
+operation's slice, as web3-dev/scripts/pro-api-slice.py does. Standard
+library only.
+
+Usage (from repo root):
+    python .memory_bank/specs/web3-dev/tools/bench/parse_bench.py
+        [--scales 1,10] [--spec PATH] [--output PATH]
+
+Output:
+    web3-dev/.build/bench/pro-api-parse.json
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import mmap
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+try:
+    import resource  # Unix only; peak RSS is reported as null elsewhere
+except ImportError:
+    resource = None
+
+BENCH_DIR = Path(__file__).resolve().parent
+INDEXER_PATH = BENCH_DIR.parent / "pro-api-indexer.py"
+
+_spec = importlib.util.spec_from_file_location("pro_api_indexer", INDEXER_PATH)
+indexer = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(indexer)
+
+SPEC_PATH = indexer.PROJECT_ROOT / "web3-dev" / "references" / "pro-api.json"
+OUTPUT_PATH = indexer.PROJECT_ROOT / "web3-dev" / ".build" / "bench" / "pro-api-parse.json"
+
+REPEATS = 3
+
+
+def write_synthetic_spec(source: Path, scale: int, target: Path) -> int:
+    """
+    Write `scale` copies of the paths and components of `source` to `target`
+    (copy 0 unchanged, copy i under /bench{i} and with a Bench{i} suffix).
+    Returns the size of the file in bytes.
+    """
+    spec = json.loads(source.read_text(encoding="utf-8"))
+    paths = spec.get("paths", {})
+    components = spec.get("components", {})
+    spec["paths"] = {}
+    spec["components"] = {section: {} for section in components}
+    for i in range(scale):
+        prefix, suffix = (f"/bench{i}", f"Bench{i}") if i else ("", "")
+        for path, item in paths.items():
+            spec["paths"][prefix + path] = item
+        for section, members in components.items():
+            if isinstance(members, dict):
+                for name, value in members.items():
+                    spec["components"][section][name + suffix] = value
+    target.write_text(json.dumps(spec, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return target.stat().st_size
+
+
+def parse_loads(path: Path) -> list[tuple[str, str, str, str]]:
+    spec = json.loads(path.read_text(encoding="utf-8"))
+    return [entry[:4] for p, item in spec["paths"].items() for entry in indexer.operation_entries(p, item)]
+
+
+def parse_stream(path: Path) -> list[tuple[str, str, str, str]]:
+    with path.open(encoding="utf-8") as file:
+        return [entry[:4] for entry in indexer.iter_operations(file)]
+
+
+PARSERS = {"loads": parse_loads, "stream": parse_stream}
+
+
+def measure_lookups(path: Path) -> dict:
+    """Time single-operation lookups through the offsets map of the spec at `path`."""
+    locations: dict = {}
+    with path.open(encoding="utf-8", newline="") as file:
+        for _ in indexer.iter_operations(file, locations=locations):
+            pass
+    operations = [location for key, location in locations.items() if not key.startswith("#/")]
+    times = []
+    with path.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as spec:
+        for location in operations:
+            start = time.perf_counter()
+            json.loads(spec[location["offset"]:location["offset"] + location["length"]])
+            times.append(time.perf_counter() - start)
+    return {
+        "lookups": len(times),
+        "mean_seconds": round(sum(times) / len(times), 7),
+        "max_seconds": round(max(times), 7),
+        "mean_bytes": round(sum(location["length"] for location in operations) / len(operations)),
+    }
+
+
+def peak_rss_kb():
+    """
+    Peak RSS of this process in KB. Prefers Linux's VmHWM, because ru_maxrss
+    keeps the parent's peak across fork and exec.
+    """
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss  # bytes on macOS
+
+
+def measure(parser: str, path: Path) -> dict:
+    """Run one parser in this process and return its measurements."""
+    seconds = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        entries = PARSERS[parser](path)
+        elapsed = time.perf_counter() - start
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+    max_rss_kb = peak_rss_kb()
+
+    tracemalloc.start()
+    PARSERS[parser](path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds": round(seconds, 6),
+        "max_rss_kb": max_rss_kb,
+        "peak_alloc_bytes": peak,
+        "entries": len(entries),
+        "digest": hashlib.sha256(json.dumps(entries).encode("utf-8")).hexdigest(),
+    }
+
+
+def run_child(parser: str, path: Path) -> dict:
+    """Measure one parser in a fresh interpreter, so RSS peaks do not mix."""
+    result = subprocess.run(
+        [sys.executable, __file__, "--child", parser, str(path)],
+        capture_output=True, text=True, check=False,
+    )
+    if result.returncode != 0:
+        print(f"Error: {parser} run failed:\n{result.stderr}", file=sys.stderr)
+        sys.exit(1)
+    return json.loads(result.stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare streaming and json.loads parsing of the PRO API spec.")
+    parser.add_argument("--scales", default="1,10", help="Comma-separated spec multiples (default: 1,10)")
+    parser.add_argument("--spec", type=Path, default=SPEC_PATH, help="Source spec (default: web3-dev/references/pro-api.json)")
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH, help="Results JSON (default: web3-dev/.build/bench/pro-api-parse.json)")
+    parser.add_argument("--child", nargs=2, metavar=("PARSER", "SPEC"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child[0], Path(args.child[1]))))
+        return
+
+    results: dict = {"python": platform.python_version(), "scales": {}}
+    failed = False
+    print(f"{'scale':<8}{'size':>10}{'parser':>9}{'wall':>10}{'max RSS':>11}{'peak alloc':>13}{'entries':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in (int(s) for s in args.scales.split(",")):
+            path = Path(tmp) / f"pro-api-{scale}x.json"
+            size = write_synthetic_spec(args.spec, scale, path)
+            runs = {name: run_child(name, path) for name in PARSERS}
+            lookup = measure_lookups(path)
+            results["scales"][f"{scale}x"] = {"bytes": size, **runs, "lookup": lookup}
+            for name, run in runs.items():
+                rss = f"{run['max_rss_kb'] / 1024:.1f} MB" if run["max_rss_kb"] is not None else "n/a"
+                print(f"{scale}x{'':<{7 - len(str(scale))}}{size / 1e6:>8.1f}MB{name:>9}{run['seconds']:>9.3f}s"
+                      f"{rss:>11}{run['peak_alloc_bytes'] / 1e6:>10.1f} MB{run['entries']:>9}")
+            print(f"{scale}x{'':<{7 - len(str(scale))}}{size / 1e6:>8.1f}MB{'slice':>9}{lookup['mean_seconds'] * 1e6:>8.0f}us"
+                  f"  per lookup (max {lookup['max_seconds'] * 1e6:.0f}us, {lookup['mean_bytes']} bytes read){lookup['lookups']:>6}")
+            if len({run["digest"] for run in runs.values()}) != 1:
+                print(f"Error: parsers disagree at {scale}x", file=sys.stderr)
+                failed = True
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    print(f"Results written: {args.output}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
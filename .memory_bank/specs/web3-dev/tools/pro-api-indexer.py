@@ -2,14 +2,43 @@
 """Generate a markdown index of every HTTP endpoint in the Blockscout PRO API."""
 
 import argparse
+import importlib.util
 import json
+import re
 import sys
 from collections import defaultdict
 from pathlib import Path
+from typing import Iterator, Optional, TextIO
+
+# The $ref resolver, offsets format, atomic writes and stage profiling are
+# shared with the Blockscout tools through their standard-library-only
+# common_base module, so this script needs no third-party packages.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "blockscout-analysis" / "tools"))
+
+from common_base import (  # noqa: E402
+    deref,
+    profile_step,
+    ref_resolver,
+    render_offsets,
+    replace_file_if_changed,
+    schema_type,
+    start_profile,
+    write_file_if_changed,
+)
 
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parents[3]
 OUTPUT_PATH = PROJECT_ROOT / "web3-dev" / "references" / "pro-api-index.md"
+SHARD_DIR = OUTPUT_PATH.parent / "pro-api"
+OFFSETS_PATH = OUTPUT_PATH.parent / "pro-api-offsets.json"
+# First entry of the offsets map: {"bytes", "sha256"} of the spec it was
+# built from, so readers can tell when the offsets no longer match.
+OFFSETS_SPEC_KEY = "$spec"
+QUERY_DB_PATH = OUTPUT_PATH.parent / "pro-api-query.db"
+# The query script builds its own index when the spec changes, so the
+# indexer uses the script's builder rather than a copy of it.
+QUERY_SCRIPT_PATH = PROJECT_ROOT / "web3-dev" / "scripts" / "pro-api-query.py"
+PROFILE_PATH = PROJECT_ROOT / "web3-dev" / ".build" / "profile" / "pro-api-indexer.json"
 
 HTTP_METHODS = {"get", "post", "put", "patch", "delete", "head", "options", "trace"}
 
@@ -29,66 +58,540 @@ def resolve_label(operation: dict) -> str:
     return "NO DESCRIPTION"
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(
-        description="Index PRO API endpoints into a markdown file."
-    )
-    parser.add_argument(
-        "input",
-        help="Path to the OpenAPI v3 JSON spec",
-    )
-    args = parser.parse_args()
+def operation_entries(path: str, path_item) -> Iterator[tuple[str, str, str, str, dict]]:
+    """
+    Yield (tag, path, METHOD, label, operation) for each operation of one path
+    item. Path-item-level parameters are prepended to the operation's own.
+    """
+    if not isinstance(path_item, dict):
+        return
+    inherited = path_item.get("parameters") or []
+    for method, operation in path_item.items():
+        if method.lower() not in HTTP_METHODS:
+            continue
+        if not isinstance(operation, dict):
+            continue
+        if inherited:
+            operation = {**operation, "parameters": inherited + (operation.get("parameters") or [])}
 
-    input_path = Path(args.input)
+        tags = operation.get("tags") or []
+        tag = tags[0].strip() if tags and isinstance(tags[0], str) else "untagged"
+        yield tag, path, method.upper(), resolve_label(operation), operation
 
-    try:
-        text = input_path.read_text(encoding="utf-8")
-    except (FileNotFoundError, PermissionError) as exc:
-        print(f"Error: cannot read input file '{input_path}': {exc}", file=sys.stderr)
-        sys.exit(1)
 
-    try:
-        spec = json.loads(text)
-    except json.JSONDecodeError as exc:
-        print(f"Error: input file is not valid JSON: {exc}", file=sys.stderr)
-        sys.exit(2)
+# Streaming reader. `paths` is read one path item at a time: the top-level
+# object is scanned key by key, each path item is decoded on its own by the C
+# JSON decoder, and every other top-level value is skipped by bracket matching
+# without building it, unless the caller asks to keep it (the detail shards
+# need `components`). Memory therefore depends on the kept members and the
+# largest path item, not on the number of paths.
+#
+# The stream also tracks the byte offset and line of a "mark" in the buffer,
+# advanced only when something is located and when consumed text is dropped,
+# so locating every operation and schema costs one pass over the text.
+READ_CHUNK = 1 << 16
 
-    if "paths" not in spec:
-        print("Error: parsed JSON does not contain a 'paths' key.", file=sys.stderr)
-        sys.exit(3)
+_DECODER = json.JSONDecoder()
+_WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+_STRUCTURE_RE = re.compile(r'["{}\[\]]')
+_STRING_TAIL_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
 
-    # Collect endpoints grouped by tag
-    groups: dict[str, list[tuple[str, str, str]]] = defaultdict(list)
 
-    for path, path_item in spec["paths"].items():
-        if not isinstance(path_item, dict):
+def _fill(stream: dict, size: int = READ_CHUNK) -> bool:
+    """
+    Append up to `size` characters to the buffer, dropping what was already
+    consumed. Returns False (buffer untouched) at end of file.
+    """
+    chunk = stream["file"].read(size)
+    if not chunk:
+        return False
+    _locate(stream, stream["pos"])
+    stream["offset"] += stream["pos"]
+    stream["buf"] = stream["buf"][stream["pos"]:] + chunk
+    stream["pos"] = stream["mark"] = 0
+    return True
+
+
+def _locate(stream: dict, pos: int) -> tuple[int, int]:
+    """
+    Byte offset in the UTF-8 file and 1-based line of buffer position `pos`,
+    which must not precede the last position located.
+    """
+    text = stream["buf"][stream["mark"]:pos]
+    stream["mark"] = pos
+    stream["mark_byte"] += len(text) if text.isascii() else len(text.encode("utf-8"))
+    stream["mark_line"] += text.count("\n")
+    return stream["mark_byte"], stream["mark_line"]
+
+
+def _error(stream: dict, message: str, pos=None) -> ValueError:
+    at = stream["offset"] + (stream["pos"] if pos is None else pos)
+    return ValueError(f"{message}: char {at}")
+
+
+def _peek(stream: dict) -> str:
+    """Skip whitespace and return the next character ("" at end of file)."""
+    while True:
+        stream["pos"] = _WHITESPACE_RE.match(stream["buf"], stream["pos"]).end()
+        if stream["pos"] < len(stream["buf"]):
+            return stream["buf"][stream["pos"]]
+        if not _fill(stream):
+            return ""
+
+
+def _expect(stream: dict, chars: str) -> str:
+    """Consume and return the next character, which must be one of `chars`."""
+    char = _peek(stream)
+    if not char or char not in chars:
+        raise _error(stream, "Expecting " + " or ".join(repr(c) for c in chars))
+    stream["pos"] += 1
+    return char
+
+
+def _read_value(stream: dict):
+    """Decode the next JSON value, reading ahead until it is complete."""
+    _peek(stream)
+    size = READ_CHUNK
+    while True:
+        try:
+            value, end = _DECODER.raw_decode(stream["buf"], stream["pos"])
+        except json.JSONDecodeError as exc:
+            # Most likely cut off by the end of the buffer: read more (in
+            # growing steps, so a large value is decoded a bounded number of
+            # times) and try again.
+            if not _fill(stream, size):
+                raise _error(stream, exc.msg, exc.pos) from None
+            size *= 2
             continue
-        for method, operation in path_item.items():
-            if method.lower() not in HTTP_METHODS:
-                continue
-            if not isinstance(operation, dict):
+        # A number at the end of the buffer may continue in the next chunk.
+        if end == len(stream["buf"]) and _fill(stream, size):
+            continue
+        stream["pos"] = end
+        return value
+
+
+def _skip_value(stream: dict) -> None:
+    """Consume the next JSON value without building it."""
+    if _peek(stream) not in ("{", "["):
+        _read_value(stream)
+        return
+    depth = 0
+    while True:
+        buf = stream["buf"]
+        m = _STRUCTURE_RE.search(buf, stream["pos"])
+        if m is None:
+            stream["pos"] = len(buf)
+            if not _fill(stream):
+                raise _error(stream, "Unterminated object or array")
+            continue
+        if m.group() == '"':
+            tail = _STRING_TAIL_RE.match(buf, m.end())
+            if tail is None:
+                stream["pos"] = m.start()
+                if not _fill(stream):
+                    raise _error(stream, "Unterminated string")
                 continue
+            stream["pos"] = tail.end()
+            continue
+        stream["pos"] = m.end()
+        depth += 1 if m.group() in "{[" else -1
+        if depth == 0:
+            return
+
+
+def _iter_members(stream: dict) -> Iterator[str]:
+    """
+    Iterate over the keys of the object at the current position. After each
+    key the stream is positioned at its value, which the caller must consume.
+    """
+    _expect(stream, "{")
+    if _peek(stream) == "}":
+        stream["pos"] += 1
+        return
+    while True:
+        key = _read_value(stream) if _peek(stream) == '"' else None
+        if not isinstance(key, str):
+            raise _error(stream, "Expecting property name enclosed in double quotes")
+        _expect(stream, ":")
+        yield key
+        if _expect(stream, ",}") == "}":
+            return
+
+
+def _read_located(stream: dict, locations: dict, name) -> object:
+    """
+    Decode the value at the current position. If it is an object, decode it
+    member by member and record in `locations`, under `name(key)`, where each
+    member's value sits in the file; members for which `name` returns None
+    are not recorded.
+    """
+    if _peek(stream) != "{":
+        return _read_value(stream)
+    value = {}
+    for key in _iter_members(stream):
+        _peek(stream)
+        offset, start_line = _locate(stream, stream["pos"])
+        value[key] = _read_value(stream)
+        end, end_line = _locate(stream, stream["pos"])
+        location_key = name(key)
+        if location_key is not None:
+            locations[location_key] = {"offset": offset, "length": end - offset, "start_line": start_line, "end_line": end_line}
+    return value
+
+
+def operation_key(method: str, path: str) -> str:
+    """Offsets-map key of an operation ("GET /{chain_id}/api/v2/blocks")."""
+    return f"{method.upper()} {path}"
+
+
+def schema_key(name: str) -> str:
+    """Offsets-map key of a component schema: its `$ref` ("#/components/schemas/Block")."""
+    return "#/components/schemas/" + name.replace("~", "~0").replace("/", "~1")
+
+
+def iter_operations(
+    file: TextIO,
+    keep: Optional[dict] = None,
+    locations: Optional[dict] = None,
+) -> Iterator[tuple[str, str, str, str, dict]]:
+    """
+    Yield (tag, path, METHOD, label, operation) for every operation in the
+    OpenAPI JSON document read from `file`, in document order, keeping at most
+    one path item in memory. Other top-level members whose names are keys of
+    `keep` are decoded into it as they are passed (the entries already yielded
+    can check it); the rest are skipped. If `locations` is given, the byte
+    offset, length and line range of every operation and component schema
+    are recorded in it (see operation_key, schema_key); `file` must then be
+    opened with newline="" so offsets match the bytes on disk. Raises
+    ValueError if the document is not valid JSON and KeyError if it has no
+    `paths` object.
+    """
+    stream = {"file": file, "buf": "", "pos": 0, "offset": 0, "mark": 0, "mark_byte": 0, "mark_line": 1}
+    keep = {} if keep is None else keep
+    found = False
+    if _peek(stream) == "{":
+        for key in _iter_members(stream):
+            if key == "paths" and _peek(stream) == "{":
+                found = True
+                for path in _iter_members(stream):
+                    if locations is None:
+                        path_item = _read_value(stream)
+                    else:
+                        path_item = _read_located(
+                            stream, locations,
+                            lambda method: operation_key(method, path) if method.lower() in HTTP_METHODS else None,
+                        )
+                    yield from operation_entries(path, path_item)
+            elif key == "components" and locations is not None and _peek(stream) == "{":
+                components = {}
+                for section in _iter_members(stream):
+                    if section == "schemas":
+                        components[section] = _read_located(stream, locations, schema_key)
+                    else:
+                        components[section] = _read_value(stream)
+                if key in keep:
+                    keep[key] = components
+            elif key in keep:
+                keep[key] = _read_value(stream)
+            else:
+                _skip_value(stream)
+    else:
+        _skip_value(stream)
+    if _peek(stream):
+        raise _error(stream, "Extra data")
+    if not found:
+        raise KeyError("paths")
+
+
+# Detail shards. One markdown file per tag under references/pro-api/, in the
+# H4 / parameter-table format of the Blockscout reference files
+# (.memory_bank/specs/blockscout-analysis/tools/api-file-generator.py), plus
+# the top-level fields of the success response. `$ref`s point into
+# `components` and are resolved through the Blockscout tools' memoized
+# resolver (common.ref_resolver), one per build, so each shared schema is
+# looked up once however many operations use it.
+def _field_type(schema, refs: dict, depth: int = 0) -> str:
+    """
+    Type of a response or field schema: the component name for a referenced
+    object, "array of X" for arrays, otherwise the schema type.
+    """
+    target = deref(schema, refs)
+    if target is None or depth > 8:
+        return "object"
+    t = schema_type(target, refs) or "object"
+    if t == "array":
+        return f"array of {_field_type(target.get('items'), refs, depth + 1)}"
+    if t == "object" and "$ref" in schema:
+        return schema["$ref"].rsplit("/", 1)[-1]
+    return t
 
-            tags = operation.get("tags") or []
-            tag = tags[0].strip() if tags and isinstance(tags[0], str) else "untagged"
-            label = resolve_label(operation)
-            groups[tag].append((path, method.upper(), label))
+
+def _cell(text) -> str:
+    """Collapse a description to one table-safe line."""
+    if not isinstance(text, str):
+        return ""
+    return " ".join(text.split()).replace("|", "\\|")
+
+
+def _render_table(header: str, rows: list[tuple[str, str, bool, str]]) -> str:
+    """Render a (name, type, required, description) table, indented two spaces, or '*None*'."""
+    if not rows:
+        return "  *None*"
+    lines = [
+        f"  | {header} | Type | Required | Description |",
+        f"  | {'-' * len(header)} | ---- | -------- | ----------- |",
+    ]
+    for name, type_str, required, description in rows:
+        lines.append(f"  | `{name}` | `{type_str}` | {'Yes' if required else 'No'} | {description} |")
+    return "\n".join(lines)
+
+
+def _parameter_rows(operation: dict, refs: dict) -> list[tuple[str, str, bool, str]]:
+    """Path and query parameters of an operation, `$ref`s resolved; later duplicates override earlier ones."""
+    merged: dict[tuple[str, str], dict] = {}
+    for param in operation.get("parameters") or []:
+        param = deref(param, refs)
+        if param is not None and param.get("in") in ("path", "query"):
+            merged[(param.get("name", ""), param["in"])] = param
+    return [
+        (
+            param.get("name", ""),
+            schema_type(param.get("schema"), refs) or param.get("type") or "string",
+            param["in"] == "path" or bool(param.get("required", False)),
+            _cell(param.get("description")),
+        )
+        for param in merged.values()
+    ]
+
+
+def _render_response(operation: dict, refs: dict) -> list[str]:
+    """
+    Lines for the first 2xx response: status, body type and description,
+    then the top-level fields of the body (of its items, for an array).
+    Empty if the operation documents no success response.
+    """
+    responses = operation.get("responses") or {}
+    status = next((code for code in sorted(responses) if str(code).startswith("2")), None)
+    response = deref(responses.get(status), refs) if status else None
+    if response is None:
+        return []
+
+    content = response.get("content") or {}
+    media = "application/json" if "application/json" in content else next(iter(content), None)
+    schema = (content.get(media) or {}).get("schema") if media else None
+    head = f"- **Response** `{status}`"
+    if isinstance(schema, dict):
+        head += f" `{_field_type(schema, refs)}`"
+    if media and media != "application/json":
+        head += f" (`{media}`)"
+    description = _cell(response.get("description"))
+    if description:
+        head += f": {description}"
+
+    body = deref(schema, refs)
+    if body is not None and schema_type(body, refs) == "array":
+        body = deref(body.get("items"), refs)
+    properties = body.get("properties") if body is not None else None
+    if media != "application/json" or not isinstance(properties, dict) or not properties:
+        return [head]
+
+    required = set(body.get("required") or [])
+    rows = []
+    for name, field in properties.items():
+        target = deref(field, refs) or {}
+        type_str = _field_type(field, refs)
+        if target.get("nullable"):
+            type_str += " (nullable)"
+        rows.append((name, type_str, name in required, _cell(target.get("description"))))
+    return [head, "", _render_table("Field", rows)]
+
+
+def render_shard_entry(path: str, method: str, operation: dict, refs: dict) -> str:
+    """Render the H4 block of one operation."""
+    description = operation.get("description")
+    if not (isinstance(description, str) and description.strip()):
+        description = operation.get("summary")
+    lines = [f"#### {method} {path}", ""]
+    if isinstance(description, str) and description.strip():
+        lines += [description.strip(), ""]
+    lines += ["- **Parameters**", "", _render_table("Name", _parameter_rows(operation, refs))]
+    response = _render_response(operation, refs)
+    if response:
+        lines += [""] + response
+    lines.append("")
+    return "\n".join(lines)
+
+
+def load_query_script():
+    """Import web3-dev/scripts/pro-api-query.py as a module."""
+    spec = importlib.util.spec_from_file_location("pro_api_query", QUERY_SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def shard_name(tag: str) -> str:
+    """File name of a tag's detail shard ("ClusterExplorerService" -> "clusterexplorerservice.md")."""
+    return (re.sub(r"[^a-z0-9_]+", "-", tag.lower()).strip("-") or "untagged") + ".md"
+
+
+def render_shard(sections: dict[str, list[tuple[str, str, str]]]) -> str:
+    """Render one shard from {tag: [(path, METHOD, entry markdown)]}, tags in index order."""
+    parts = ["## API Endpoints\n"]
+    for tag in sorted(sections, key=str.casefold):
+        parts.append(f"\n### {tag}\n")
+        for _, _, entry in sections[tag]:
+            parts.append("\n" + entry)
+    return "".join(parts)
+
+
+def build_outputs(input_path: Path) -> dict:
+    """
+    Parse the spec at `input_path` once and render every output in memory:
+    {"index": markdown, "shards": {file name: markdown}, "offsets": JSON text,
+    "query_partial": path of the finished query database, still to be renamed
+    over QUERY_DB_PATH}. Exits with code 1, 2 or 3 if the spec cannot be read
+    or parsed.
+    """
+    try:
+        # newline="" keeps "\r\n" as is, so located offsets are byte offsets
+        file = input_path.open(encoding="utf-8", newline="")
+    except (FileNotFoundError, PermissionError) as exc:
+        print(f"Error: cannot read input file '{input_path}': {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    # Collect endpoints grouped by tag, streaming them out of `paths`. A shard
+    # entry needs `components` to resolve its `$ref`s: it is rendered as soon
+    # as the operation is read if `components` came first (as in a spec with
+    # sorted keys), otherwise the operation is kept until the end. Every
+    # operation and component schema is located for the offsets sidecar, and
+    # added to the query index as it is read.
+    groups: dict[str, list[tuple[str, str, str]]] = defaultdict(list)
+    shards: dict[str, list[tuple[str, str, str]]] = defaultdict(list)
+    kept = {"components": None}
+    refs = ref_resolver(kept, "spec", sys.stderr)
+    pending = []
+    locations: dict[str, dict] = {}
+    query = load_query_script()
+    query_partial = QUERY_DB_PATH.with_name(QUERY_DB_PATH.name + ".partial")
+    query_db = query.create_index(query_partial)
+
+    with file:
+        try:
+            for tag, path, method, label, operation in iter_operations(file, kept, locations):
+                groups[tag].append((path, method, label))
+                query.add_operation(query_db, path, method, operation)
+                if kept["components"] is None:
+                    pending.append((tag, path, method, operation))
+                else:
+                    shards[tag].append((path, method, render_shard_entry(path, method, operation, refs)))
+        except (ValueError, KeyError) as exc:
+            query_db.close()
+            query_partial.unlink()
+            if isinstance(exc, KeyError):
+                print("Error: parsed JSON does not contain a 'paths' object.", file=sys.stderr)
+                sys.exit(3)
+            print(f"Error: input file is not valid JSON: {exc}", file=sys.stderr)
+            sys.exit(2)
+    for tag, path, method, operation in pending:
+        shards[tag].append((path, method, render_shard_entry(path, method, operation, refs)))
 
     # Sort entries within each group: by path then method
-    for entries in groups.values():
+    for entries in (*groups.values(), *shards.values()):
         entries.sort(key=lambda e: (e[0], e[1]))
+    profile_step("Collect endpoints", items=sum(len(entries) for entries in groups.values()))
 
     # Build output
     lines = ["# PRO API Endpoint Index"]
     for tag in sorted(groups.keys(), key=str.casefold):
         lines.append("")
-        lines.append(f"## {tag}")
+        lines.append(f"## [{tag}](pro-api/{shard_name(tag)})")
         lines.append("")
         for path, method, label in groups[tag]:
             lines.append(f"{method} {path}: {label}")
+    profile_step("Render index", items=len(lines))
+
+    # Tags whose names differ only in case or punctuation share a shard
+    files: dict[str, dict[str, list[tuple[str, str, str]]]] = defaultdict(dict)
+    for tag, entries in shards.items():
+        files[shard_name(tag)][tag] = entries
+    documents = {name: render_shard(sections) for name, sections in files.items()}
+    profile_step("Render shards", items=len(documents))
+
+    digest = query.spec_digest(input_path)
+    query.finish_index(query_db, kept["components"], digest)
+    source = {"bytes": input_path.stat().st_size, "sha256": digest}
+    return {
+        "index": "\n".join(lines) + "\n",
+        "shards": documents,
+        "offsets": render_offsets({OFFSETS_SPEC_KEY: source, **locations}),
+        "query_partial": query_partial,
+    }
+
+
+def write_outputs(outputs: dict) -> dict[str, int]:
+    """
+    Write the outputs of build_outputs() with the Blockscout tools' atomic
+    writer: files whose content is unchanged are skipped and keep their
+    mtime, the offsets sidecar is written last, and shards of tags that are
+    gone are removed. Returns {"written", "unchanged", "removed"} counts and
+    prints them.
+    """
+    documents = outputs["shards"]
+    counts = {"written": 0, "unchanged": 0, "removed": 0}
+    SHARD_DIR.mkdir(parents=True, exist_ok=True)
+    for stale in sorted(SHARD_DIR.glob("*.md")):
+        if stale.name not in documents:
+            stale.unlink()
+            counts["removed"] += 1
+            print(f"Removed: {stale}")
+    files = [(OUTPUT_PATH, outputs["index"])]
+    files += [(SHARD_DIR / name, content) for name, content in sorted(documents.items())]
+    files.append((OFFSETS_PATH, outputs["offsets"]))
+    for path, content in files:
+        if write_file_if_changed(path, content.encode("utf-8")):
+            counts["written"] += 1
+            print(f"Written: {path}")
+        else:
+            counts["unchanged"] += 1
+    if replace_file_if_changed(outputs["query_partial"], QUERY_DB_PATH):
+        counts["written"] += 1
+        print(f"Written: {QUERY_DB_PATH}")
+    else:
+        counts["unchanged"] += 1
+    print(f"PRO API files: {counts['written']} written, {counts['unchanged']} unchanged, {counts['removed']} removed")
+    profile_step("Write files", items=counts["written"] + counts["removed"])
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Index PRO API endpoints into a markdown file."
+    )
+    parser.add_argument(
+        "input",
+        help="Path to the OpenAPI v3 JSON spec",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        type=Path,
+        const=PROFILE_PATH,
+        metavar="REPORT",
+        help="Write a JSON per-stage timing report (default: web3-dev/.build/profile/pro-api-indexer.json)",
+    )
+    parser.add_argument(
+        "--cprofile",
+        type=Path,
+        metavar="PSTATS",
+        help="Also write a cProfile dump; implies --profile",
+    )
+    args = parser.parse_args()
+    if args.cprofile is not None and args.profile is None:
+        args.profile = PROFILE_PATH
+    start_profile("pro-api-indexer", args.profile, args.cprofile)
 
-    OUTPUT_PATH.write_text("\n".join(lines) + "\n", encoding="utf-8")
-    print(f"Written: {OUTPUT_PATH}")
+    write_outputs(build_outputs(Path(args.input)))
 
 
 if __name__ == "__main__":
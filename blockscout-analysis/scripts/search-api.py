@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Search the Blockscout API reference for endpoints matching free-text terms.
+
+Prints only the matching endpoint entries (the `#### METHOD /path` blocks of
+references/blockscout-api/*.md), most relevant first, instead of whole files.
+Reads the SQLite FTS5 database generated next to the reference files; needs
+only the Python standard library.
+
+Usage:
+    python blockscout-analysis/scripts/search-api.py token transfers address [--limit 5]
+"""
+
+import argparse
+import re
+import sqlite3
+import sys
+from pathlib import Path
+
+DB_PATH = Path(__file__).resolve().parent.parent / "references" / "blockscout-api-search.db"
+
+# bm25 weights per indexed column: path, method, description, param_names,
+# param_descriptions, file, section. Path words count most.
+COLUMN_WEIGHTS = (20.0, 0.0, 4.0, 1.0, 0.5, 2.0, 2.0)
+
+
+def build_query(terms: list[str]) -> str:
+    """
+    FTS5 query matching entries that contain any of the words in `terms`.
+    The index is stemmed, so "transfer" also finds "transfers" and
+    "token-transfers"; entries matching more words rank higher.
+    """
+    words = re.findall(r"[A-Za-z0-9]+", " ".join(terms))
+    return " OR ".join(f'"{word}"' for word in words)
+
+
+def search(db_path: Path, terms: list[str], limit: int) -> list[tuple[str, str, str]]:
+    """Return (file, section, entry markdown) for the best `limit` matches."""
+    query = build_query(terms)
+    if not query:
+        return []
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return conn.execute(
+            f"SELECT file, section, entry FROM endpoints WHERE endpoints MATCH ? "
+            f"ORDER BY bm25(endpoints, {', '.join(map(str, COLUMN_WEIGHTS))}) LIMIT ?",
+            (query, limit),
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Print the Blockscout API endpoint entries that best match the search terms."
+    )
+    parser.add_argument("terms", nargs="+", help="Words to search for in paths, descriptions and parameters")
+    parser.add_argument("--limit", type=int, default=5, help="Maximum number of endpoints to print (default: 5)")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help=f"Search database (default: {DB_PATH})")
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        print(f"Error: search database not found: {args.db}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        results = search(args.db, args.terms, max(1, args.limit))
+    except sqlite3.Error as exc:
+        print(f"Error: cannot search {args.db}: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    if not results:
+        print("No matching endpoints.")
+        return
+    for file, section, entry in results:
+        print(f"<!-- blockscout-api/{file} · {section} -->")
+        print(entry)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Answer PRO API lookups from a pre-built SQLite index of references/pro-api.json.
+
+Finds the operations for a path, the operations of a tag, the operations
+accepting a parameter, and component schemas, with `$ref`s expanded to a
+chosen depth. The index (references/pro-api-query.db) is generated together
+with the other reference files and is rebuilt here automatically when the
+SHA-256 of the spec no longer matches the one it was built from. Needs only
+the Python standard library.
+
+Usage:
+    python web3-dev/scripts/pro-api-query.py operation '/{chain_id}/api/v2/blocks' [--method GET]
+    python web3-dev/scripts/pro-api-query.py tag blocks
+    python web3-dev/scripts/pro-api-query.py param address_hash_param
+    python web3-dev/scripts/pro-api-query.py schema TransactionResponse [--depth 2]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+REFERENCES_DIR = Path(__file__).resolve().parent.parent / "references"
+SPEC_PATH = REFERENCES_DIR / "pro-api.json"
+DB_PATH = REFERENCES_DIR / "pro-api-query.db"
+
+# Bumped when the tables change, so an index of an older layout is rebuilt.
+INDEX_FORMAT = "1"
+
+HTTP_METHODS = ("get", "post", "put", "patch", "delete", "head", "options", "trace")
+
+SCHEMA_PREFIX = "#/components/schemas/"
+
+_TABLES = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE operations (
+    id INTEGER PRIMARY KEY, method TEXT NOT NULL, path TEXT NOT NULL,
+    tag TEXT NOT NULL, label TEXT NOT NULL, operation TEXT NOT NULL
+);
+CREATE INDEX operations_path ON operations (path);
+CREATE INDEX operations_tag ON operations (tag COLLATE NOCASE);
+CREATE TABLE parameters (
+    operation_id INTEGER NOT NULL, name TEXT NOT NULL,
+    location TEXT NOT NULL, required INTEGER NOT NULL
+);
+CREATE INDEX parameters_name ON parameters (name);
+CREATE TABLE components (ref TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+# ---------------------------------------------------------------------------
+# Building
+# ---------------------------------------------------------------------------
+
+def spec_digest(spec_path: Path) -> str:
+    """SHA-256 of the spec file, hex."""
+    digest = hashlib.sha256()
+    with spec_path.open("rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def operation_tag(operation: dict) -> str:
+    """Grouping tag: the first tag, stripped; "untagged" if there is none (as in pro-api-index.md)."""
+    tags = operation.get("tags") or []
+    return tags[0].strip() if tags and isinstance(tags[0], str) else "untagged"
+
+
+def operation_label(operation: dict) -> str:
+    """One-line label: the summary, else the description collapsed to one line (as in pro-api-index.md)."""
+    summary = operation.get("summary")
+    if isinstance(summary, str) and summary.strip():
+        return summary.strip()
+    description = operation.get("description")
+    if isinstance(description, str) and description.strip():
+        return " ".join(line.strip() for line in description.splitlines() if line.strip())
+    return "NO DESCRIPTION"
+
+
+def create_index(db_path: Path) -> sqlite3.Connection:
+    """Start a new index at `db_path` (replacing any file there); add to it, then call finish_index."""
+    db_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.executescript(_TABLES)
+    return conn
+
+
+def add_operation(conn: sqlite3.Connection, path: str, method: str, operation: dict) -> None:
+    """Add one operation, in spec order."""
+    conn.execute(
+        "INSERT INTO operations (method, path, tag, label, operation) VALUES (?, ?, ?, ?, ?)",
+        (method.upper(), path, operation_tag(operation), operation_label(operation),
+         json.dumps(operation, ensure_ascii=False, separators=(",", ":"))),
+    )
+
+
+def add_path_item(conn: sqlite3.Connection, path: str, path_item) -> None:
+    """Add the operations of one path item; path-item-level parameters are prepended to each."""
+    if not isinstance(path_item, dict):
+        return
+    inherited = path_item.get("parameters") or []
+    for method, operation in path_item.items():
+        if method.lower() not in HTTP_METHODS or not isinstance(operation, dict):
+            continue
+        if inherited:
+            operation = {**operation, "parameters": inherited + (operation.get("parameters") or [])}
+        add_operation(conn, path, method, operation)
+
+
+def finish_index(conn: sqlite3.Connection, components, digest: str) -> None:
+    """
+    Store the components, derive the parameter table (resolving parameter
+    `$ref`s) and the metadata, then compact and close the index. The same
+    spec always gives a byte-identical file.
+    """
+    if isinstance(components, dict):
+        for section, members in components.items():
+            if isinstance(members, dict):
+                conn.executemany(
+                    "INSERT OR REPLACE INTO components (ref, value) VALUES (?, ?)",
+                    ((f"#/components/{section}/{_escape(name)}",
+                      json.dumps(value, ensure_ascii=False, separators=(",", ":")))
+                     for name, value in members.items()),
+                )
+    _ref_cache.clear()
+    rows = []
+    for operation_id, text in conn.execute("SELECT id, operation FROM operations ORDER BY id").fetchall():
+        for param in json.loads(text).get("parameters") or []:
+            param = resolve(conn, param)
+            if isinstance(param, dict) and param.get("name"):
+                location = param.get("in", "")
+                rows.append((operation_id, param["name"], location, int(location == "path" or bool(param.get("required")))))
+    conn.executemany("INSERT INTO parameters VALUES (?, ?, ?, ?)", rows)
+    conn.executemany("INSERT INTO meta VALUES (?, ?)", [("format", INDEX_FORMAT), ("spec_sha256", digest)])
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def build_index(spec_path: Path, db_path: Path, digest: str) -> None:
+    """Build the index of the spec at `spec_path` into `db_path`, via a `.partial` file."""
+    spec = json.loads(spec_path.read_text(encoding="utf-8"))
+    if not isinstance(spec, dict) or not isinstance(spec.get("paths"), dict):
+        raise ValueError("spec has no 'paths' object")
+    partial = db_path.with_name(db_path.name + ".partial")
+    conn = create_index(partial)
+    for path, path_item in spec["paths"].items():
+        add_path_item(conn, path, path_item)
+    finish_index(conn, spec.get("components"), digest)
+    os.replace(partial, db_path)
+
+
+def open_index(spec_path: Path, db_path: Path) -> sqlite3.Connection:
+    """
+    Open the index, rebuilding it first if it is missing, of an older format,
+    or built from a spec with a different SHA-256. If it cannot be written,
+    it is built in a temporary file for this run only.
+    """
+    digest = spec_digest(spec_path)
+    if db_path.exists():
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        except sqlite3.Error:
+            meta = {}
+        if meta.get("format") == INDEX_FORMAT and meta.get("spec_sha256") == digest:
+            return conn
+        conn.close()
+    try:
+        build_index(spec_path, db_path, digest)
+    except (OSError, sqlite3.Error) as exc:
+        print(f"Warning: cannot write {db_path} ({exc}); using a temporary index", file=sys.stderr)
+        db_path = Path(tempfile.gettempdir()) / f"pro-api-query-{digest[:16]}.db"
+        if not db_path.exists():
+            build_index(spec_path, db_path, digest)
+    return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def _escape(name: str) -> str:
+    return name.replace("~", "~0").replace("/", "~1")
+
+
+# `$ref` targets already read from the index, by pointer.
+_ref_cache: dict[str, object] = {}
+
+
+def lookup_ref(conn: sqlite3.Connection, ref: str):
+    """Target of a `#/components/...` pointer, memoized; None if the index does not have it."""
+    if ref not in _ref_cache:
+        row = conn.execute("SELECT value FROM components WHERE ref = ?", (ref,)).fetchone()
+        _ref_cache[ref] = json.loads(row[0]) if row else None
+    return _ref_cache[ref]
+
+
+def resolve(conn: sqlite3.Connection, node):
+    """`node`, or the target of its `$ref` (following chains); None if unresolvable or cyclic."""
+    seen = set()
+    while isinstance(node, dict) and isinstance(node.get("$ref"), str):
+        if node["$ref"] in seen:
+            return None
+        seen.add(node["$ref"])
+        node = lookup_ref(conn, node["$ref"])
+    return node
+
+
+def expand(conn: sqlite3.Connection, node, depth: int, chain: tuple = ()):
+    """
+    Copy of `node` with `$ref`s replaced by their targets, `depth` levels
+    deep. References beyond the depth, cyclic (already on `chain`) or
+    unresolvable ones stay as `{"$ref": ...}`.
+    """
+    if isinstance(node, list):
+        return [expand(conn, item, depth, chain) for item in node]
+    if not isinstance(node, dict):
+        return node
+    ref = node.get("$ref")
+    if isinstance(ref, str):
+        target = lookup_ref(conn, ref) if depth > 0 and ref not in chain else None
+        if target is None:
+            return node
+        return expand(conn, target, depth - 1, chain + (ref,))
+    return {key: expand(conn, value, depth, chain) for key, value in node.items()}
+
+
+def find_operations(conn: sqlite3.Connection, path: str, method=None) -> list[tuple[str, str, dict]]:
+    """(METHOD, path, operation) for `path`, optionally only `method`."""
+    sql = "SELECT method, path, operation FROM operations WHERE path = ?"
+    args: tuple = (path,)
+    if method:
+        sql += " AND method = ?"
+        args += (method.upper(),)
+    return [(m, p, json.loads(op)) for m, p, op in conn.execute(sql + " ORDER BY method", args)]
+
+
+def find_by_tag(conn: sqlite3.Connection, tag: str) -> list[tuple[str, str, str]]:
+    """(METHOD, path, label) of the operations grouped under `tag` (case-insensitive)."""
+    return conn.execute(
+        "SELECT method, path, label FROM operations WHERE tag = ? COLLATE NOCASE ORDER BY path, method", (tag,)
+    ).fetchall()
+
+
+def find_by_parameter(conn: sqlite3.Connection, name: str) -> list[tuple[str, str, str, str, int]]:
+    """(METHOD, path, label, location, required) of the operations accepting parameter `name`."""
+    return conn.execute(
+        "SELECT o.method, o.path, o.label, p.location, p.required FROM parameters p "
+        "JOIN operations o ON o.id = p.operation_id WHERE p.name = ? ORDER BY o.path, o.method",
+        (name,),
+    ).fetchall()
+
+
+def schema_ref(name: str) -> str:
+    """`$ref` of a component schema given by name or by pointer."""
+    return name if name.startswith("#/") else SCHEMA_PREFIX + _escape(name)
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--depth", type=int, default=1, help="Levels of $ref to expand in printed JSON (default: 1)")
+    common.add_argument("--spec", type=Path, default=SPEC_PATH, help=f"OpenAPI spec (default: {SPEC_PATH})")
+    common.add_argument("--db", type=Path, default=DB_PATH, help=f"Query index (default: {DB_PATH})")
+
+    parser = argparse.ArgumentParser(description="Look up PRO API operations and schemas without oastools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    operation = commands.add_parser("operation", parents=[common], help="Operations for a path, as JSON")
+    operation.add_argument("path", help="Path as in pro-api-index.md, e.g. '/{chain_id}/api/v2/blocks'")
+    operation.add_argument("--method", help="Only this HTTP method")
+    commands.add_parser("tag", parents=[common], help="Operations of a tag, one per line").add_argument("tag")
+    commands.add_parser("param", parents=[common], help="Operations accepting a parameter, one per line").add_argument("name")
+    commands.add_parser("schema", parents=[common], help="A component schema, as JSON").add_argument("name")
+    args = parser.parse_args()
+
+    try:
+        conn = open_index(args.spec, args.db)
+    except (OSError, ValueError, sqlite3.Error) as exc:
+        print(f"Error: cannot open PRO API index for {args.spec}: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == "operation":
+        results = find_operations(conn, args.path, args.method)
+        for method, path, op in results:
+            print(f"// {method} {path}")
+            print(json.dumps(expand(conn, op, max(0, args.depth)), indent=2, ensure_ascii=False))
+    elif args.command == "tag":
+        results = find_by_tag(conn, args.tag)
+        for method, path, label in results:
+            print(f"{method} {path}: {label}")
+    elif args.command == "param":
+        results = find_by_parameter(conn, args.name)
+        for method, path, label, location, required in results:
+            print(f"{method} {path} ({location}{', required' if required else ''}): {label}")
+    else:
+        ref = schema_ref(args.name)
+        schema = lookup_ref(conn, ref)
+        results = [schema] if schema is not None else []
+        if results:
+            print(f"// {ref}")
+            print(json.dumps(expand(conn, schema, max(0, args.depth), (ref,)), indent=2, ensure_ascii=False))
+    conn.close()
+
+    if not results:
+        print("No matching operations." if args.command != "schema" else "No such schema.")
+
+
+if __name__ == "__main__":
+    main()
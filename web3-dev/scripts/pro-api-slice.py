@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Print single operations or component schemas of the PRO API spec.
+
+Looks up where each one sits in references/pro-api.json in the generated
+references/pro-api-offsets.json, memory-maps the spec and decodes only that
+slice, so a lookup reads a few KB instead of the whole document. The map's
+"$spec" entry records the size of the spec it was built from; if the spec's
+size differs, the map is out of date and pro-api-indexer.py has to be rerun.
+Needs only the Python standard library.
+
+Keys are as in the offsets file: "METHOD PATH" for an operation, a bare PATH
+for all its methods, and "#/components/schemas/NAME" (or just NAME) for a
+schema.
+
+Usage:
+    python web3-dev/scripts/pro-api-slice.py 'GET /{chain_id}/api/v2/blocks' TransactionResponse
+"""
+
+import argparse
+import json
+import mmap
+import sys
+from pathlib import Path
+
+REFERENCES_DIR = Path(__file__).resolve().parent.parent / "references"
+SPEC_PATH = REFERENCES_DIR / "pro-api.json"
+OFFSETS_PATH = REFERENCES_DIR / "pro-api-offsets.json"
+
+SCHEMA_PREFIX = "#/components/schemas/"
+# Offsets-map entry recording the size and SHA-256 of the spec it was built from.
+SPEC_KEY = "$spec"
+INDEXER = ".memory_bank/specs/web3-dev/tools/pro-api-indexer.py"
+
+
+def resolve_keys(offsets: dict, key: str) -> list[str]:
+    """Offsets-map keys matching `key`; empty if none does."""
+    if key == SPEC_KEY:
+        return []
+    if key in offsets:
+        return [key]
+    if key.startswith("/"):
+        return [k for k in offsets if k.split(" ", 1)[-1] == key and not k.startswith("#/")]
+    name = SCHEMA_PREFIX + key.replace("~", "~0").replace("/", "~1")
+    return [name] if name in offsets else []
+
+
+def read_slice(spec: mmap.mmap, location: dict):
+    """Decode the JSON value at `location` ({"offset", "length", ...}) of the mapped spec."""
+    start = location["offset"]
+    return json.loads(spec[start:start + location["length"]])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Print PRO API operations or component schemas without loading the whole spec."
+    )
+    parser.add_argument("keys", nargs="+", help="'METHOD PATH', PATH, or a component schema name")
+    parser.add_argument("--spec", type=Path, default=SPEC_PATH, help=f"OpenAPI spec (default: {SPEC_PATH})")
+    parser.add_argument("--offsets", type=Path, default=OFFSETS_PATH, help=f"Offsets map (default: {OFFSETS_PATH})")
+    args = parser.parse_args()
+
+    try:
+        offsets = json.loads(args.offsets.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        print(f"Error: cannot read offsets map {args.offsets}: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    # The offsets are only valid for the spec they were built from. Comparing
+    # sizes costs one stat(), and catches a regenerated or edited spec before
+    # a shifted offset decodes to the wrong object.
+    source = offsets.get(SPEC_KEY) or {}
+    try:
+        size = args.spec.stat().st_size
+    except OSError as exc:
+        print(f"Error: cannot read spec {args.spec}: {exc}", file=sys.stderr)
+        sys.exit(1)
+    if source.get("bytes") != size:
+        print(
+            f"Error: {args.offsets.name} was not built from this {args.spec.name} "
+            f"({source.get('bytes', 'unknown')} bytes recorded, {size} on disk); "
+            f"rerun {INDEXER} {args.spec}",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    missing = [key for key in args.keys if not resolve_keys(offsets, key)]
+    if missing:
+        print(f"Error: not in {args.offsets.name}: {', '.join(missing)}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        with args.spec.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as spec:
+            for key in args.keys:
+                for name in resolve_keys(offsets, key):
+                    try:
+                        value = read_slice(spec, offsets[name])
+                    except ValueError:
+                        print(
+                            f"Error: offsets map is out of date with {args.spec.name} at {name}; rerun {INDEXER}",
+                            file=sys.stderr,
+                        )
+                        sys.exit(1)
+                    print(f"// {name}")
+                    print(json.dumps(value, indent=2, ensure_ascii=False))
+    except (OSError, ValueError) as exc:
+        print(f"Error: cannot read spec {args.spec}: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()